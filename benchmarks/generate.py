@@ -0,0 +1,113 @@
+"""
+Deterministic synthetic movie library generator, in the data/data.csv format.
+
+Distributions (status, type, country, genres, rating, dates) follow the real library,
+so benchmarks see realistic selectivity and genre combinations at any size.
+
+Usage (from the project root):
+    py benchmarks/generate.py 100000 -o benchmarks/results/data/movies_100k.csv
+"""
+import argparse
+import csv
+import random
+from pathlib import Path
+
+COLUMNS = ['name', 'year', 'status', 'type', 'country', 'genres', 'rating', 'watched_date', 'note']
+
+STATUSES = {'waiting': 0.595, 'completed': 0.388, 'dropped': 0.017}
+TYPES = {'movie': 0.562, 'series': 0.438}
+COUNTRIES = {'US': 0.537, 'Korea': 0.256, 'Japan': 0.124, 'China': 0.083}
+GENRES = {
+    'romance': 0.131, 'comedy': 0.082, 'action': 0.075, 'animation': 0.072, 'sci-fi': 0.069,
+    'adventure': 0.062, 'school': 0.046, 'family': 0.046, 'fantasy': 0.042, 'mystery': 0.042,
+    'thriller': 0.039, 'dark comedy': 0.039, 'time travel': 0.033, 'crime': 0.026,
+    'biography': 0.026, 'friendship': 0.023, 'epic': 0.023, 'music': 0.016,
+    'supernatural': 0.016, 'life': 0.016, 'finance': 0.013, 'death': 0.01, 'horror': 0.01,
+    'sitcom': 0.007, 'hospital': 0.007, 'healing': 0.007, 'history': 0.007,
+    'documentary': 0.007, 'law': 0.003, 'war': 0.003, 'melodrama': 0.003,
+}
+GENRES_COUNT = {1: 0.169, 2: 0.322, 3: 0.331, 4: 0.119, 5: 0.042, 6: 0.017}
+RATINGS = {10: 0.36, 9: 0.36, 8: 0.23, 7: 0.02, 6: 0.02, 5: 0.01}
+# YYYY, YYYY-MM, YYYY-MM-DD
+WATCHED_DATE_FORMATS = {4: 0.2, 7: 0.08, 10: 0.72}
+
+NAME_WORDS = [
+    'love', 'star', 'night', 'city', 'secret', 'summer', 'heart', 'dream', 'shadow', 'king',
+    'girl', 'boy', 'time', 'world', 'last', 'first', 'blue', 'red', 'moon', 'sun', 'lost',
+    'garden', 'river', 'school', 'war', 'home', 'story', 'princess', 'detective', 'ghost',
+]
+NOTE_WORDS = ['great', 'slow', 'rewatch', 'ending', 'ost', 'cast', 'plot', 'twist', 'boring']
+MIN_YEAR, MAX_YEAR = 1980, 2025
+
+def weighted(rng: random.Random, distribution: dict) -> list:
+    """Return a function drawing a value from a {value: weight} distribution."""
+    values, weights = list(distribution), list(distribution.values())
+    return lambda: rng.choices(values, weights)[0]
+
+def generate_movies(n: int, seed: int = 42) -> list[list]:
+    """Generate `n` movies as CSV rows (see COLUMNS), the same rows for the same seed."""
+    rng = random.Random(seed)
+    draw_status = weighted(rng, STATUSES)
+    draw_type = weighted(rng, TYPES)
+    draw_country = weighted(rng, COUNTRIES)
+    draw_genres_count = weighted(rng, GENRES_COUNT)
+    draw_rating = weighted(rng, RATINGS)
+    draw_date_format = weighted(rng, WATCHED_DATE_FORMATS)
+    genres, genre_weights = list(GENRES), list(GENRES.values())
+
+    rows = []
+    for i in range(n):
+        name = ' '.join(rng.sample(NAME_WORDS, rng.randint(1, 4))).title()
+        if rng.random() < 0.1:
+            name += f' {rng.randint(2, 5)}'  # sequels
+
+        # Skewed toward recent years, like the real library
+        year = int(rng.triangular(MIN_YEAR, MAX_YEAR, MAX_YEAR))
+        status = draw_status()
+
+        # Unique genres, drawn by popularity
+        genres_count = draw_genres_count()
+        movie_genres = []
+        while len(movie_genres) < genres_count:
+            genre = rng.choices(genres, genre_weights)[0]
+            if genre not in movie_genres:
+                movie_genres.append(genre)
+
+        rating = watched_date = None
+        if status != 'waiting':
+            if status == 'completed' or rng.random() < 0.5:
+                rating = draw_rating()
+            watched_date = (
+                f'{rng.randint(max(year, 2015), MAX_YEAR)}'
+                f'-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+            )[:draw_date_format()]
+
+        note = ' '.join(rng.choices(NOTE_WORDS, k=rng.randint(1, 5))) if rng.random() < 0.2 else None
+
+        rows.append([
+            name, year, status, draw_type(), draw_country(), ','.join(movie_genres),
+            rating, watched_date, note
+        ])
+    return rows
+
+def write_csv(rows: list[list], path: str | Path) -> None:
+    """Write generated rows to a CSV file with the data/data.csv header."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate a synthetic movie library CSV.')
+    parser.add_argument('size', type=int, help='Number of movies')
+    parser.add_argument('-o', '--output', type=Path, required=True, help='CSV file to write')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    write_csv(generate_movies(args.size, args.seed), args.output)
+    print(f'Generated {args.size} movies to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark CLI startup per command, using `python -X importtime`.
+
+Reports wall time, import time and the heaviest top-level imports of each command,
+optionally as JSON to compare runs across commits.
+
+Usage (from the project root):
+    py benchmarks/startup.py
+    py benchmarks/startup.py -n 20 -o benchmarks/results/startup.json
+    py benchmarks/startup.py get search
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Read-only commands, so the benchmark doesn't change the data
+COMMANDS = {
+    'help': ['--help'],
+    'get': ['get', '1'],
+    'search': ['search', 'love'],
+    'recent': ['recent'],
+    'latest': ['latest'],
+    'filter': ['filter', '-s', 'c', '-c', 'Korea'],
+    'sql': ['sql', 'status'],
+    'stats': ['stats'],
+}
+HEAVY_MODULES = ['rich', 'pandas', 'numpy']
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Return cumulative import time (us) of each top-level import from `-X importtime` output."""
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        if not name.startswith('  '):  # nested imports are indented
+            top_level[name.strip()] = int(cumulative)
+    return top_level
+
+def run_once(args: list[str]) -> tuple[float, dict[str, int]]:
+    """Run a command once, return wall time (ms) and top-level imports."""
+    tic = perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'cli.py', *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall_ms = (perf_counter() - tic) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f'{args} failed: {result.stderr[-500:]}')
+    return wall_ms, parse_importtime(result.stderr)
+
+def benchmark(name: str, args: list[str], runs: int) -> dict:
+    """Benchmark a command, return median timings and the heaviest imports of the last run."""
+    wall_times = []
+    import_times = []
+    for _ in range(runs):
+        wall_ms, imports = run_once(args)
+        wall_times.append(wall_ms)
+        import_times.append(sum(imports.values()) / 1000)
+
+    heaviest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'command': name,
+        'args': args,
+        'runs': runs,
+        'wall_ms': round(median(wall_times), 2),
+        'import_ms': round(median(import_times), 2),
+        'modules': len(imports),
+        'heavy_modules': [
+            m for m in HEAVY_MODULES
+            if any(name == m or name.startswith(m + '.') for name in imports)
+        ],
+        'heaviest_imports_ms': {module: round(us / 1000, 2) for module, us in heaviest},
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup per command.')
+    parser.add_argument(
+        'commands', nargs='*', metavar='command',
+        help=f"Commands to run (default: all): {', '.join(COMMANDS)}"
+    )
+    parser.add_argument('-n', '--runs', type=int, default=10, help='Runs per command')
+    parser.add_argument('-o', '--output', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+    unknown = [name for name in args.commands if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown commands: {', '.join(unknown)} (choose from {', '.join(COMMANDS)})")
+
+    results = []
+    for name in args.commands or COMMANDS:
+        result = benchmark(name, COMMANDS[name], args.runs)
+        results.append(result)
+        heavy = ', '.join(result['heavy_modules']) or '-'
+        print(
+            f"{name:<8} wall {result['wall_ms']:>8.1f} ms  "
+            f"imports {result['import_ms']:>7.1f} ms  heavy: {heavy}"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({'python': sys.version, 'results': results}, indent=2))
+        print(f'Results written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark suite over synthetic libraries (see generate.py) of several sizes.
+
+Covers the CSV import, `load_movies`, `filter` query building and execution,
+`stats`, every script in `sql/`, `run_sql` sorting and the Data page filtering.
+Generated data is cached in benchmarks/results/data/.
+
+Usage (from the project root):
+    py benchmarks/suite.py
+    py benchmarks/suite.py -s 10k 100k -o benchmarks/results/suite.json
+    py benchmarks/suite.py -s 10k -k filter --compare benchmarks/results/suite.json
+    py benchmarks/suite.py -s 100k -k sql --plans
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_FOLDER = ROOT / 'benchmarks' / 'results' / 'data'
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+# Arguments of get_filter_query: name, year, status, movie_type, country, genres,
+# rating, watched_year, note_contains
+FILTER_CASES = {
+    'status_country': dict(status='completed', country='Korea'),
+    'genres_and': dict(genres='romance,comedy'),
+    'genres_or_not': dict(genres='action|sci-fi,-animation'),
+    'name': dict(name='love'),
+    'note': dict(note_contains='twist'),
+    'year_rating': dict(year=2020, rating=9),
+    'watched_year': dict(watched_year='2023'),
+}
+# Arguments of MovieFilterIndex.filter
+MASK_CASES = {
+    'status': dict(status='completed'),
+    'genres': dict(genres=['romance', 'comedy']),
+    'name': dict(name='love'),
+    'combined': dict(status='completed', movie_type='series', country='Korea', year=2020),
+}
+SORT_COLUMNS = ['rating', 'name', 'watched_date']
+
+def measure(func, runs: int) -> dict:
+    """Run a function `runs` times, return its median and min time (ms)."""
+    times = []
+    for _ in range(runs):
+        tic = perf_counter()
+        func()
+        times.append((perf_counter() - tic) * 1000)
+    return {'runs': runs, 'median_ms': round(median(times), 3), 'min_ms': round(min(times), 3)}
+
+def prepare_csv(label: str, size: int, seed: int) -> Path:
+    """Return the CSV file of a generated library, generating it if needed."""
+    from benchmarks.generate import generate_movies, write_csv
+
+    csv_path = DATA_FOLDER / f'movies_{label}_{seed}.csv'
+    if not csv_path.exists():
+        print(f'Generating {size} movies...')
+        write_csv(generate_movies(size, seed), csv_path)
+    return csv_path
+
+def bench_import(csv_path: Path, db_path: Path, runs: int) -> dict:
+    """Import the CSV file into a new database, the last import is kept for other benchmarks."""
+    from csv_to_sqlite import import_csv
+    from utils.db import get_connection
+
+    def run():
+        db_path.unlink(missing_ok=True)
+        con = get_connection(str(db_path))
+        import_csv(csv_path, con)
+        con.close()
+
+    return measure(run, runs)
+
+def get_query_benchmarks(con: sqlite3.Connection, db_path: Path) -> dict:
+    """Return {name: function} of the benchmarks of reads on an imported database."""
+    from utils.db import fetch_rows
+    from utils.filter import get_filter_query
+    from utils.movie import load_movies
+    from utils.sql import list_sql_files, run_sql
+    from utils.data_filter import MovieFilterIndex
+
+    cur = con.cursor()
+    benchmarks = {
+        'load_movies': lambda: load_movies(con, with_index=True),
+        'load_movies/compact': lambda: load_movies(con, with_index=True, compact=True),
+    }
+
+    def build_filter_queries():
+        for case in FILTER_CASES.values():
+            get_filter_query(cur, **case)
+    benchmarks['filter/build'] = build_filter_queries
+
+    for name, case in FILTER_CASES.items():
+        query, parameters = get_filter_query(cur, **case)
+        benchmarks[f'filter/{name}'] = (
+            lambda q=query, p=parameters: run_sql(cur, q, parameters=p)
+        )
+
+    benchmarks['stats'] = lambda: run_cli(db_path, ['stats', '-v'])
+
+    for script in sorted(list_sql_files(ROOT / 'sql')):
+        query = (ROOT / 'sql' / f'{script}.sql').read_text()
+        benchmarks[f'sql/{script}'] = lambda q=query: fetch_rows(cur, q)
+
+    all_movies = 'SELECT * FROM movie_detail'
+    benchmarks['run_sql/no_sort'] = lambda: run_sql(cur, all_movies)
+    for column in SORT_COLUMNS:
+        benchmarks[f'run_sql/sort_{column}'] = (
+            lambda c=column: run_sql(cur, all_movies, sort=(c, 'desc'))
+        )
+
+    index = None
+    def build_index():
+        nonlocal index
+        index = MovieFilterIndex(load_movies(con, with_index=True))
+    benchmarks['mask/build'] = build_index
+
+    for name, case in MASK_CASES.items():
+        def mask_filter(case=case):
+            if index is None:  # built once, outside of the timing
+                build_index()
+            index.filter(**case)
+        benchmarks[f'mask/{name}'] = mask_filter
+
+    return benchmarks
+
+def print_plans(con: sqlite3.Connection) -> None:
+    """Print the slow query plan steps (full scans, temp B-trees) of filters and SQL scripts."""
+    from utils.filter import get_filter_query
+    from utils.profile import explain_query_plan, is_slow_step
+    from utils.sql import list_sql_files
+
+    queries = {
+        f'filter/{name}': get_filter_query(con.cursor(), **case)
+        for name, case in FILTER_CASES.items()
+    }
+    for script in sorted(list_sql_files(ROOT / 'sql')):
+        queries[f'sql/{script}'] = ((ROOT / 'sql' / f'{script}.sql').read_text(), None)
+
+    for name, (query, parameters) in queries.items():
+        slow_steps = [
+            step.strip() for step in explain_query_plan(con, query, parameters)
+            if is_slow_step(step)
+        ]
+        print(f"{name:<28} {'; '.join(slow_steps) or '-'}")
+
+def run_cli(db_path: Path, args: list[str]) -> None:
+    """Run a CLI command in this process on another database, discarding its output."""
+    from contextlib import redirect_stdout
+    from io import StringIO
+    import cli
+
+    cli.DB_FILE = str(db_path)
+    cli._con = None
+    with redirect_stdout(StringIO()):
+        cli.cli.main(args=args, prog_name='cli.py', standalone_mode=False)
+    cli._con.close()
+
+def report(results: list[dict], size: str, name: str, result: dict) -> None:
+    results.append({'size': size, 'name': name, **result})
+    print(f"{size:>5} {name:<28} {result['median_ms']:>10.2f} ms")
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() or None
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    """Print the speedup of each benchmark against a previous run."""
+    baseline = {
+        (r['size'], r['name']): r['median_ms']
+        for r in json.loads(baseline_path.read_text())['results']
+    }
+    print(f'\nCompared to {baseline_path} (> 1 is faster):')
+    for r in results:
+        old = baseline.get((r['size'], r['name']))
+        if old:
+            print(f"{r['size']:>5} {r['name']:<28} {old / r['median_ms']:>7.2f}x")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark suite over synthetic libraries.')
+    parser.add_argument('-s', '--sizes', nargs='+', choices=SIZES, default=list(SIZES))
+    parser.add_argument('-n', '--runs', type=int, default=5, help='Runs per benchmark')
+    parser.add_argument('--import-runs', type=int, default=1, help='Runs of the CSV import')
+    parser.add_argument('-k', '--keyword', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the generated data')
+    parser.add_argument('-o', '--output', type=Path, help='Write results as JSON')
+    parser.add_argument('--compare', type=Path, help='Previous JSON results to compare with')
+    parser.add_argument(
+        '--plans', action='store_true', help='Print full scans and temp B-trees of each query'
+    )
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # utils use paths relative to the project root
+    sys.path.insert(0, str(ROOT))
+
+    def selected(name: str) -> bool:
+        return not args.keyword or args.keyword in name
+
+    results = []
+    for label in args.sizes:
+        csv_path = prepare_csv(label, SIZES[label], args.seed)
+        db_path = DATA_FOLDER / f'movies_{label}_{args.seed}.db'
+
+        # The imported database is reused by the next runs filtering out the import
+        if selected('import') or not db_path.exists():
+            report(results, label, 'import', bench_import(csv_path, db_path, args.import_runs))
+
+        con = sqlite3.connect(db_path)
+        for name, func in get_query_benchmarks(con, db_path).items():
+            if selected(name):
+                report(results, label, name, measure(func, args.runs))
+        if args.plans:
+            print(f'\nSlow query plan steps ({label}):')
+            print_plans(con)
+        con.close()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({
+            'commit': git_commit(),
+            'python': sys.version,
+            'sqlite': sqlite3.sqlite_version,
+            'seed': args.seed,
+            'results': results,
+        }, indent=2))
+        print(f'Results written to {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,68 @@
 import click
-import sqlite3
-from rich import print
-from pathlib import Path
-from utils.movie import load_movies
-from utils.db import get_connection
 from utils.timing import timing
-from utils.cli import AliasedGroup
-
-DB_FILE = Path('data/movies.db')
-BACKUP_FILE = Path('data/backup.db')
-CON = get_connection(DB_FILE)
+from utils.cli import AliasedGroup, KeyValue, rich_print, OUTPUT_FORMATS
+
+DB_FILE = 'data/movies.db'
+BACKUP_FILE = 'data/backup.db'
+_con = None
+_read_con = None
+
+def get_con():
+    """Return the database connection, opened on first use."""
+    # Lazy connection (and imports), so commands that don't need it start faster
+    global _con
+    if _con is None:
+        from utils.db import get_connection
+        _con = get_connection(DB_FILE)
+    return _con
+
+def get_read_con():
+    """Return the read-only database connection of read commands, opened on first use."""
+    global _read_con
+    if _read_con is None:
+        from utils.db import get_read_connection
+        _read_con = get_read_connection(DB_FILE)
+    return _read_con
 
 def update_csv() -> None:
-    """Update CSV file with data from database."""
-    df = load_movies(CON, with_index=True)
-    df.to_csv('data/data.csv', index=False)
+    """Export the CSV file after a write if auto export is on, otherwise it's marked outdated."""
+    from utils.constants import CSV_AUTO_EXPORT
+    if CSV_AUTO_EXPORT:
+        from utils.export import export_csv
+        export_csv(get_con())
+    else:
+        print("CSV file is out of date, run 'export' to update it.")
 
 # changes the default parameters to -h and --help instead of just --help
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 @click.group(cls=AliasedGroup, context_settings=CONTEXT_SETTINGS, no_args_is_help=True)
-def cli():
+@click.option(
+    '--profile', is_flag=True,
+    help='Show timing, rows and query plan of each SQL statement (full scans marked with !)'
+)
+@click.option(
+    '--profile-output', type=click.Path(dir_okay=False),
+    help='Also write the profile as JSON to this file'
+)
+@click.pass_context
+def cli(ctx, profile, profile_output):
     """Command-line tool to manage, filter, and analyze your movie collection."""
-    pass
+    if profile or profile_output:
+        from utils.profile import start_profiling
+        start_profiling()
+        ctx.call_on_close(lambda: report_profile(profile_output))
+
+def report_profile(output_file: str | None) -> None:
+    """Print the profile of the command to stderr, write it as JSON if `output_file` is given."""
+    import sys
+    from utils.profile import stop_profiling
+    profiler = stop_profiling()
+    print(profiler.format(), file=sys.stderr)
+    if output_file:
+        import json
+        with open(output_file, 'w') as f:
+            json.dump(profiler.to_dict(), f, indent=2)
+        print(f'Profile written to {output_file}', file=sys.stderr)
 
 
 @cli.command(no_args_is_help=True)
@@ -30,18 +71,29 @@ def cli():
 @click.option('-s', '--status', help="Filter by status: 'waiting', 'completed', or 'dropped'")
 @click.option('-t', '--movie-type', help="Filter by type: 'movie' or 'series'")
 @click.option('-c', '--country', help='Filter by country')
-@click.option('-g', '--genres', help='Filter by genres (comma-separated)')
+@click.option(
+    '-g', '--genres',
+    help="Filter by genres: ',' for all of (AND), '|' for any of (OR), '-' prefix to exclude (NOT)"
+)
 @click.option('-r', '--rating', type=click.IntRange(1, 10, clamp=True), help='Filter by rating')
 @click.option('-w', '--watched-year', help='Filter by watched year')
 @click.option('-nc', '--note-contains', help='Filter by substring in note (case-insensitive)')
+@click.option(
+    '--words', is_flag=True,
+    help="Match --name/--note-contains as words, 'term*' for prefix and quotes for phrase"
+)
 @click.option('--sort', help='Sort result by column')
 @click.option('--note', help='Show notes', is_flag=True)
 @click.option('--clean', help='Hide filtered column', is_flag=True)
 @click.option('--stats', help='Show statistics for the filtered results', is_flag=True)
+@click.option(
+    '-f', '--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='auto',
+    help='Output format, auto: Rich table for small results, plain text otherwise'
+)
 @timing
 def filter(
     name, year, status, movie_type, country, genres, rating, watched_year, note_contains,
-    sort, note, clean, stats
+    words, sort, note, clean, stats, output_format
 ):
     """Filter movies by attributes."""
 
@@ -55,7 +107,7 @@ def filter(
     from utils.cli import resolve_choice
     from utils.constants import MOVIE_STATUSES, MOVIE_TYPES, COUNTRIES, UNWATCHED_STATUS
 
-    cur = CON.cursor()
+    cur = get_read_con().cursor()
     if status:
         status = resolve_choice(status, MOVIE_STATUSES)
     if movie_type:
@@ -63,67 +115,10 @@ def filter(
     if country:
         country = resolve_choice(country, COUNTRIES)
 
-    def get_filter_query(
-        name, year, status, movie_type, country, genres, rating, watched_year, note_contains
-    ) -> tuple[str, list]:
-        """Build a parameterized SQL query for filtering movies."""
-
-        clause = []
-        parameters = []
-        if name:
-            clause.append('name LIKE ?')
-            parameters.append(f'%{name}%')
-        if year:
-            clause.append('year = ?')
-            parameters.append(year)
-        if status:
-            clause.append('status = ?')
-            parameters.append(status)
-        if movie_type:
-            clause.append('type = ?')
-            parameters.append(movie_type)
-        if country:
-            clause.append('country = ?')
-            parameters.append(country)
-        if genres:
-            from utils.format import format_genres
-            from utils.movie import get_genres
-
-            all_genres = get_genres(cur)
-            resolved_genres = []
-
-            # Prefix match user input to full genre names
-            # Example: "com" → "comedy" (but not "dark comedy")
-            # This prevents LIKE '%com%' from matching wrong genres.
-            for filter_genre in format_genres(genres):
-                for genre in all_genres:
-                    if genre.startswith(filter_genre):
-                        resolved_genres.append(genre)
-                        break
-            
-            # Exact genre match using comma-delimited boundaries
-            for resolved_genre in resolved_genres:
-                clause.append("',' || genres || ',' LIKE ?")
-                parameters.append(f'%,{resolved_genre},%')
-        if rating:
-            clause.append('rating = ?')
-            parameters.append(rating)
-        if watched_year:            
-            # Handle both full year and abbreviated year matching
-            year_length = len(str(watched_year))
-            clause.append(f'substr(watched_date, {4 - year_length + 1}, {year_length}) = ?')
-            parameters.append(watched_year)
-        if note_contains:
-            clause.append('note LIKE ?')
-            parameters.append(f'%{note_contains}%')
-        
-        where_clause = 'WHERE ' + ' AND '.join(clause)
-        select_clause = 'SELECT * FROM movie_detail '
-        query = select_clause + where_clause
-        return query, parameters
-
+    from utils.filter import get_filter_query
     query, parameters = get_filter_query(
-        name, year, status, movie_type, country, genres, rating, watched_year, note_contains
+        cur, name, year, status, movie_type, country, genres, rating, watched_year, note_contains,
+        words=words
     )
 
     # Show note if note_contains is given
@@ -150,8 +145,8 @@ def filter(
         except ValueError as e:
             raise click.BadParameter(str(e))
 
-    from utils.sql import run_sql
-    from utils.cli import print_rows
+    from utils.sql import run_sql, iter_sql
+    from utils.cli import output_rows
 
     # Hide rating and watched_date column for unwatched movie
     hide_columns = ['rating', 'watched_date'] if status == UNWATCHED_STATUS else []
@@ -163,8 +158,13 @@ def filter(
     if clean:
         hide_columns.extend(filtered_columns)
 
-    rows, column_names = run_sql(cur, query, parameters=parameters, note=note, sort=sort)
-    print_rows(rows, column_names, hide_columns=hide_columns, print_total=True)
+    if stats:  # need all rows
+        rows, column_names = run_sql(cur, query, parameters=parameters, note=note, sort=sort)
+    else:
+        rows, column_names = iter_sql(cur, query, parameters=parameters, note=note, sort=sort)
+    output_rows(
+        rows, column_names, output_format, hide_columns=hide_columns, print_total=True
+    )
 
     if stats:
         from collections import Counter
@@ -185,15 +185,16 @@ def get(movie_id: int):
     """Get information of a movie by id."""
     from utils.movie import get_movie
 
-    CON.row_factory = sqlite3.Row  # for dictionary conversion
-    cur = CON.cursor()
+    import sqlite3
+    cur = get_read_con().cursor()
+    cur.row_factory = sqlite3.Row  # for dictionary conversion
 
     movie = get_movie(movie_id, cur)
     if movie is None:
         print(f'Movie with id {movie_id} not found.')
         return
 
-    print(dict(movie))
+    rich_print(dict(movie))
 
 @cli.command()
 def add():
@@ -202,13 +203,13 @@ def add():
     from utils.movie_input import prompt_add_movie
 
     movie = prompt_add_movie()
-    print(movie)
+    rich_print(movie)
 
     with Status(f'Adding...') as rich_status:
         from utils.movie import add_movie
-        cur = CON.cursor()
+        cur = get_con().cursor()
         add_movie(movie, cur)
-        CON.commit()
+        get_con().commit()
         update_csv()
     print(f"Added {movie['type']}: {movie['name']!r} ({movie['year']})")
 
@@ -220,8 +221,9 @@ def update(movie_id, note):
     from utils.movie import get_movie, update_movie
     from utils.movie_input import prompt_update_movie
 
-    CON.row_factory = sqlite3.Row
-    cur = CON.cursor()
+    import sqlite3
+    cur = get_con().cursor()
+    cur.row_factory = sqlite3.Row
 
     existing_movie = get_movie(movie_id, cur)
     if existing_movie is None:
@@ -229,14 +231,14 @@ def update(movie_id, note):
         return
 
     existing_movie = dict(existing_movie)
-    print(existing_movie)
+    rich_print(existing_movie)
     existing_movie.pop('id')
 
     updated_data = prompt_update_movie(existing_movie, just_note=note)
-    print(updated_data)
+    rich_print(updated_data)
 
     update_movie(movie_id, updated_data, cur)
-    CON.commit()
+    get_con().commit()
     update_csv()
     print('Updated successfully.')
 
@@ -246,8 +248,9 @@ def delete(movie_id: int):
     """Delete a movie by id."""
     from utils.movie import get_movie, delete_movie
 
-    CON.row_factory = sqlite3.Row  # for dictionary conversion
-    cur = CON.cursor()
+    import sqlite3
+    cur = get_con().cursor()
+    cur.row_factory = sqlite3.Row  # for dictionary conversion
 
     # Sacrifice formatting for speed by using a tuple instead of a pandas DataFrame
     # Importing pandas is costly compared to sqlite
@@ -257,11 +260,11 @@ def delete(movie_id: int):
         return
 
     movie = dict(movie)
-    print(movie)
+    rich_print(movie)
 
     if click.confirm(f'Do you want to delete this {movie['type']}?', default=True):
         delete_movie(movie_id, cur)
-        CON.commit()
+        get_con().commit()
         update_csv()
         print('Deleted successfully.')
     else:
@@ -269,57 +272,69 @@ def delete(movie_id: int):
 
 @cli.command()
 @click.option('-v', '--verbose', help='Show extended statistics.', is_flag=True)
-def stats(verbose):
+@click.option(
+    '--recompute', is_flag=True,
+    help='Rebuild the statistics summary tables and report rows that were out of date'
+)
+def stats(verbose, recompute):
     """Show statistics for the movie data."""
     from utils.cli import print_rows
-    from utils.db import fetch_scalar, fetch_rows, fetch_rows_count
+    from utils.stats import collect_stats, STATS_SCRIPTS, VERBOSE_STATS_SCRIPTS
 
-    cur = CON.cursor()
+    if recompute:
+        from utils.stats import recompute_stats
+        for table, count in recompute_stats(get_con()).items():
+            print(f'{table}: {count} rows out of date' if count else f'{table}: up to date')
 
-    total = fetch_rows_count(cur)
-    avg_rating = fetch_scalar(cur, 'SELECT ROUND(AVG(rating), 2) FROM movie')
-    genres_count = fetch_rows_count(cur, 'genre')
+    stat_files = STATS_SCRIPTS + VERBOSE_STATS_SCRIPTS if verbose else STATS_SCRIPTS
+    (total, avg_rating, genres_count), results = collect_stats(get_read_con(), stat_files)
     print(f'Total: {total}')
     print(f'Average rating: {avg_rating}')
     print(f'Genres count: {genres_count}')
 
-    sql_folder = Path('sql/')
-    stat_files = ['status', 'type', 'country']
-    extended_files = ['watchedyear', 'rating', 'genres']
-
-    if verbose:
-        stat_files.extend(extended_files)
-
-    for stat_file in stat_files:
-        sql_path = sql_folder / f'{stat_file}.sql'
-        if not sql_path.exists():
-            print(f'SQL file {sql_path.name!r} not found.')
+    for stat_file, rows, column_names in results:
+        if rows is None:
+            print(f'SQL file {stat_file + ".sql"!r} not found.')
             continue
-        query = sql_path.read_text()
-        rows, column_names = fetch_rows(cur, query)
         print_rows(rows, column_names, title=f'{stat_file.capitalize()}:')
 
 @cli.command()
 @click.option('--csv', help='Back up to data/backup.csv for safer recovery', is_flag=True)
-def backup(csv):
+@click.option('--gzip', help='Compress the CSV backup (data/backup.csv.gz)', is_flag=True)
+@click.option(
+    '-s', '--snapshot', is_flag=True,
+    help='Back up to a new rotating snapshot in data/snapshots/, unless nothing changed'
+)
+def backup(csv, gzip, snapshot):
     """Back up data."""
+    from utils.backup import backup_database, take_snapshot
+    from utils.cli import get_progress_printer
     from utils.db import fetch_rows_count
     from utils.file import get_last_modified
 
-    print(f'Database rows: {fetch_rows_count(CON)}')
+    import sqlite3
+    from pathlib import Path
+    print(f'Database rows: {fetch_rows_count(get_con())}')
 
     try:
-        with sqlite3.connect(BACKUP_FILE) as backup_con:
-            print(f'Backup rows: {fetch_rows_count(backup_con)}')
-            print(f'Backup last modified: {get_last_modified(BACKUP_FILE)}')
-            click.confirm(
-                'This will overwrite the existing backup file. Continue?', abort=True, default=True
-            )
-
-            CON.backup(backup_con)
+        if snapshot:
+            path = take_snapshot(get_con(), progress=get_progress_printer('Snapshot'))
+            print(f'Snapshot: {path}' if path else 'No changes since the last snapshot.')
+        else:
+            if Path(BACKUP_FILE).exists():
+                backup_con = sqlite3.connect(BACKUP_FILE)
+                print(f'Backup rows: {fetch_rows_count(backup_con)}')
+                backup_con.close()
+                print(f'Backup last modified: {get_last_modified(BACKUP_FILE)}')
+                click.confirm(
+                    'This will overwrite the existing backup file. Continue?',
+                    abort=True, default=True
+                )
+
+            backup_database(get_con(), BACKUP_FILE, progress=get_progress_printer('Backup'))
         if csv:
-            df = load_movies(CON, with_index=True)
-            df.to_csv('data/backup.csv', index=False)
+            from utils.export import write_csv
+            write_csv(get_con(), 'data/backup.csv.gz' if gzip else 'data/backup.csv')
         print('Backup successful.')
     except click.Abort:
         print('Aborted!')
@@ -327,61 +342,119 @@ def backup(csv):
         print(f'Backup failed: {e}')
 
 @cli.command()
-def restore():
-    """Restore data from backup."""
-    import shutil
-
-    if not BACKUP_FILE.exists():
-        print("Backup file not found. Run 'backup' first.")
+@click.argument('file', type=str, required=False)
+@click.option('-s', '--snapshot', help='Restore the last snapshot', is_flag=True)
+def restore(file, snapshot):
+    """Restore data from backup (or FILE)."""
+    from pathlib import Path
+    from utils.backup import restore_database, get_snapshots
+    from utils.cli import get_progress_printer
+
+    if snapshot:
+        snapshots = get_snapshots()
+        if not snapshots:
+            print("No snapshot found. Run 'backup --snapshot' first.")
+            return
+        file = snapshots[-1]
+    file = Path(file or BACKUP_FILE)
+
+    if not file.exists():
+        print(f"Backup file {str(file)!r} not found. Run 'backup' first.")
         return
 
     from utils.file import get_last_modified
-    print(f'Backup last modified: {get_last_modified(BACKUP_FILE)}')
+    print(f'Backup: {file}, last modified: {get_last_modified(file)}')
     click.confirm(
         'This will replace your current movie database with the backup file. Continue?', abort=True
     )
 
     try:
-        shutil.copyfile(BACKUP_FILE, DB_FILE)
-        update_csv()
+        # Copied into the open connection, with the locks of a write (not under it)
+        restore_database(get_con(), file, progress=get_progress_printer('Restore'))
+
+        # The export state was restored too, it doesn't describe the current CSV file
+        from utils.export import export_csv
+        export_csv(get_con(), force=True)
         print('Restore successful.')
     except Exception as e:
         print(f'Restore failed: {e}')
 
+@cli.command()
+@click.option('-f', '--force', help='Export even if the file is up to date', is_flag=True)
+@click.option(
+    '--format', 'file_format', type=click.Choice(['csv', 'parquet', 'arrow']), default='csv',
+    help='csv: data/data.csv, parquet/arrow: typed data/movies and data/movie_genres files '
+         '(requires pyarrow)'
+)
+def export(force, file_format):
+    """Export data to data/data.csv if it is out of date."""
+    if file_format != 'csv':
+        from utils.export import export_columnar, get_columnar_paths
+        try:
+            total = export_columnar(get_con(), file_format, force=force)
+        except ImportError:
+            print(f'{file_format} export requires pyarrow: uv sync --extra export')
+            return
+        paths = ' and '.join(str(path) for path in get_columnar_paths(file_format))
+        print(f'{paths} are up to date.' if total is None else f'Exported {total} movies to {paths}.')
+        return
+
+    from utils.export import export_csv, CSV_FILE
+
+    total = export_csv(get_con(), force=force)
+    if total is None:
+        print(f'{CSV_FILE} is up to date.')
+    else:
+        print(f'Exported {total} rows to {CSV_FILE}.')
+
 @cli.command()
 @click.argument('filename', type=str, required=False)
 @click.option('--note', help='Show notes', is_flag=True)
 @click.option('-s', '--sort', help='Sort result by column', nargs=2)
 @click.option('-v', '--verbose', help='Show SQL file contents', is_flag=True)
+@click.option(
+    '-p', '--param', 'params', type=KeyValue(), multiple=True,
+    help='Value of a named parameter of the script (:name), e.g. -p month=2025-03'
+)
+@click.option(
+    '-f', '--format', 'output_format', type=click.Choice(OUTPUT_FORMATS), default='auto',
+    help='Output format, auto: Rich table for small results, plain text otherwise'
+)
 @timing
-def sql(filename, note, sort, verbose):
+def sql(filename, note, sort, verbose, params, output_format):
     """Run a SQL file from the 'sql/' folder."""
-    from utils.sql import list_sql_files
+    from utils.sql import get_script_registry
     from utils.cli import print_sql_files
 
-    sql_folder = Path('sql/')
-    sql_files = list_sql_files(sql_folder)
+    registry = get_script_registry('sql/')
     if not filename:
-        print_sql_files(sql_files)
+        print_sql_files(registry.list())
         return
 
-    from utils.sql import resolve_sql_path
-    sql_path, match_type = resolve_sql_path(filename, sql_folder, sql_files)
+    name, match_type = registry.resolve(filename)
     if match_type is None:
         raise FileNotFoundError(f"No SQL file found matching '{filename}'")
     else:
-        print(f"{match_type} match: '{sql_path.name}'")
+        import sys
+        print(f"{match_type} match: '{name}.sql'", file=sys.stderr)  # keep stdout for data
 
-    query = sql_path.read_text()
+    script = registry.get(name)
+    try:
+        parameters = script.bind(dict(params))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'-p' / '--param'")
+
+    query = script.query
     if verbose:
-        print(f'\n[dim]{query}[/dim]\n')
+        from rich import print as rprint
+        rprint(f'\n[dim]{query}[/dim]\n')
 
-    from utils.sql import run_sql
-    from utils.cli import print_rows
+    from utils.sql import iter_sql
+    from utils.cli import output_rows
 
-    cur = CON.cursor()
-    rows, column_names = run_sql(cur, query, note=note, sort=sort)
-    print_rows(rows, column_names, print_total=True)
+    cur = get_read_con().cursor()
+    rows, column_names = iter_sql(cur, query, parameters=parameters, note=note, sort=sort)
+    output_rows(rows, column_names, output_format, print_total=True)
 
 @cli.command()
 @click.argument('number', type=int, required=False, default=10)
@@ -395,8 +468,10 @@ def recent(number, note):
     from utils.sql import run_sql
     from utils.cli import print_rows
 
+    from pathlib import Path
+
     query = Path('sql/command/recent.sql').read_text()
-    cur = CON.cursor()
+    cur = get_read_con().cursor()
     rows, column_names = run_sql(cur, query, parameters=(number,), note=note)
     print_rows(rows, column_names)
 
@@ -412,33 +487,57 @@ def latest(number, note):
     from utils.sql import run_sql
     from utils.cli import print_rows
 
+    from pathlib import Path
+
     query = Path('sql/command/latest.sql').read_text()
-    cur = CON.cursor()
+    cur = get_read_con().cursor()
     rows, column_names = run_sql(cur, query, parameters=(number,), note=note)
     print_rows(rows, column_names)
 
 @cli.command()
 @click.argument('keyword', type=str)
 @click.option('--note', help='Show notes', is_flag=True)
+@click.option(
+    '-w', '--words', is_flag=True,
+    help="Match words instead of substring, 'term*' for prefix and quotes for phrase"
+)
 @timing
-def search(keyword, note):
+def search(keyword, note, words):
     """
-    Search movies by keyword.
+    Search movies by keyword, best matches first.
 
     Default searches in 'name'. Use --note to search in 'note' and display it.
     """
     from utils.sql import run_sql
     from utils.cli import print_rows
+    from utils.fts import get_search_query
 
-    if note:
-        query = "SELECT * FROM movie_detail WHERE note LIKE '%' || ? || '%'"
-    else:
-        query = "SELECT * FROM movie_detail WHERE name LIKE '%' || ? || '%'"
-
-    cur = CON.cursor()
-    rows, column_names = run_sql(cur, query, parameters=(keyword,), note=note)
+    query, parameters = get_search_query(keyword, 'note' if note else 'name', words)
+    cur = get_read_con().cursor()
+    rows, column_names = run_sql(cur, query, parameters=parameters, note=note)
     print_rows(rows, column_names)
 
+    if not rows and not note:
+        from utils.fuzzy import get_name_index
+        suggestions = get_name_index(cur).get_matches(keyword, n=3)
+        if suggestions:
+            print(f"Did you mean: {', '.join(map(repr, suggestions))}?")
+
+@cli.command()
+@click.option('--socket', 'socket_path', help='Unix socket path (default: SERVER_SOCKET)')
+def serve(socket_path):
+    """
+    Run a warm server for read commands, used by client.py.
+
+    Keeps the connection and imports warm, so each command forwarded by
+    `py client.py <command> ...` skips interpreter start, imports and connecting.
+    """
+    from utils.server import serve as serve_commands
+    from utils.constants import SERVER_SOCKET
+
+    get_read_con()  # connect (and migrate) before the first request
+    serve_commands(cli, socket_path or SERVER_SOCKET)
+
 @cli.command()
 @timing
 def optimize():
@@ -450,13 +549,14 @@ def optimize():
 
     before = get_file_size(DB_FILE)
 
-    cur = CON.cursor()
+    cur = get_con().cursor()
     print('Optimizing database...')
     try:
         print('Running VACUUM...')
         cur.execute('VACUUM')
     except Exception as e:
-        print(f'[red]Error during VACUUM:[/red] {e}')
+        from rich import print as rprint
+        rprint(f'[red]Error during VACUUM:[/red] {e}')
         return
 
     after = get_file_size(DB_FILE)
@@ -475,5 +575,8 @@ if __name__ == '__main__':
     except Exception as e:
         print(f'Exception: {e}')
     finally:
-        CON.close()
-        # print('Closed connection.')
\ No newline at end of file
+        if _con is not None:
+            _con.close()
+            # print('Closed connection.')
+        if _read_con is not None:
+            _read_con.close()
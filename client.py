@@ -0,0 +1,54 @@
+"""
+Thin client for the CLI server, for scripts running many lookups.
+
+Forwards read commands (filter, get, search, sql, stats, recent, latest) to a
+server started with `py cli.py serve` and prints the result, other commands
+(or when no server is running) run in this process like `py cli.py`.
+
+Usage:
+    py client.py get 42
+    py client.py filter -s c -c Korea
+"""
+import json
+import os
+import socket
+import sys
+
+def request(socket_path: str, argv: list[str]) -> dict | None:
+    """Send a command to the server, return its response or None if no server is running."""
+    tty = sys.stdout.isatty()
+    width = os.get_terminal_size().columns if tty else None
+    message = json.dumps({'argv': argv, 'tty': tty, 'width': width}).encode() + b'\n'
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        client.sendall(message)
+        with client.makefile('rb') as reader:
+            return json.loads(reader.readline())
+
+def main(argv: list[str]) -> int:
+    from utils.constants import SERVER_SOCKET
+
+    response = request(SERVER_SOCKET, argv)
+    if response is not None and response.get('forward', True):
+        sys.stdout.write(response['output'])
+        return response['exit_code']
+
+    # Fallback: run the command here
+    import cli
+    try:
+        cli.cli.main(args=argv, prog_name='cli.py')
+    except Exception as e:  # like `py cli.py`
+        print(f'Exception: {e}')
+        return 1
+    finally:
+        if cli._con is not None:
+            cli._con.close()
+        if cli._read_con is not None:
+            cli._read_con.close()
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
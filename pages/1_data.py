@@ -1,13 +1,15 @@
 import streamlit as st
-import pandas as pd
 
-from utils.streamlit_helpers import load_data_with_cache, load_column_config, get_options
-from utils.format import format_genres
+from utils.streamlit_helpers import (
+    load_data_with_version, reload_data, get_filter_index, get_options, get_memory_usage,
+    load_column_config,
+)
 
 st.set_page_config(page_title = 'Movie Manager', page_icon=':movie_camera:', layout='wide')
 
-df = load_data_with_cache()
-options = get_options(df)
+df, version = load_data_with_version()  # only changed movies are re-read
+index = get_filter_index(df, version)
+options = get_options(df, version)
 
 # First bar
 seach_bar, year_bar, watched_year_bar, status_bar, refresh_button = st.columns(
@@ -22,7 +24,7 @@ selected_status = status_bar.segmented_control(
     'Status', options=options['status'], selection_mode='single', width='stretch'
 )
 if refresh_button.button('Refresh', width='content'):
-    load_data_with_cache.clear()
+    reload_data()
     st.rerun()
 
 # Second bar
@@ -33,33 +35,18 @@ selected_genres = genre_bar.multiselect('Genres', options=options['genres'])
 selected_type = type_bar.selectbox('Type', options=options['type'], index=None)
 selected_country = country_bar.selectbox('Country', options=options['country'], index=None)
 
-# Filtering by mask
-mask = pd.Series(True, index=df.index)
-if name:
-    mask &= df['name'].str.contains(name, case=False, na=False)
-
-if selected_year:
-    mask &= df['year'] == selected_year
-
-if selected_watched_year:
-    mask &= df['watched_date'].str.startswith(str(selected_watched_year))
-
-if selected_status:
-    mask &= df['status'] == selected_status
-
-if selected_genres:
-    genres_set = df['genres'].fillna('').apply(lambda g: format_genres(g, as_set=True))
-    mask &= genres_set.apply(lambda g: set(selected_genres).issubset(g))
-
-if selected_type:
-    mask &= df['type'] == selected_type
-
-if selected_country:
-    mask &= df['country'] == selected_country
-
-filtered_df = df[mask]
+filtered_df = index.filter(
+    name=name,
+    year=selected_year,
+    watched_year=selected_watched_year,
+    status=selected_status,
+    genres=selected_genres,
+    movie_type=selected_type,
+    country=selected_country,
+)
 show_id = container.checkbox('Show id', value=True)
 container.write(f'Total: **{filtered_df.shape[0]}**, \
-         Memory usage: **{filtered_df.memory_usage().sum() / 1024:.2f} KB**')
+         Memory usage: **{filtered_df.memory_usage().sum() / 1024:.2f} KB**, \
+         Cached data: **{get_memory_usage(df, version) / 1024**2:.2f} MB**')
 
 st.dataframe(filtered_df, column_config=load_column_config(), hide_index=not show_id, height=320)
\ No newline at end of file
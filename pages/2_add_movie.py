@@ -1,7 +1,7 @@
 import streamlit as st
 from utils.date import get_today, get_year
-from utils.movie import add_movie, load_movies, get_countries
-from utils.db import get_connection
+from utils.movie import add_movie, get_countries
+from utils.streamlit_helpers import get_csv_writer, get_pool
 from utils.format import format_genres
 from utils.constants import MOVIE_TYPES, MOVIE_STATUSES, UNWATCHED_STATUS
 
@@ -53,14 +53,10 @@ def add_to_db() -> None:
         'note': st.session_state['note'],
     }
 
-    with get_connection() as con:
-        cur = con.cursor()
-        add_movie(movie, cur)
-        con.commit()
+    with get_pool().write() as con:
+        add_movie(movie, con.cursor())
 
-        # Update csv file
-        df = load_movies(con, with_index=True)
-        df.to_csv('data/data.csv', index=False)
+    get_csv_writer().schedule()  # Update csv file
 
     st.toast(f'Added **{name}**.', icon='✅')
     reset_form()
@@ -76,9 +72,8 @@ with container:
 
     country_bar, genres_bar = st.columns([1, 2])
     
-    with get_connection() as con:
-        cur = con.cursor()
-        countries = get_countries(cur)
+    with get_pool().read() as con:
+        countries = get_countries(con.cursor())
     
     country_bar.selectbox(
         'Country', options=countries, placeholder='Choose or add option', 
@@ -1,7 +1,10 @@
 import streamlit as st
-from utils.streamlit_helpers import load_data_with_cache, load_column_config
-from utils.db import get_connection
-from utils.movie import load_movies, add_movie, update_movie, delete_movie
+from utils.streamlit_helpers import (
+    load_data_for_editing, load_column_config, get_csv_writer, get_pool
+)
+from utils.movie import (
+    get_genre_map, to_movie_row, add_movies, update_movies, delete_movies
+)
 from utils.constants import UNWATCHED_STATUS
 
 st.set_page_config(page_title = 'Edit movies', page_icon=':pencil2:', layout='wide')
@@ -19,7 +22,11 @@ def get_default_values() -> dict:
         'note': None,
     }
 
-df = load_data_with_cache()
+# Snapshot of the shared frame pinned per session until Update/Refresh,
+# edited rows are positions in this frame
+if 'edit_df' not in st.session_state:
+    st.session_state['edit_df'] = load_data_for_editing()
+df = st.session_state['edit_df']
 st.data_editor(
     df,
     column_config=load_column_config(),
@@ -37,36 +44,34 @@ if container.button(
 ):
     edited = st.session_state['editor']
 
-    with get_connection() as con:
+    with get_pool().write() as con:  # commits all changes at once
         cur = con.cursor()
-        
+        genre_map = get_genre_map(cur)  # shared genre cache
+
         # Add
-        for movie in edited['added_rows']:
-            new_movie = get_default_values()
-            new_movie.update(movie)
-            add_movie(new_movie, cur)
+        add_movies(
+            [to_movie_row({**get_default_values(), **movie}) for movie in edited['added_rows']],
+            cur, genre_map
+        )
 
         # Update
-        for row_number, updated_data in edited['edited_rows'].items():
-            movie_id = int(df.index[row_number])
-            update_movie(movie_id, updated_data, cur)
-
-        # Delete 
-        for row_number in edited['deleted_rows']:
-            movie_id = int(df.index[row_number])
-            delete_movie(movie_id, cur)
+        update_movies(
+            {
+                int(df.index[row_number]): updated_data
+                for row_number, updated_data in edited['edited_rows'].items()
+            },
+            cur, genre_map
+        )
 
-        con.commit()
-        
-        # Update csv file
-        df = load_movies(con, with_index=True)
-        df.to_csv('data/data.csv', index=False)
+        # Delete
+        delete_movies([int(df.index[row_number]) for row_number in edited['deleted_rows']], cur)
 
-    load_data_with_cache.clear()  # Clear cache
+    get_csv_writer().schedule()  # Update csv file
+    del st.session_state['edit_df']  # the next run gets the changes
     st.toast('Updated database.', icon='✅')
 
 if container.button('Refresh'):
-    load_data_with_cache.clear()
+    st.session_state.pop('edit_df', None)
 
 # Because of streamlit data_editor behavior
 right.info('After clicking `Update`, click `Refresh` to continue editing on this page.')
\ No newline at end of file
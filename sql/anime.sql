@@ -11,4 +11,9 @@ SELECT
     watched_date,
     note
 FROM movie_detail
-WHERE country = 'Japan' AND genres LIKE '%animation%'
\ No newline at end of file
+WHERE country = 'Japan' AND id IN (
+    SELECT mg.movie_id
+    FROM movie_genre mg
+    JOIN genre g ON g.id = mg.genre_id
+    WHERE g.name = 'animation'
+)
\ No newline at end of file
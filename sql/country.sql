@@ -1,13 +1,13 @@
--- Country statistics
+-- Country statistics (from the movie_stats summary table, see schema.sql)
 SELECT
     country,
-    COUNT(*) AS count,
-    ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM movie), 2) || '%' AS percent,
-    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed,
-    SUM(CASE WHEN status = 'dropped' THEN 1 ELSE 0 END) AS dropped,
-    -- SUM(CASE WHEN status in ('completed', 'dropped') THEN 1 ELSE 0 END) AS watched,
-    ROUND(100.0 * SUM(CASE WHEN status IN ('completed', 'dropped') THEN 1 ELSE 0 END) / COUNT(*), 2) || '%' AS watched_percent,
-    ROUND(AVG(rating), 2) AS avg_rating
-FROM movie
+    SUM(count) AS count,
+    ROUND(100.0 * SUM(count) / (SELECT SUM(count) FROM movie_stats), 2) || '%' AS percent,
+    SUM(CASE WHEN status = 'completed' THEN count ELSE 0 END) AS completed,
+    SUM(CASE WHEN status = 'dropped' THEN count ELSE 0 END) AS dropped,
+    -- SUM(CASE WHEN status in ('completed', 'dropped') THEN count ELSE 0 END) AS watched,
+    ROUND(100.0 * SUM(CASE WHEN status IN ('completed', 'dropped') THEN count ELSE 0 END) / SUM(count), 2) || '%' AS watched_percent,
+    ROUND(SUM(rating * count) / SUM(CASE WHEN rating IS NOT NULL THEN count END), 2) AS avg_rating
+FROM movie_stats
 GROUP BY country
-ORDER BY count DESC;
\ No newline at end of file
+ORDER BY count DESC;
@@ -1,22 +1,22 @@
--- Genres statistics
-WITH movie_flags AS (
+-- Genres statistics (from the genre_stats summary table, see schema.sql)
+WITH genre_flags AS (
     SELECT
-        m.id,
-        m.rating,
+        genre_id,
+        count,
+        rating,
         CASE 
-            WHEN m.status IN ('completed', 'dropped') THEN 1 ELSE 0 
-        END AS watched_flag
-    FROM movie m
+            WHEN status IN ('completed', 'dropped') THEN count ELSE 0 
+        END AS watched
+    FROM genre_stats
 )
 SELECT 
     g.id, 
     g.name, 
-    COUNT(*) AS count, 
-    SUM(mf.watched_flag) AS watched,
-    ROUND(100.0 * SUM(mf.watched_flag) / COUNT(*), 2) || '%' AS watched_percent,
-    ROUND(AVG(mf.rating), 2) AS avg_rating
+    IFNULL(SUM(gf.count), 0) AS count, 
+    IFNULL(SUM(gf.watched), 0) AS watched,
+    ROUND(100.0 * SUM(gf.watched) / SUM(gf.count), 2) || '%' AS watched_percent,
+    ROUND(SUM(gf.rating * gf.count) / SUM(CASE WHEN gf.rating IS NOT NULL THEN gf.count END), 2) AS avg_rating
 FROM genre AS g
-LEFT JOIN movie_genre mg ON mg.genre_id = g.id
-LEFT JOIN movie_flags mf ON mf.id = mg.movie_id
+LEFT JOIN genre_flags gf ON gf.genre_id = g.id
 GROUP BY g.name
-ORDER BY count DESC;
\ No newline at end of file
+ORDER BY count DESC;
@@ -1,5 +1,7 @@
--- List all movies/series watched in last month
+-- List all movies/series watched in last month (or the month before -p month=YYYY-MM)
+-- BETWEEN 'YYYY-MM' AND 'YYYY-MM-31', a range on idx_movie_detail_watched_date
 SELECT * FROM movie_detail
-WHERE SUBSTR(watched_date, 1, 7) = strftime('%Y-%m', CURRENT_DATE, '-1 month')
--- WHERE strftime('%Y-%m', watched_date) = strftime('%Y-%m', CURRENT_DATE, '-1 month')
-ORDER BY watched_date;
\ No newline at end of file
+WHERE watched_date BETWEEN strftime('%Y-%m', COALESCE(:month || '-01', CURRENT_DATE), 'start of month', '-1 month')
+    AND strftime('%Y-%m', COALESCE(:month || '-01', CURRENT_DATE), 'start of month', '-1 month') || '-31'
+-- WHERE SUBSTR(watched_date, 1, 7) = strftime('%Y-%m', CURRENT_DATE, 'start of month', '-1 month')
+ORDER BY watched_date;
@@ -1,7 +1,7 @@
--- List all movies/series watched in last year
+-- List all movies/series watched in last year (or the year before -p year=YYYY)
+-- BETWEEN 'YYYY' AND 'YYYY-12-31', a range on idx_movie_detail_watched_date
 SELECT * FROM movie_detail
-WHERE SUBSTR(watched_date, 1, 4) = strftime('%Y', CURRENT_DATE, '-1 year')
--- WHERE strftime('%Y', watched_date) = strftime('%Y', CURRENT_DATE, '-1 year')
--- WHERE watched_date >= date(CURRENT_DATE, 'start of year', '-1 year')
---   AND watched_date < date(CURRENT_DATE, 'start of year')
-ORDER BY watched_date;
\ No newline at end of file
+WHERE watched_date BETWEEN strftime('%Y', COALESCE(:year || '-01-01', CURRENT_DATE), '-1 year')
+    AND strftime('%Y', COALESCE(:year || '-01-01', CURRENT_DATE), '-1 year') || '-12-31'
+-- WHERE SUBSTR(watched_date, 1, 4) = strftime('%Y', CURRENT_DATE, '-1 year')
+ORDER BY watched_date;
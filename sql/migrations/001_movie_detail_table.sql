@@ -0,0 +1,3 @@
+-- movie_detail changed from a view to a trigger-maintained table (see schema.sql).
+-- The table is created and backfilled when schema.sql runs after this migration.
+DROP VIEW IF EXISTS movie_detail;
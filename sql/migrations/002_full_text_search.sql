@@ -0,0 +1,2 @@
+-- Full-text search tables and triggers for name and note.
+-- Nothing to alter, they are created and backfilled when schema.sql runs after this migration.
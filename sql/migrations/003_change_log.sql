@@ -0,0 +1,2 @@
+-- Change log and sync state tables, for incremental exports.
+-- Nothing to alter, they are created when schema.sql runs after this migration.
@@ -0,0 +1,2 @@
+-- Summary tables for statistics (movie_stats, genre_stats).
+-- Nothing to alter, they are created and backfilled when schema.sql runs after this migration.
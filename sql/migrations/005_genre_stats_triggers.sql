@@ -0,0 +1,2 @@
+-- genre_stats triggers read movie instead of movie_detail, deleted movies are counted out
+-- before their genres. Nothing to alter, the triggers are recreated when schema.sql runs.
@@ -1,12 +1,11 @@
--- Rating statistics
+-- Rating statistics (from the movie_stats summary table, see schema.sql)
 SELECT 
     rating, 
-    COUNT(*) AS count,
-    -- ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM movie), 2) || '%' AS percent
-    -- MAX(watched_date) AS latest_watched
-    SUM(CASE WHEN type = 'movie' THEN 1 ELSE 0 END) AS movie_count,
-    SUM(CASE WHEN type = 'series' THEN 1 ELSE 0 END) AS series_count
-FROM movie
+    SUM(count) AS count,
+    -- ROUND(100.0 * SUM(count) / (SELECT SUM(count) FROM movie_stats), 2) || '%' AS percent
+    SUM(CASE WHEN type = 'movie' THEN count ELSE 0 END) AS movie_count,
+    SUM(CASE WHEN type = 'series' THEN count ELSE 0 END) AS series_count
+FROM movie_stats
 -- WHERE rating IS NOT NULL
 GROUP BY rating
-ORDER BY rating DESC;
\ No newline at end of file
+ORDER BY rating DESC;
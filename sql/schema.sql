@@ -1,8 +1,8 @@
 -- name,year,status,type,country,genres,rating,watched_date,note
 CREATE TABLE IF NOT EXISTS movie (
     id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL, 
-    year INTEGER, 
+    name TEXT NOT NULL,
+    year INTEGER,
     status TEXT NOT NULL,
     type TEXT,
     country TEXT,
@@ -24,8 +24,33 @@ CREATE TABLE IF NOT EXISTS movie_genre (
     PRIMARY KEY (movie_id, genre_id)
 );
 
--- view
-CREATE VIEW IF NOT EXISTS movie_detail AS
+-- Reverse lookup for genre -> movies, also used by ON DELETE CASCADE from genre
+CREATE INDEX IF NOT EXISTS idx_movie_genre_genre ON movie_genre (genre_id, movie_id);
+
+-- Materialized movie details, one row per movie with genres pre-aggregated.
+-- Kept in sync by the triggers below, so reads never re-run the JOIN + GROUP BY.
+CREATE TABLE IF NOT EXISTS movie_detail (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    year INTEGER,
+    status TEXT NOT NULL,
+    type TEXT,
+    country TEXT,
+    genres TEXT,
+    rating REAL,
+    watched_date TEXT,
+    note TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_movie_detail_status ON movie_detail (status);
+CREATE INDEX IF NOT EXISTS idx_movie_detail_type ON movie_detail (type);
+CREATE INDEX IF NOT EXISTS idx_movie_detail_country ON movie_detail (country);
+CREATE INDEX IF NOT EXISTS idx_movie_detail_year ON movie_detail (year);
+CREATE INDEX IF NOT EXISTS idx_movie_detail_rating ON movie_detail (rating);
+CREATE INDEX IF NOT EXISTS idx_movie_detail_watched_date ON movie_detail (watched_date);
+
+-- Backfill (only when empty, e.g. first run after migrating from the old view)
+INSERT INTO movie_detail (id, name, year, status, type, country, genres, rating, watched_date, note)
 SELECT
     m.id,
     m.name,
@@ -40,4 +65,315 @@ SELECT
 FROM movie AS m
 LEFT JOIN movie_genre mg ON m.id = mg.movie_id
 LEFT JOIN genre g ON g.id = mg.genre_id
-GROUP BY m.id;
\ No newline at end of file
+WHERE NOT EXISTS (SELECT 1 FROM movie_detail)
+GROUP BY m.id;
+
+-- triggers: movie -> movie_detail
+DROP TRIGGER IF EXISTS movie_detail_after_movie_insert;
+CREATE TRIGGER movie_detail_after_movie_insert AFTER INSERT ON movie
+BEGIN
+    INSERT INTO movie_detail (id, name, year, status, type, country, rating, watched_date, note)
+    VALUES (
+        NEW.id, NEW.name, NEW.year, NEW.status, NEW.type, NEW.country,
+        NEW.rating, NEW.watched_date, NEW.note
+    );
+END;
+
+DROP TRIGGER IF EXISTS movie_detail_after_movie_update;
+CREATE TRIGGER movie_detail_after_movie_update AFTER UPDATE ON movie
+BEGIN
+    UPDATE movie_detail SET
+        id = NEW.id,
+        name = NEW.name,
+        year = NEW.year,
+        status = NEW.status,
+        type = NEW.type,
+        country = NEW.country,
+        rating = NEW.rating,
+        watched_date = NEW.watched_date,
+        note = NEW.note
+    WHERE id = OLD.id;
+END;
+
+DROP TRIGGER IF EXISTS movie_detail_after_movie_delete;
+CREATE TRIGGER movie_detail_after_movie_delete AFTER DELETE ON movie
+BEGIN
+    DELETE FROM movie_detail WHERE id = OLD.id;
+END;
+
+-- triggers: movie_genre -> movie_detail.genres
+DROP TRIGGER IF EXISTS movie_detail_after_movie_genre_insert;
+CREATE TRIGGER movie_detail_after_movie_genre_insert AFTER INSERT ON movie_genre
+BEGIN
+    UPDATE movie_detail SET genres = (
+        SELECT GROUP_CONCAT(g.name, ',')
+        FROM movie_genre mg
+        JOIN genre g ON g.id = mg.genre_id
+        WHERE mg.movie_id = NEW.movie_id
+    )
+    WHERE id = NEW.movie_id;
+END;
+
+DROP TRIGGER IF EXISTS movie_detail_after_movie_genre_delete;
+CREATE TRIGGER movie_detail_after_movie_genre_delete AFTER DELETE ON movie_genre
+BEGIN
+    UPDATE movie_detail SET genres = (
+        SELECT GROUP_CONCAT(g.name, ',')
+        FROM movie_genre mg
+        JOIN genre g ON g.id = mg.genre_id
+        WHERE mg.movie_id = OLD.movie_id
+    )
+    WHERE id = OLD.movie_id;
+END;
+
+-- triggers: genre -> movie_detail.genres (renaming a genre)
+DROP TRIGGER IF EXISTS movie_detail_after_genre_update;
+CREATE TRIGGER movie_detail_after_genre_update AFTER UPDATE OF name ON genre
+BEGIN
+    UPDATE movie_detail SET genres = (
+        SELECT GROUP_CONCAT(g.name, ',')
+        FROM movie_genre mg
+        JOIN genre g ON g.id = mg.genre_id
+        WHERE mg.movie_id = movie_detail.id
+    )
+    WHERE id IN (SELECT movie_id FROM movie_genre WHERE genre_id = NEW.id);
+END;
+
+-- Full-text search over name and note, indexing the movie table (external content)
+-- trigram: case-insensitive substring matching (at least 3 characters)
+CREATE VIRTUAL TABLE IF NOT EXISTS movie_fts USING fts5(
+    name, note, content='movie', content_rowid='id', tokenize='trigram'
+);
+-- unicode61: word matching, with prefix indexes for prefix queries
+CREATE VIRTUAL TABLE IF NOT EXISTS movie_fts_word USING fts5(
+    name, note, content='movie', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+-- Backfill (only when the index is empty)
+INSERT INTO movie_fts (movie_fts) SELECT 'rebuild'
+WHERE NOT EXISTS (SELECT 1 FROM movie_fts_docsize);
+INSERT INTO movie_fts_word (movie_fts_word) SELECT 'rebuild'
+WHERE NOT EXISTS (SELECT 1 FROM movie_fts_word_docsize);
+
+-- triggers: movie -> movie_fts, movie_fts_word
+DROP TRIGGER IF EXISTS movie_fts_after_movie_insert;
+CREATE TRIGGER movie_fts_after_movie_insert AFTER INSERT ON movie
+BEGIN
+    INSERT INTO movie_fts (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+    INSERT INTO movie_fts_word (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+END;
+
+DROP TRIGGER IF EXISTS movie_fts_after_movie_delete;
+CREATE TRIGGER movie_fts_after_movie_delete AFTER DELETE ON movie
+BEGIN
+    INSERT INTO movie_fts (movie_fts, rowid, name, note)
+    VALUES ('delete', OLD.id, OLD.name, OLD.note);
+    INSERT INTO movie_fts_word (movie_fts_word, rowid, name, note)
+    VALUES ('delete', OLD.id, OLD.name, OLD.note);
+END;
+
+DROP TRIGGER IF EXISTS movie_fts_after_movie_update;
+CREATE TRIGGER movie_fts_after_movie_update AFTER UPDATE OF id, name, note ON movie
+BEGIN
+    INSERT INTO movie_fts (movie_fts, rowid, name, note)
+    VALUES ('delete', OLD.id, OLD.name, OLD.note);
+    INSERT INTO movie_fts_word (movie_fts_word, rowid, name, note)
+    VALUES ('delete', OLD.id, OLD.name, OLD.note);
+    INSERT INTO movie_fts (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+    INSERT INTO movie_fts_word (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+END;
+
+-- Change log of movie_detail rows, used to know what changed since an export/refresh.
+-- AUTOINCREMENT keeps seq increasing even after old changes are pruned.
+CREATE TABLE IF NOT EXISTS movie_change (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    movie_id INTEGER NOT NULL,
+    op TEXT NOT NULL,  -- 'insert', 'update' or 'delete'
+    changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Last change seq consumed by each sync target (e.g. 'csv' for data/data.csv)
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+
+-- triggers: movie_detail -> movie_change
+-- movie_detail already gathers changes of movie, movie_genre and genre
+DROP TRIGGER IF EXISTS movie_change_after_insert;
+CREATE TRIGGER movie_change_after_insert AFTER INSERT ON movie_detail
+BEGIN
+    INSERT INTO movie_change (movie_id, op) VALUES (NEW.id, 'insert');
+END;
+
+DROP TRIGGER IF EXISTS movie_change_after_update;
+CREATE TRIGGER movie_change_after_update AFTER UPDATE ON movie_detail
+BEGIN
+    INSERT INTO movie_change (movie_id, op) SELECT OLD.id, 'delete' WHERE OLD.id != NEW.id;
+    INSERT INTO movie_change (movie_id, op) VALUES (NEW.id, 'update');
+END;
+
+DROP TRIGGER IF EXISTS movie_change_after_delete;
+CREATE TRIGGER movie_change_after_delete AFTER DELETE ON movie_detail
+BEGIN
+    INSERT INTO movie_change (movie_id, op) VALUES (OLD.id, 'delete');
+END;
+
+-- Summary tables for statistics (`stats` command and the statistics scripts), kept
+-- current by the triggers below: one row per distinct combination of the grouped
+-- columns with its number of movies, so statistics aggregate a few hundred rows
+-- instead of the whole library. Missing values are NULL, matched with IS.
+CREATE TABLE IF NOT EXISTS movie_stats (
+    status TEXT,
+    type TEXT,
+    country TEXT,
+    watched_year TEXT,  -- SUBSTR(watched_date, 1, 4)
+    rating REAL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_movie_stats
+ON movie_stats (status, type, country, watched_year, rating);
+
+-- Movies per genre, status and rating (from movie_genre and movie_detail)
+CREATE TABLE IF NOT EXISTS genre_stats (
+    genre_id INTEGER NOT NULL,
+    status TEXT,
+    rating REAL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_genre_stats ON genre_stats (genre_id, status, rating);
+
+-- Backfill (only when empty, e.g. first run after migrating or after a bulk import)
+INSERT INTO movie_stats (status, type, country, watched_year, rating, count)
+SELECT status, type, country, SUBSTR(watched_date, 1, 4), rating, COUNT(*)
+FROM movie
+WHERE NOT EXISTS (SELECT 1 FROM movie_stats)
+GROUP BY status, type, country, SUBSTR(watched_date, 1, 4), rating;
+
+INSERT INTO genre_stats (genre_id, status, rating, count)
+SELECT mg.genre_id, m.status, m.rating, COUNT(*)
+FROM movie_genre mg
+JOIN movie m ON m.id = mg.movie_id
+WHERE NOT EXISTS (SELECT 1 FROM genre_stats)
+GROUP BY mg.genre_id, m.status, m.rating;
+
+-- triggers: movie -> movie_stats
+DROP TRIGGER IF EXISTS movie_stats_after_movie_insert;
+CREATE TRIGGER movie_stats_after_movie_insert AFTER INSERT ON movie
+BEGIN
+    INSERT INTO movie_stats (status, type, country, watched_year, rating, count)
+    SELECT NEW.status, NEW.type, NEW.country, SUBSTR(NEW.watched_date, 1, 4), NEW.rating, 0
+    WHERE NOT EXISTS (
+        SELECT 1 FROM movie_stats
+        WHERE status IS NEW.status AND type IS NEW.type AND country IS NEW.country
+            AND watched_year IS SUBSTR(NEW.watched_date, 1, 4) AND rating IS NEW.rating
+    );
+    UPDATE movie_stats SET count = count + 1
+    WHERE status IS NEW.status AND type IS NEW.type AND country IS NEW.country
+        AND watched_year IS SUBSTR(NEW.watched_date, 1, 4) AND rating IS NEW.rating;
+END;
+
+DROP TRIGGER IF EXISTS movie_stats_after_movie_delete;
+CREATE TRIGGER movie_stats_after_movie_delete AFTER DELETE ON movie
+BEGIN
+    UPDATE movie_stats SET count = count - 1
+    WHERE status IS OLD.status AND type IS OLD.type AND country IS OLD.country
+        AND watched_year IS SUBSTR(OLD.watched_date, 1, 4) AND rating IS OLD.rating;
+    DELETE FROM movie_stats
+    WHERE status IS OLD.status AND type IS OLD.type AND country IS OLD.country
+        AND watched_year IS SUBSTR(OLD.watched_date, 1, 4) AND rating IS OLD.rating
+        AND count = 0;
+END;
+
+DROP TRIGGER IF EXISTS movie_stats_after_movie_update;
+CREATE TRIGGER movie_stats_after_movie_update
+AFTER UPDATE OF status, type, country, watched_date, rating ON movie
+WHEN OLD.status IS NOT NEW.status OR OLD.type IS NOT NEW.type
+    OR OLD.country IS NOT NEW.country OR OLD.rating IS NOT NEW.rating
+    OR SUBSTR(OLD.watched_date, 1, 4) IS NOT SUBSTR(NEW.watched_date, 1, 4)
+BEGIN
+    UPDATE movie_stats SET count = count - 1
+    WHERE status IS OLD.status AND type IS OLD.type AND country IS OLD.country
+        AND watched_year IS SUBSTR(OLD.watched_date, 1, 4) AND rating IS OLD.rating;
+    DELETE FROM movie_stats
+    WHERE status IS OLD.status AND type IS OLD.type AND country IS OLD.country
+        AND watched_year IS SUBSTR(OLD.watched_date, 1, 4) AND rating IS OLD.rating
+        AND count = 0;
+
+    INSERT INTO movie_stats (status, type, country, watched_year, rating, count)
+    SELECT NEW.status, NEW.type, NEW.country, SUBSTR(NEW.watched_date, 1, 4), NEW.rating, 0
+    WHERE NOT EXISTS (
+        SELECT 1 FROM movie_stats
+        WHERE status IS NEW.status AND type IS NEW.type AND country IS NEW.country
+            AND watched_year IS SUBSTR(NEW.watched_date, 1, 4) AND rating IS NEW.rating
+    );
+    UPDATE movie_stats SET count = count + 1
+    WHERE status IS NEW.status AND type IS NEW.type AND country IS NEW.country
+        AND watched_year IS SUBSTR(NEW.watched_date, 1, 4) AND rating IS NEW.rating;
+END;
+
+-- triggers: movie_genre -> genre_stats
+-- Only for existing movies: a deleted movie is counted out by genre_stats_before_movie_delete,
+-- whether its movie_genre rows are removed by ON DELETE CASCADE (foreign keys on) or not
+DROP TRIGGER IF EXISTS genre_stats_after_movie_genre_insert;
+CREATE TRIGGER genre_stats_after_movie_genre_insert AFTER INSERT ON movie_genre
+WHEN EXISTS (SELECT 1 FROM movie WHERE id = NEW.movie_id)
+BEGIN
+    INSERT INTO genre_stats (genre_id, status, rating, count)
+    SELECT NEW.genre_id, m.status, m.rating, 0
+    FROM movie m
+    WHERE m.id = NEW.movie_id AND NOT EXISTS (
+        SELECT 1 FROM genre_stats s
+        WHERE s.genre_id = NEW.genre_id AND s.status IS m.status AND s.rating IS m.rating
+    );
+    UPDATE genre_stats SET count = count + 1
+    WHERE genre_id = NEW.genre_id
+        AND status IS (SELECT status FROM movie WHERE id = NEW.movie_id)
+        AND rating IS (SELECT rating FROM movie WHERE id = NEW.movie_id);
+END;
+
+DROP TRIGGER IF EXISTS genre_stats_after_movie_genre_delete;
+CREATE TRIGGER genre_stats_after_movie_genre_delete AFTER DELETE ON movie_genre
+WHEN EXISTS (SELECT 1 FROM movie WHERE id = OLD.movie_id)
+BEGIN
+    UPDATE genre_stats SET count = count - 1
+    WHERE genre_id = OLD.genre_id
+        AND status IS (SELECT status FROM movie WHERE id = OLD.movie_id)
+        AND rating IS (SELECT rating FROM movie WHERE id = OLD.movie_id);
+    DELETE FROM genre_stats WHERE genre_id = OLD.genre_id AND count = 0;
+END;
+
+-- triggers: movie -> genre_stats (a deleted movie, while its movie_genre rows still exist)
+DROP TRIGGER IF EXISTS genre_stats_before_movie_delete;
+CREATE TRIGGER genre_stats_before_movie_delete BEFORE DELETE ON movie
+BEGIN
+    UPDATE genre_stats SET count = count - 1
+    WHERE status IS OLD.status AND rating IS OLD.rating
+        AND genre_id IN (SELECT genre_id FROM movie_genre WHERE movie_id = OLD.id);
+    DELETE FROM genre_stats
+    WHERE count = 0 AND genre_id IN (SELECT genre_id FROM movie_genre WHERE movie_id = OLD.id);
+END;
+
+-- triggers: movie -> genre_stats (status or rating of a movie with genres changed)
+DROP TRIGGER IF EXISTS genre_stats_after_movie_update;
+CREATE TRIGGER genre_stats_after_movie_update AFTER UPDATE OF status, rating ON movie
+WHEN OLD.status IS NOT NEW.status OR OLD.rating IS NOT NEW.rating
+BEGIN
+    UPDATE genre_stats SET count = count - 1
+    WHERE status IS OLD.status AND rating IS OLD.rating
+        AND genre_id IN (SELECT genre_id FROM movie_genre WHERE movie_id = NEW.id);
+    DELETE FROM genre_stats
+    WHERE count = 0 AND genre_id IN (SELECT genre_id FROM movie_genre WHERE movie_id = NEW.id);
+
+    INSERT INTO genre_stats (genre_id, status, rating, count)
+    SELECT mg.genre_id, NEW.status, NEW.rating, 0
+    FROM movie_genre mg
+    WHERE mg.movie_id = NEW.id AND NOT EXISTS (
+        SELECT 1 FROM genre_stats s
+        WHERE s.genre_id = mg.genre_id AND s.status IS NEW.status AND s.rating IS NEW.rating
+    );
+    UPDATE genre_stats SET count = count + 1
+    WHERE status IS NEW.status AND rating IS NEW.rating
+        AND genre_id IN (SELECT genre_id FROM movie_genre WHERE movie_id = NEW.id);
+END;
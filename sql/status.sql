@@ -1,11 +1,11 @@
--- Status statistics
+-- Status statistics (from the movie_stats summary table, see schema.sql)
 SELECT 
     status, 
-    COUNT(*) AS count,
-    ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM movie), 2) || '%' AS percent,
-    SUM(CASE WHEN type = 'movie' THEN 1 ELSE 0 END) AS movie_count,
-    SUM(CASE WHEN type = 'series' THEN 1 ELSE 0 END) AS series_count,
-    ROUND(AVG(rating), 2) AS avg_rating
-FROM movie
+    SUM(count) AS count,
+    ROUND(100.0 * SUM(count) / (SELECT SUM(count) FROM movie_stats), 2) || '%' AS percent,
+    SUM(CASE WHEN type = 'movie' THEN count ELSE 0 END) AS movie_count,
+    SUM(CASE WHEN type = 'series' THEN count ELSE 0 END) AS series_count,
+    ROUND(SUM(rating * count) / SUM(CASE WHEN rating IS NOT NULL THEN count END), 2) AS avg_rating
+FROM movie_stats
 GROUP BY status
-ORDER BY count DESC
\ No newline at end of file
+ORDER BY count DESC
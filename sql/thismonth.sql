@@ -1,7 +1,8 @@
--- List all movies/series watched in this month
+-- List all movies/series watched in this month (or -p month=YYYY-MM)
+-- BETWEEN 'YYYY-MM' AND 'YYYY-MM-31' matches both 'YYYY-MM' and 'YYYY-MM-DD',
+-- as a range on idx_movie_detail_watched_date (SUBSTR() can't use the index)
 SELECT * FROM movie_detail
-WHERE SUBSTR(watched_date, 1, 7) = SUBSTR(CURRENT_DATE, 1, 7)
--- WHERE strftime('%Y-%m', watched_date) = strftime('%Y-%m', CURRENT_DATE)
--- WHERE watched_date >= date(CURRENT_DATE, 'start of month')
---   AND watched_date < date(CURRENT_DATE, 'start of month', '+1 month')
-ORDER BY watched_date;
\ No newline at end of file
+WHERE watched_date BETWEEN COALESCE(:month, strftime('%Y-%m', CURRENT_DATE))
+    AND COALESCE(:month, strftime('%Y-%m', CURRENT_DATE)) || '-31'
+-- WHERE SUBSTR(watched_date, 1, 7) = COALESCE(:month, SUBSTR(CURRENT_DATE, 1, 7))
+ORDER BY watched_date;
@@ -1,5 +1,8 @@
--- List all movies/series watched in this year
+-- List all movies/series watched in this year (or -p year=YYYY)
+-- BETWEEN 'YYYY' AND 'YYYY-12-31' matches 'YYYY', 'YYYY-MM' and 'YYYY-MM-DD',
+-- as a range on idx_movie_detail_watched_date (SUBSTR() can't use the index)
 SELECT * FROM movie_detail
-WHERE SUBSTR(watched_date, 1, 4) = SUBSTR(CURRENT_DATE, 1, 4)
--- WHERE strftime('%Y', watched_date) = strftime('%Y', CURRENT_DATE)
-ORDER BY watched_date;
\ No newline at end of file
+WHERE watched_date BETWEEN COALESCE(:year, strftime('%Y', CURRENT_DATE))
+    AND COALESCE(:year, strftime('%Y', CURRENT_DATE)) || '-12-31'
+-- WHERE SUBSTR(watched_date, 1, 4) = COALESCE(:year, SUBSTR(CURRENT_DATE, 1, 4))
+ORDER BY watched_date;
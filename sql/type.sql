@@ -1,10 +1,11 @@
+-- Type statistics (from the movie_stats summary table, see schema.sql)
 SELECT 
     type, 
-    COUNT(*) AS count,
-    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed,
-    SUM(CASE WHEN status = 'dropped' THEN 1 ELSE 0 END) AS dropped,
-    -- ROUND(100.0 * SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) / COUNT(*), 2) || '%' AS completed_percent
-    ROUND(100.0 * SUM(CASE WHEN status IN ('completed', 'dropped') THEN 1 ELSE 0 END) / COUNT(*), 2) || '%' AS watched_percent,
-    ROUND(AVG(rating), 2) AS avg_rating
-FROM movie
-GROUP BY type;
\ No newline at end of file
+    SUM(count) AS count,
+    SUM(CASE WHEN status = 'completed' THEN count ELSE 0 END) AS completed,
+    SUM(CASE WHEN status = 'dropped' THEN count ELSE 0 END) AS dropped,
+    -- ROUND(100.0 * SUM(CASE WHEN status = 'completed' THEN count ELSE 0 END) / SUM(count), 2) || '%' AS completed_percent
+    ROUND(100.0 * SUM(CASE WHEN status IN ('completed', 'dropped') THEN count ELSE 0 END) / SUM(count), 2) || '%' AS watched_percent,
+    ROUND(SUM(rating * count) / SUM(CASE WHEN rating IS NOT NULL THEN count END), 2) AS avg_rating
+FROM movie_stats
+GROUP BY type;
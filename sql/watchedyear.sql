@@ -1,11 +1,12 @@
+-- Watched year statistics (from the movie_stats summary table, see schema.sql)
 SELECT 
-    SUBSTR(watched_date, 1, 4) AS year, 
-    COUNT(*) AS count,
-    ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM movie), 2) || '%' AS percent,
-    SUM(CASE WHEN type = 'movie' THEN 1 ELSE 0 END) AS movie_count,
-    SUM(CASE WHEN type = 'series' THEN 1 ELSE 0 END) AS series_count,
-    ROUND(AVG(rating), 2) AS avg_rating
-FROM movie
--- WHERE watched_date IS NOT NULL
-GROUP BY SUBSTR(watched_date, 1, 4)
--- strftime('%Y', watched_date) -- Not work for year only data
\ No newline at end of file
+    watched_year AS year, 
+    SUM(count) AS count,
+    ROUND(100.0 * SUM(count) / (SELECT SUM(count) FROM movie_stats), 2) || '%' AS percent,
+    SUM(CASE WHEN type = 'movie' THEN count ELSE 0 END) AS movie_count,
+    SUM(CASE WHEN type = 'series' THEN count ELSE 0 END) AS series_count,
+    ROUND(SUM(rating * count) / SUM(CASE WHEN rating IS NOT NULL THEN count END), 2) AS avg_rating
+FROM movie_stats
+-- WHERE watched_year IS NOT NULL
+GROUP BY watched_year
+-- watched_year is SUBSTR(watched_date, 1, 4), strftime('%Y', ...) doesn't work for year only data
@@ -0,0 +1,84 @@
+import sqlite3
+import pytest
+from utils.backup import (
+    backup_database, restore_database, take_snapshot, get_snapshots, get_snapshot_seq,
+)
+from utils.changes import get_last_change, get_changed_movies
+from utils.db import ensure_schema, fetch_rows_count
+from utils.movie import add_movies, delete_movies
+
+def new_movies(*names: str) -> list[tuple]:
+    return [(name, 2020, 'waiting', 'movie', 'US', ['drama'], None, None, None) for name in names]
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(':memory:')
+    ensure_schema(con)
+    add_movies(new_movies('Soul', 'Up', 'Her'), con.cursor())
+    con.commit()
+    yield con
+    con.close()
+
+def test_backup_progress(con, tmp_path):
+    steps = []
+    backup_database(con, tmp_path / 'backup.db', pages=1, progress=lambda *step: steps.append(step))
+    assert len(steps) > 1 and steps[-1][0] == 0  # page by page, down to 0 remaining
+
+    backup_con = sqlite3.connect(tmp_path / 'backup.db')
+    assert fetch_rows_count(backup_con) == 3
+    backup_con.close()
+
+def test_restore(con, tmp_path):
+    backup_database(con, tmp_path / 'backup.db')
+    delete_movies([1, 2], con.cursor())
+    con.commit()
+    before = get_last_change(con.cursor())
+
+    seq = restore_database(con, tmp_path / 'backup.db', pages=1)
+    cur = con.cursor()
+    assert fetch_rows_count(cur) == 3
+    assert seq == get_last_change(cur) == before + 1
+    assert get_changed_movies(cur, before, seq) is None  # readers behind reload everything
+
+    with pytest.raises(FileNotFoundError):
+        restore_database(con, tmp_path / 'missing.db')
+
+def test_snapshots(con, tmp_path):
+    first = take_snapshot(con, tmp_path, keep=2)
+    assert get_snapshot_seq(first) == get_last_change(con.cursor())
+    assert take_snapshot(con, tmp_path, keep=2) is None  # nothing changed
+
+    add_movies(new_movies('Coco'), con.cursor())
+    with pytest.raises(sqlite3.OperationalError):
+        take_snapshot(con, tmp_path)  # uncommitted changes
+    con.commit()
+    second = take_snapshot(con, tmp_path, keep=2)
+    add_movies(new_movies('Luca'), con.cursor())
+    con.commit()
+    third = take_snapshot(con, tmp_path, keep=2)
+    assert get_snapshots(tmp_path) == [second, third]  # the oldest is removed
+
+    restore_database(con, second)
+    assert fetch_rows_count(con) == 4
+
+def test_snapshot_after_write_without_change(tmp_path):
+    import os
+    path = tmp_path / 'movies.db'
+    con = sqlite3.connect(path)
+    ensure_schema(con)
+    add_movies(new_movies('Soul'), con.cursor())
+    con.commit()
+    os.utime(path, ns=(0, 0))  # written long before the snapshot
+    folder = tmp_path / 'snapshots'
+    assert take_snapshot(con, folder) is not None
+    assert take_snapshot(con, folder) is None
+
+    # Not in the change log, like a bulk import without triggers
+    con.execute("INSERT INTO genre (name) VALUES ('western')")
+    con.commit()
+    snapshot = take_snapshot(con, folder)
+    assert snapshot is not None
+    snapshot_con = sqlite3.connect(snapshot)
+    assert snapshot_con.execute("SELECT 1 FROM genre WHERE name = 'western'").fetchone()
+    snapshot_con.close()
+    con.close()
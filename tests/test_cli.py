@@ -1,5 +1,6 @@
+import io
 import pytest
-from utils.cli import resolve_choice, valid_date
+from utils.cli import resolve_choice, valid_date, write_rows, output_rows
 from utils.constants import MOVIE_STATUSES, MOVIE_TYPES, COUNTRIES
 
 def test_resolve_choice():
@@ -29,4 +30,33 @@ def test_valid_date_with_empty_input():
     pytest.param('202', '202', marks=pytest.mark.xfail(reason='Invalid date format')),
 ])
 def test_invalid_date(test_input: str, expected: int):
-    assert valid_date(test_input) == expected
\ No newline at end of file
+    assert valid_date(test_input) == expected
+
+ROWS = [[1, 'Movie, the', None], [2, 'Tab\there', 7]]
+HEADERS = ['id', 'name', 'rating']
+
+def write(output_format, **kwargs) -> str:
+    file = io.StringIO()
+    assert write_rows(iter(ROWS), HEADERS, output_format, file=file, **kwargs) == 2
+    return file.getvalue()
+
+def test_write_rows_formats():
+    assert write('csv') == 'id,name,rating\n1,"Movie, the",\n2,Tab\there,7\n'
+    assert write('tsv') == 'id\tname\trating\n1\tMovie, the\t\n2\tTab here\t7\n'
+    assert write('jsonl').splitlines()[0] == '{"id": 1, "name": "Movie, the", "rating": null}'
+    assert write('plain', hide_columns=['rating']).splitlines() == [
+        'id  name', '1   Movie, the', '2   Tab\there'
+    ]
+
+def test_write_rows_batches():
+    file = io.StringIO()
+    rows = ([i, str(i)] for i in range(25))
+    assert write_rows(rows, ['id', 'name'], 'csv', file=file, batch_size=10) == 25
+    assert file.getvalue().count('\n') == 26
+
+def test_output_rows_auto(capsys, monkeypatch):
+    import utils.constants
+    monkeypatch.setattr(utils.constants, 'RICH_MAX_ROWS', 1)
+    assert output_rows(iter(ROWS), HEADERS, print_total=True) == 2
+    output = capsys.readouterr().out
+    assert output.startswith('id  name') and output.endswith('Total: 2\n')  # plain
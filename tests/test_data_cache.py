@@ -0,0 +1,92 @@
+import sqlite3
+import pandas as pd
+import pytest
+from utils.db import ensure_schema
+from utils.changes import set_sync_seq, get_last_change
+from utils.data_cache import MovieCache
+from utils.movie import add_movie, update_movie, delete_movie, load_movies
+
+def new_movie(name: str, year: int | None = 2020) -> dict:
+    return {
+        'name': name, 'year': year, 'status': 'waiting', 'type': 'movie', 'country': 'US',
+        'genres': ['drama'], 'rating': None, 'watched_date': None, 'note': None
+    }
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(':memory:')
+    ensure_schema(con)
+    cur = con.cursor()
+    for name in ['Soul', 'Up', 'Coco']:
+        add_movie(new_movie(name), cur)
+    con.commit()
+    yield con
+    con.close()
+
+def test_refresh_by_delta(con):
+    cache = MovieCache()
+    df, version = cache.get(con)
+    assert cache.get(con) == (df, version)  # unchanged
+
+    cur = con.cursor()
+    update_movie(1, {'name': 'Soul (2020)', 'year': None, 'genres': ['animation']}, cur)
+    delete_movie(2, cur)
+    add_movie(new_movie('Luca', year=None), cur)
+    con.commit()
+
+    new_df, new_version = cache.get(con)
+    assert new_version == version + 1
+    pd.testing.assert_frame_equal(new_df, load_movies(con, with_index=True))
+    assert df.loc[1, 'name'] == 'Soul'  # the previous frame is unchanged
+
+def test_refresh_compact(con):
+    cache = MovieCache(compact=True)
+    cache.get(con)
+    cur = con.cursor()
+    update_movie(1, {'country': 'Japan', 'year': None, 'rating': 9}, cur)
+    add_movie(new_movie('Luca'), cur)
+    con.commit()
+
+    df, _ = cache.get(con)
+    expected = load_movies(con, with_index=True, compact=True)
+    assert df.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(df, expected, check_categorical=False)
+
+def test_refresh_compact_half_rating(con):
+    cache = MovieCache(compact=True)
+    cur = con.cursor()
+    update_movie(1, {'rating': 8}, cur)
+    con.commit()
+    assert cache.get(con)[0]['rating'].dtype == 'Int8'
+
+    for rating, dtype in [(7.5, 'Float32'), (7, 'Int8')]:  # and back
+        update_movie(2, {'rating': rating}, cur)
+        con.commit()
+        df, _ = cache.get(con)
+        assert df['rating'].dtype == dtype
+        pd.testing.assert_frame_equal(
+            df, load_movies(con, with_index=True, compact=True), check_categorical=False
+        )
+
+def test_reload_when_pruned(con):
+    cache = MovieCache()
+    cache.get(con)
+    cur = con.cursor()
+    add_movie(new_movie('Luca'), cur)
+    set_sync_seq(cur, 'csv', get_last_change(cur), retention=0)
+    con.commit()
+
+    df, _ = cache.get(con)
+    assert df.index.tolist() == [1, 2, 3, 4]
+
+def test_reload_when_many_changes(con):
+    cache = MovieCache(max_delta=1)
+    _, version = cache.get(con)
+    cur = con.cursor()
+    delete_movie(1, cur)
+    delete_movie(2, cur)
+    con.commit()
+
+    df, new_version = cache.get(con)
+    assert new_version == version + 1
+    assert df.index.tolist() == [3]
@@ -0,0 +1,48 @@
+import pandas as pd
+from utils.data_filter import filter_movies, MovieFilterIndex
+
+df = pd.DataFrame({
+    'name': ['Soul', 'Your Name', 'Parasite', 'Spirited Away'],
+    'year': [2020, 2016, 2019, 2001],
+    'status': ['completed', 'completed', 'waiting', 'completed'],
+    'type': ['movie', 'movie', 'movie', 'movie'],
+    'country': ['US', 'Japan', 'Korea', 'Japan'],
+    'genres': ['animation,music', 'animation,romance', 'thriller', 'animation,fantasy'],
+    'rating': [9.0, 10.0, None, 10.0],
+    'watched_date': ['2021-01-02', '2023', None, '2023-06'],
+    'note': [None, None, None, None],
+}, index=[1, 2, 3, 4])
+
+def ids(filtered: pd.DataFrame) -> list[int]:
+    return filtered.index.tolist()
+
+def test_no_filter():
+    assert ids(filter_movies(df)) == [1, 2, 3, 4]
+
+def test_filter_movies():
+    assert ids(filter_movies(df, name='SOU')) == [1]
+    assert ids(filter_movies(df, year=2019)) == [3]
+    assert ids(filter_movies(df, watched_year=2023)) == [2, 4]
+    assert ids(filter_movies(df, status='completed', country='Japan')) == [2, 4]
+    assert ids(filter_movies(df, movie_type='series')) == []
+
+def test_filter_genres():
+    assert ids(filter_movies(df, genres=['animation'])) == [1, 2, 4]
+    assert ids(filter_movies(df, genres=['animation', 'romance'])) == [2]
+
+def test_filter_index():
+    index = MovieFilterIndex(df)
+    assert index.genres.keys() == {'animation', 'music', 'romance', 'thriller', 'fantasy'}
+    assert ids(index.filter(genres=['animation'], country='Japan', watched_year=2023)) == [2, 4]
+    # values not in the data match nothing
+    assert ids(index.filter(genres=['animation', 'horror'])) == []
+    assert ids(index.filter(country='France')) == []
+
+def test_filter_index_missing_values():
+    movies = df.copy()
+    movies.loc[3, 'genres'] = None
+    movies.loc[4, 'year'] = None
+    index = MovieFilterIndex(movies)
+    assert ids(index.filter(genres=['thriller'])) == []
+    assert ids(index.filter(year=2001)) == []
+    assert ids(index.filter(name='a', year=2016)) == [2]
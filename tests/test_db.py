@@ -2,9 +2,12 @@ import pytest
 import sqlite3
 from io import StringIO
 import pandas as pd
-from csv_to_sqlite import csv_to_sqlite
-from utils.db import fetch_rows_count
-from utils.movie import add_movie, update_movie, delete_movie, get_movie
+from csv_to_sqlite import csv_to_sqlite, import_csv
+from utils.db import fetch_rows_count, list_migrations, SCHEMA_VERSION
+from utils.movie import (
+    add_movie, update_movie, delete_movie, get_movie, load_movies,
+    to_movie_row, add_movies, update_movies, delete_movies,
+)
 
 csv_data = """name,year,status,type,country,genres,rating,watched_date,note
 Inception,2010,waiting,movie,US,"action,sci-fi,thriller,epic",,,
@@ -32,12 +35,48 @@ def db():
     # Teardown
     con.close()
 
+def test_iter_sql(db):
+    from utils.sql import run_sql, iter_sql
+    query = 'SELECT id, note, rating, name FROM movie_detail WHERE id <= ?'
+    rows, column_names = iter_sql(db.cursor(), query, parameters=(3,))
+    assert column_names == ['id', 'rating', 'name']  # note hidden wherever it is
+    assert list(rows) == run_sql(db.cursor(), query, parameters=(3,))[0]
+
+SORT_VALUES = [
+    3, '85%', '2023-05', '2023-02-30', 'abc', 'Abd', None, 1.5, '2023', '10%', 'abc', '2023-05-01'
+]
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_sql_sort_matches_python_sort(db, order):
+    from utils.sql import run_sql, sort_rows
+    values = ', '.join('(?, ?)' for _ in SORT_VALUES)
+    parameters = [p for i, value in enumerate(SORT_VALUES) for p in (i, value)]
+    query = f'SELECT column1 AS i, column2 AS value FROM (VALUES {values}) ORDER BY i DESC'
+
+    rows, column_names = run_sql(db.cursor(), query, parameters=parameters, sort=('value', order))
+    expected, _ = run_sql(db.cursor(), query, parameters=parameters)
+    sort_rows(expected, 1, descending=order == 'desc')
+    assert rows == expected
+    assert column_names == ['i', 'value']
+
 def test_read_db(db):
     cur = db.cursor()
     assert get_movie_name(get_movie(1, cur)) == 'Inception'
     assert get_movie_name(get_movie(5, cur)) == 'Soul'
     assert get_movie(6, cur) == None
     assert fetch_rows_count(cur) == 5
+    assert get_movie(1, cur)[6] == 'action,sci-fi,thriller,epic'
+    assert fetch_rows_count(cur, 'genre') == 10
+
+def test_load_movies_compact(db):
+    movies = load_movies(db, with_index=True)
+    compact = load_movies(db, with_index=True, compact=True)
+    assert compact['status'].dtype == 'category'
+    assert compact['genres'].dtype == 'category'
+    assert compact['year'].dtype == 'Int16'
+    assert compact['rating'].dtype == 'Int8'
+    assert compact['year'].tolist() == movies['year'].tolist()
+    assert compact['genres'].astype(str).tolist() == movies['genres'].tolist()
 
 def test_add_db(db):
     new_movie = {
@@ -78,4 +117,206 @@ def test_delete_db(db):
 def test_get_deleted_id(db):
     cur = db.cursor()
     assert get_movie(1, cur) == None
-    assert get_movie(2, cur) == None
\ No newline at end of file
+    assert get_movie(2, cur) == None
+
+def test_movie_detail_sync(db):
+    cur = db.cursor()
+    update_movie(3, {'name': 'The Boy & the Beast', 'genres': ['animation', 'fantasy']}, cur)
+    movie = get_movie(3, cur)
+    assert get_movie_name(movie) == 'The Boy & the Beast'
+    assert movie[6] == 'animation,fantasy'
+
+    cur.execute("UPDATE genre SET name = 'anime' WHERE name = 'animation'")
+    assert get_movie(3, cur)[6] == 'anime,fantasy'
+
+def test_movie_detail_index(db):
+    plan = db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM movie_detail WHERE status = 'completed'"
+    ).fetchall()
+    assert 'USING INDEX' in plan[0][-1]
+
+def test_import_csv(tmp_path):
+    csv_path = tmp_path / 'data.csv'
+    csv_path.write_text(csv_data)
+    con = sqlite3.connect(':memory:')
+    con.executescript(schema_sql)
+
+    assert import_csv(csv_path, con, chunk_size=2) == 5
+    cur = con.cursor()
+    assert set(get_movie(2, cur)[6].split(',')) == {'time travel', 'adventure', 'sci-fi', 'epic'}
+    assert get_movie(5, cur)[6] == 'animation'
+    assert fetch_rows_count(cur, 'genre') == 10
+
+    # Triggers are restored after the import
+    add_movie({
+        'name': 'Up', 'year': 2009, 'status': 'waiting', 'type': 'movie', 'country': 'US',
+        'genres': ['animation'], 'rating': None, 'watched_date': None, 'note': None
+    }, cur)
+    assert get_movie(6, cur)[6] == 'animation'
+    con.close()
+
+def test_import_csv_error(tmp_path):
+    csv_path = tmp_path / 'data.csv'
+    csv_path.write_text(csv_data.replace('2013', 'notayear'))
+    con = sqlite3.connect(':memory:')
+    con.executescript(schema_sql)
+    count_objects = "SELECT count(*) FROM sqlite_master WHERE type IN ('trigger', 'index')"
+    objects = con.execute(count_objects).fetchone()[0]
+
+    with pytest.raises(ValueError):
+        import_csv(csv_path, con, chunk_size=2)
+    assert fetch_rows_count(con) == 0  # rolled back
+    assert con.execute(count_objects).fetchone()[0] == objects  # triggers and indexes restored
+    con.close()
+
+def test_import_csv_pragmas(tmp_path):
+    csv_path = tmp_path / 'data.csv'
+    csv_path.write_text(csv_data)
+    con = sqlite3.connect(tmp_path / 'movies.db')
+    con.executescript(schema_sql)
+    con.execute('PRAGMA journal_mode = WAL')
+    con.execute('PRAGMA synchronous = NORMAL')
+
+    assert import_csv(csv_path, con) == 5
+    assert con.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert con.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    con.close()
+
+def test_schema_version():
+    assert SCHEMA_VERSION == list_migrations()[-1][0]
+
+@pytest.fixture
+def empty_db():
+    con = sqlite3.connect(':memory:')
+    con.execute('PRAGMA foreign_keys = ON')  # like get_connection, for ON DELETE CASCADE
+    con.executescript(schema_sql)
+    yield con
+    con.close()
+
+def test_bulk_edit(empty_db):
+    cur = empty_db.cursor()
+    movies = [
+        to_movie_row({
+            'name': name, 'year': 2020.0, 'status': 'waiting', 'type': 'movie',
+            'country': 'US', 'genres': genres, 'rating': float('nan'),
+            'watched_date': None, 'note': None,
+        })
+        for name, genres in [('Soul', 'animation, music'), ('Up', ['animation']), ('Her', None)]
+    ]
+    assert movies[0][1:] == (2020, 'waiting', 'movie', 'US', ['animation', 'music'], None, None, None)
+    assert add_movies(movies, cur) == 3
+
+    assert update_movies({
+        1: {'rating': 9, 'status': 'completed'},
+        2: {'rating': 8, 'status': 'completed', 'genres': ['adventure', 'animation']},
+        3: {'genres': 'romance'},
+    }, cur) == 3
+    assert get_movie(1, cur)[3] == 'completed'
+    assert get_movie(2, cur)[6:8] == ('animation,adventure', 8.0)  # genres in id order
+    assert get_movie(3, cur)[6] == 'romance'
+
+    assert delete_movies([1, 3, 42], cur) == 2
+    assert fetch_rows_count(cur) == 1
+    assert fetch_rows_count(cur, 'movie_genre') == 2
+
+def test_update_movies_unknown_field(empty_db):
+    with pytest.raises(ValueError):
+        update_movies({1: {'id': 2}}, empty_db.cursor())
+
+def test_stats_tables(empty_db):
+    from utils.stats import recompute_stats, get_summary
+    cur = empty_db.cursor()
+    movies = [
+        ('A', 2001, 'completed', 'movie', 'US', ['drama', 'action'], 8, '2023-05-01', None),
+        ('B', 2002, 'waiting', 'series', 'Korea', ['drama'], None, None, None),
+        ('C', 2003, 'dropped', 'movie', None, [], 6.5, '2024', 'note'),
+        ('D', 2004, 'completed', 'movie', 'US', ['action'], 8, '2023-01', None),
+    ]
+    add_movies(movies, cur)
+    update_movies({
+        1: {'status': 'dropped', 'rating': 7, 'genres': 'drama,comedy'},
+        2: {'country': None, 'watched_date': '2022'},
+        3: {'genres': ['action']},
+    }, cur)
+    update_movie(4, {'rating': 9}, cur)
+    delete_movies([2], cur)
+    empty_db.commit()
+
+    assert get_summary(cur) == (3, round((7 + 6.5 + 9) / 3, 2))
+    assert recompute_stats(empty_db) == {'movie_stats': 0, 'genre_stats': 0}
+
+    # status, count, percent, movie_count, series_count, avg_rating
+    with open('sql/status.sql') as f:
+        assert cur.execute(f.read()).fetchall() == [
+            ('dropped', 2, '66.67%', 2, 0, 6.75), ('completed', 1, '33.33%', 1, 0, 9.0)
+        ]
+
+@pytest.mark.parametrize('foreign_keys', ['ON', 'OFF'])
+def test_stats_after_delete(foreign_keys):
+    from utils.stats import recompute_stats
+    con = sqlite3.connect(':memory:')
+    con.execute(f'PRAGMA foreign_keys = {foreign_keys}')  # OFF: no ON DELETE CASCADE
+    con.executescript(schema_sql)
+    cur = con.cursor()
+    add_movies([
+        ('A', 2001, 'completed', 'movie', 'US', ['drama', 'action'], 8, '2023', None),
+        ('B', 2002, 'completed', 'movie', 'US', ['drama'], 8, '2023', None),
+    ], cur)
+    delete_movie(1, cur)
+    cur.execute('DELETE FROM movie_genre WHERE movie_id = 1')  # a no-op with foreign keys
+    con.commit()
+
+    assert cur.execute('SELECT genre_id, count FROM genre_stats').fetchall() == [(1, 1)]
+    assert recompute_stats(con) == {'movie_stats': 0, 'genre_stats': 0}
+    con.close()
+
+def test_recompute_stale_stats(empty_db):
+    from utils.stats import recompute_stats
+    cur = empty_db.cursor()
+    add_movies([('A', 2001, 'completed', 'movie', 'US', ['drama'], 8, '2023', None)], cur)
+    cur.execute('UPDATE movie_stats SET count = 5')
+    cur.execute('DELETE FROM genre_stats')
+    empty_db.commit()
+
+    assert recompute_stats(empty_db) == {'movie_stats': 1, 'genre_stats': 1}
+    assert cur.execute('SELECT count FROM movie_stats').fetchall() == [(1,)]
+    assert recompute_stats(empty_db) == {'movie_stats': 0, 'genre_stats': 0}
+
+def test_collect_stats(empty_db):
+    from utils.stats import collect_stats, STATS_SCRIPTS, VERBOSE_STATS_SCRIPTS
+    cur = empty_db.cursor()
+    add_movies([
+        ('A', 2001, 'completed', 'movie', 'US', ['drama'], 8, '2023', None),
+        ('B', 2002, 'waiting', 'series', 'Japan', ['drama', 'comedy'], None, None, None),
+    ], cur)
+    empty_db.commit()
+
+    scripts = STATS_SCRIPTS + VERBOSE_STATS_SCRIPTS + ['missing']
+    summary, results = collect_stats(empty_db, scripts)
+    assert summary == (2, 8.0, 2)
+    assert [name for name, *_ in results] == scripts
+    for name, rows, column_names in results[:-1]:
+        with open(f'sql/{name}.sql') as f:
+            assert rows == cur.execute(f.read()).fetchall()
+    assert results[-1] == ('missing', None, None)
+    assert not empty_db.in_transaction
+
+def test_read_connection(tmp_path):
+    from utils.db import get_read_connection, get_connection, fetch_scalar
+    db_file = str(tmp_path / 'movies.db')
+
+    con = get_read_connection(db_file)  # missing database: created first
+    assert fetch_rows_count(con) == 0
+    assert fetch_scalar(con, 'PRAGMA mmap_size') > 0
+    with pytest.raises(sqlite3.OperationalError, match='readonly'):
+        con.execute("INSERT INTO genre (name) VALUES ('drama')")
+    con.close()
+
+    writer = get_connection(db_file)
+    writer.execute(f'PRAGMA user_version = {SCHEMA_VERSION - 1}')
+    writer.commit()
+    con = get_read_connection(db_file, pragmas={})  # outdated schema: migrated first
+    assert fetch_scalar(con, 'PRAGMA user_version') == SCHEMA_VERSION
+    assert fetch_scalar(con, 'PRAGMA mmap_size') == 0
+    con.close()
+    writer.close()
@@ -0,0 +1,150 @@
+import pytest
+import sqlite3
+from utils.db import ensure_schema
+from utils.changes import get_last_change, set_sync_seq
+from utils.export import export_csv, CsvWriteBehind
+from utils.movie import add_movie, update_movie, delete_movie
+
+def new_movie(name: str) -> dict:
+    return {
+        'name': name, 'year': 2020, 'status': 'waiting', 'type': 'movie', 'country': 'US',
+        'genres': ['drama'], 'rating': None, 'watched_date': None, 'note': None
+    }
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = tmp_path / 'movies.db'
+    con = sqlite3.connect(db_file)
+    ensure_schema(con)
+    add_movie(new_movie('Soul'), con.cursor())
+    con.commit()
+    con.close()
+    return db_file
+
+def test_change_log(db_file):
+    con = sqlite3.connect(db_file)
+    cur = con.cursor()
+    before = get_last_change(cur)
+    update_movie(1, {'name': 'Soul (2020)'}, cur)
+    delete_movie(1, cur)
+    changes = cur.execute(
+        'SELECT movie_id, op FROM movie_change WHERE seq > ? ORDER BY seq', (before,)
+    ).fetchall()
+    assert changes == [(1, 'update'), (1, 'delete')]
+    con.close()
+
+def test_export_only_when_changed(db_file, tmp_path):
+    csv_file = tmp_path / 'data.csv'
+    con = sqlite3.connect(db_file)
+
+    assert export_csv(con, csv_file) == 1
+    assert export_csv(con, csv_file) is None
+    assert export_csv(con, csv_file, force=True) == 1
+
+    add_movie(new_movie('Up'), con.cursor())
+    con.commit()
+    assert export_csv(con, csv_file) == 2
+    assert csv_file.read_text().splitlines()[-1].startswith('Up,2020')
+
+    # Exported changes are kept for the retention (delta refresh of the web app)
+    count = con.execute('SELECT COUNT(*) FROM movie_change').fetchone()[0]
+    assert count == get_last_change(con.cursor())
+    con.close()
+
+def test_prune_synced_changes(db_file):
+    con = sqlite3.connect(db_file)
+    cur = con.cursor()
+    for name in ['Up', 'Coco', 'Luca']:
+        add_movie(new_movie(name), cur)
+    last = get_last_change(cur)
+
+    # Changes not synced to every target are kept
+    set_sync_seq(cur, 'other', last - 2, retention=0)
+    set_sync_seq(cur, 'csv', last, retention=0)
+    assert [seq for (seq,) in cur.execute('SELECT seq FROM movie_change')] == [last - 1, last]
+
+    # Synced changes are kept up to the retention
+    set_sync_seq(cur, 'other', last, retention=1)
+    assert [seq for (seq,) in cur.execute('SELECT seq FROM movie_change')] == [last]
+    con.close()
+
+def test_write_behind_coalesces(db_file, tmp_path, monkeypatch):
+    import time
+    import utils.export
+    exports = []
+    monkeypatch.setattr(utils.export, 'export_csv', lambda con, path: exports.append(path))
+
+    csv_file = tmp_path / 'data.csv'
+    writer = CsvWriteBehind(db_file, csv_file, delay=60)
+    for _ in range(3):
+        writer.schedule()
+    writer.flush()
+    assert exports == [csv_file]  # one export for all scheduled writes
+    writer.flush()
+    assert len(exports) == 1  # nothing pending
+
+    writer.delay = 0.05
+    writer.schedule()
+    writer.schedule()
+    deadline = time.monotonic() + 5
+    while len(exports) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert len(exports) == 2  # exported once after the delay
+
+@pytest.mark.parametrize('missing_year', [False, True])
+def test_write_csv_matches_pandas(tmp_path, missing_year):
+    import gzip
+    from utils.export import write_csv
+    from utils.movie import add_movies, load_movies
+
+    con = sqlite3.connect(':memory:')
+    ensure_schema(con)
+    add_movies([
+        ('Up, "quoted"', None if missing_year else 2009, 'waiting', 'movie', None,
+         ['a', 'b'], 7.25, '2023-05', 'two\nlines'),
+        ('映画', 2020, 'completed', 'series', 'Japan', [], 10, '2024', ''),
+    ], con.cursor())
+
+    load_movies(con, with_index=True).to_csv(tmp_path / 'pandas.csv', index=False)
+    assert write_csv(con, tmp_path / 'movies.csv', batch_size=1) == 2
+    expected = (tmp_path / 'pandas.csv').read_bytes()
+    assert (tmp_path / 'movies.csv').read_bytes() == expected
+    assert (b'2020.0' in expected) == missing_year  # integers with NULL are floats in pandas
+
+    write_csv(con, tmp_path / 'movies.csv.gz')
+    assert gzip.decompress((tmp_path / 'movies.csv.gz').read_bytes()) == expected
+    con.close()
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_export_columnar(db_file, tmp_path, file_format):
+    pa = pytest.importorskip('pyarrow')
+    from utils.export import export_columnar, write_columnar, get_columnar_paths
+
+    con = sqlite3.connect(db_file)
+    add_movie(new_movie('Up') | {'year': None, 'genres': ['drama', 'animation']}, con.cursor())
+    con.commit()
+
+    assert export_columnar(con, file_format, tmp_path) == 2
+    assert export_columnar(con, file_format, tmp_path) is None  # up to date
+
+    movies_path, genres_path = get_columnar_paths(file_format, tmp_path)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        read = pq.read_table
+    else:
+        read = lambda path: pa.ipc.open_file(path).read_all()
+    movies = read(movies_path)
+    assert movies.schema.field('year').type == pa.int16()
+    assert movies.to_pylist()[1] | {'note': None} == {
+        'id': 2, 'name': 'Up', 'year': None, 'status': 'waiting', 'type': 'movie',
+        'country': 'US', 'genres': 'drama,animation', 'rating': None,
+        'watched_date': None, 'note': None,
+    }
+    assert read(genres_path).to_pydict() == {
+        'movie_id': [1, 2, 2], 'genre': ['drama', 'drama', 'animation']
+    }
+
+    write_columnar(con, file_format, tmp_path, batch_size=1)  # a batch per row
+    assert read(movies_path).num_rows == 2
+    con.close()
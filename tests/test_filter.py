@@ -0,0 +1,74 @@
+import pytest
+import sqlite3
+from io import StringIO
+import pandas as pd
+from csv_to_sqlite import csv_to_sqlite
+from utils.filter import parse_genres_filter, resolve_genre, get_filter_query, get_prefix_range
+
+csv_data = """name,year,status,type,country,genres,rating,watched_date,note
+Inception,2010,completed,movie,US,"action,sci-fi,thriller",9,2024-01,
+Your Name,2016,completed,movie,Japan,"animation,romance,drama",10,2023,
+Her,2013,waiting,movie,US,"comedy,romance,sci-fi",,,
+Soul,2020,waiting,movie,US,"animation,comedy",,,
+Parasite,2019,completed,movie,Korea,"thriller,dark comedy",9,2024-05-01,
+"""
+with open('sql/schema.sql', 'r') as f:
+    schema_sql = f.read()
+
+@pytest.fixture(scope='module')
+def cur():
+    con = sqlite3.connect(':memory:')
+    con.executescript(schema_sql)
+    csv_to_sqlite(pd.read_csv(StringIO(csv_data)), con)
+    con.commit()
+    yield con.cursor()
+    con.close()
+
+def filter_names(cur, **filters) -> set[str]:
+    query, parameters = get_filter_query(cur, **filters)
+    return {row[1] for row in cur.execute(query, parameters)}
+
+def test_parse_genres_filter():
+    assert parse_genres_filter('romance|comedy, drama, -horror') == (
+        [['romance', 'comedy'], ['drama']], ['horror']
+    )
+    assert parse_genres_filter('-horror|thriller') == ([], ['horror', 'thriller'])
+
+def test_resolve_genre():
+    genre_map = {'dark comedy': 1, 'comedy': 2, 'action': 3}
+    assert resolve_genre('comedy', genre_map) == 2
+    assert resolve_genre('act', genre_map) == 3
+    assert resolve_genre('dark', genre_map) == 1
+    assert resolve_genre('horror', genre_map) is None
+
+def test_genres_and(cur):
+    assert filter_names(cur, genres='romance,sci-fi') == {'Her'}
+    assert filter_names(cur, genres='anim,com') == {'Soul'}
+
+def test_genres_or(cur):
+    assert filter_names(cur, genres='animation|thriller') == {
+        'Inception', 'Your Name', 'Soul', 'Parasite'
+    }
+    assert filter_names(cur, genres='romance|action, sci-fi') == {'Inception', 'Her'}
+
+def test_genres_not(cur):
+    assert filter_names(cur, genres='comedy,-animation') == {'Her'}
+    assert filter_names(cur, genres='-romance', country='US') == {'Inception', 'Soul'}
+
+def test_genres_not_found(cur, capsys):
+    assert filter_names(cur, genres='horror') == set()
+    assert filter_names(cur, genres='horror|drama') == {'Your Name'}
+    output = capsys.readouterr()
+    assert output.out == '' and "Genre 'horror' not found." in output.err
+
+def test_prefix_range():
+    assert get_prefix_range('2023') == ('2023', '2024')
+    assert get_prefix_range('2023-09') == ('2023-09', '2023-0:')  # '2023-09-30' < '2023-0:'
+
+def test_watched_year(cur):
+    assert filter_names(cur, watched_year='2024') == {'Inception', 'Parasite'}
+    assert filter_names(cur, watched_year='23') == {'Your Name'}
+
+    query, parameters = get_filter_query(cur, watched_year='2024')
+    plan = cur.execute('EXPLAIN QUERY PLAN ' + query, parameters).fetchall()
+    assert 'USING INDEX idx_movie_detail_watched_date' in plan[0][-1]
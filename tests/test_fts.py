@@ -0,0 +1,69 @@
+import pytest
+import sqlite3
+from utils.fts import to_word_query, get_search_query
+from utils.filter import get_filter_query
+from utils.movie import add_movie, update_movie, delete_movie
+
+with open('sql/schema.sql', 'r') as f:
+    schema_sql = f.read()
+
+movies = [
+    ('Harry Potter and the Half-Blood Prince', 'Magic school, the best part of the series'),
+    ('Spirited Away', 'Magical bath house'),
+    ('The Boy and the Beast', None),
+]
+
+@pytest.fixture(scope='module')
+def cur():
+    con = sqlite3.connect(':memory:')
+    con.executescript(schema_sql)
+    cur = con.cursor()
+    for name, note in movies:
+        add_movie({
+            'name': name, 'year': None, 'status': 'waiting', 'type': 'movie', 'country': None,
+            'genres': [], 'rating': None, 'watched_date': None, 'note': note
+        }, cur)
+    yield cur
+    con.close()
+
+def search_names(cur, keyword: str, column: str = 'name', words: bool = False) -> list[str]:
+    query, parameters = get_search_query(keyword, column, words)
+    return [row[1] for row in cur.execute(query, parameters)]
+
+def test_to_word_query():
+    assert to_word_query('harry pot* "half blood"') == '"harry" "pot"* "half blood"'
+    assert to_word_query('half-blood') == '"half-blood"'
+    assert to_word_query('* ""') == ''
+
+def test_substring_search(cur):
+    assert search_names(cur, 'POTTER') == ['Harry Potter and the Half-Blood Prince']
+    # Ranked by relevance, the shorter note first
+    assert search_names(cur, 'magic', 'note') == [
+        'Spirited Away', 'Harry Potter and the Half-Blood Prince'
+    ]
+    assert len(search_names(cur, 'he')) == 2  # too short for trigram, LIKE fallback
+
+def test_word_search(cur):
+    assert search_names(cur, 'magic', 'note', words=True) == [
+        'Harry Potter and the Half-Blood Prince'
+    ]
+    assert search_names(cur, 'magic*', 'note', words=True) == [
+        'Spirited Away', 'Harry Potter and the Half-Blood Prince'
+    ]
+    assert search_names(cur, '"the beast"', words=True) == ['The Boy and the Beast']
+    assert search_names(cur, '"beast the"', words=True) == []
+
+def test_filter_match(cur):
+    query, parameters = get_filter_query(cur, name='and the', note_contains='magic')
+    assert [row[1] for row in cur.execute(query, parameters)] == [
+        'Harry Potter and the Half-Blood Prince'
+    ]
+
+def test_index_sync(cur):
+    update_movie(2, {'name': 'Sen to Chihiro'}, cur)
+    assert search_names(cur, 'spirited') == []
+    assert search_names(cur, 'chihiro') == ['Sen to Chihiro']
+
+    delete_movie(2, cur)
+    assert search_names(cur, 'chihiro') == []
+    assert search_names(cur, 'bath', 'note') == []
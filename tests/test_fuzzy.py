@@ -0,0 +1,65 @@
+import sqlite3
+from difflib import get_close_matches
+import pytest
+from utils.db import ensure_schema
+from utils.fuzzy import FuzzyIndex, get_trigrams, get_fuzzy_match, get_name_index
+from utils.movie import add_movies
+
+COMMANDS = ['add', 'backup', 'delete', 'export', 'filter', 'get', 'latest', 'search', 'stats']
+
+def test_trigrams():
+    assert get_trigrams('Up') == {'  u', ' up', 'up '}
+
+@pytest.mark.parametrize('value', ['serch', 'stast', 'gt', 'wglete', 'expotr', 'xyz', 'ad'])
+def test_matches_like_difflib(value):
+    # Few choices are all scored: same results as get_close_matches
+    assert FuzzyIndex(COMMANDS).get_matches(value, n=3) == get_close_matches(value, COMMANDS, n=3)
+
+def test_fuzzy_match():
+    assert get_fuzzy_match('filtr', COMMANDS) == 'filter'
+    assert get_fuzzy_match('zzz', COMMANDS) is None
+
+def test_many_choices():
+    names = [f'Movie {i}' for i in range(1000)] + ['Interstellar', 'Inception', 'Interstate 60']
+    index = FuzzyIndex(names, max_scored=10)
+    # Only 10 of 1003 choices are scored, with the same results as get_close_matches
+    for value in ['Intersteller', 'Interstat', 'Incepton']:
+        assert index.get_matches(value, n=2) == get_close_matches(value, names, n=2)
+    assert index.get_matches('Movie 42', n=1) == ['Movie 42']
+    assert index.get_matches('qqq') == []
+
+def new_db(path: str, name: str) -> sqlite3.Connection:
+    con = sqlite3.connect(path)
+    ensure_schema(con)
+    add_movies([(name, 2014, 'waiting', 'movie', 'US', [], None, None, None)], con.cursor())
+    con.commit()
+    return con
+
+def test_name_index():
+    con = new_db(':memory:', 'Interstellar')
+    cur = con.cursor()
+    index = get_name_index(cur)
+    assert index.get_matches('Intersteller') == ['Interstellar']
+    assert get_name_index(cur) is index  # cached
+
+    add_movies([('Inception', 2010, 'waiting', 'movie', 'US', [], None, None, None)], cur)
+    assert get_name_index(cur).get_matches('Incepton') == ['Inception']  # rebuilt after changes
+    con.close()
+
+def test_name_index_per_database(tmp_path):
+    # Same change seq, different databases
+    first, second = new_db(':memory:', 'Interstellar'), new_db(':memory:', 'Inception')
+    assert get_name_index(first.cursor()).get_matches('Incepton') == []
+    assert get_name_index(second.cursor()).get_matches('Incepton') == ['Inception']
+    first.close()
+    second.close()
+
+    # A database file re-created at the same seq, like a re-import
+    path = tmp_path / 'movies.db'
+    con = new_db(path, 'Interstellar')
+    assert get_name_index(con.cursor()).get_matches('Intersteller') == ['Interstellar']
+    con.close()
+    path.unlink()
+    con = new_db(path, 'Inception')
+    assert get_name_index(con.cursor()).get_matches('Incepton') == ['Inception']
+    con.close()
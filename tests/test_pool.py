@@ -0,0 +1,103 @@
+import threading
+import pytest
+from utils.constants import DB_READ_PRAGMAS
+from utils.pool import ConnectionPool
+from utils.db import fetch_scalar, fetch_rows_count
+from utils.movie import add_movie
+
+MOVIE = {
+    'name': 'Soul', 'year': 2020, 'status': 'waiting', 'type': 'movie', 'country': 'US',
+    'genres': ['drama'], 'rating': None, 'watched_date': None, 'note': None
+}
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'movies.db'))
+    yield pool
+    pool.close()
+
+def test_pragmas(pool):
+    with pool.write() as con:
+        assert fetch_scalar(con, 'PRAGMA journal_mode') == 'wal'
+        assert fetch_scalar(con, 'PRAGMA busy_timeout') == 5000
+    with pool.read() as con:
+        assert fetch_scalar(con, 'PRAGMA busy_timeout') == 5000
+        assert fetch_scalar(con, 'PRAGMA synchronous') == 1  # NORMAL
+        assert fetch_scalar(con, 'PRAGMA query_only') == 1
+        assert fetch_scalar(con, 'PRAGMA mmap_size') > 0
+        assert fetch_scalar(con, 'PRAGMA cache_size') == DB_READ_PRAGMAS['cache_size']
+
+def test_custom_pragmas(tmp_path):
+    pragmas = {'busy_timeout': 100, 'cache_size': -1000}
+    pool = ConnectionPool(str(tmp_path / 'movies.db'), pragmas=pragmas)
+    with pool.read() as con:
+        assert fetch_scalar(con, 'PRAGMA busy_timeout') == 100
+        assert fetch_scalar(con, 'PRAGMA cache_size') == -1000
+        assert fetch_scalar(con, 'PRAGMA query_only') == 1  # read defaults still apply
+    pool.close()
+
+def test_reader_reused(pool):
+    with pool.read() as con:
+        main_con = con
+        with pool.read() as nested:
+            assert nested is not main_con  # checked out
+    with pool.read() as con:
+        assert con is main_con  # returned
+
+    readers = []
+    def read():
+        with pool.read() as con:
+            readers.append(con)
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    assert readers[0] is main_con
+
+def test_readers_bounded(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'movies.db'), max_readers=2)
+    def read():
+        with pool.read() as con:
+            fetch_rows_count(con)
+
+    for _ in range(50):  # short-lived threads, like Streamlit reruns
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+    assert len(pool._connections) == 2  # the writer and one reader
+
+    threads = [threading.Thread(target=read) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pool._connections) <= 3  # the writer and at most max_readers
+    pool.close()
+
+def test_write(pool):
+    with pool.write() as con:
+        add_movie(MOVIE, con.cursor())
+    with pool.read() as con:
+        assert fetch_rows_count(con) == 1
+
+    # rolled back on error
+    with pytest.raises(ValueError):
+        with pool.write() as con:
+            add_movie(MOVIE, con.cursor())
+            raise ValueError
+    with pool.read() as con:
+        assert fetch_rows_count(con) == 1
+
+def test_concurrent_writes(pool):
+    def write():
+        for _ in range(20):
+            with pool.write() as con:
+                add_movie(MOVIE, con.cursor())
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with pool.read() as con:
+        assert fetch_rows_count(con) == 80
@@ -0,0 +1,69 @@
+import sqlite3
+import pytest
+from utils.db import ensure_schema, fetch_rows, fetch_scalar
+from utils.profile import start_profiling, stop_profiling, get_profiler, is_slow_step
+from utils.sql import run_sql
+
+@pytest.fixture
+def cur():
+    con = sqlite3.connect(':memory:')
+    ensure_schema(con)
+    yield con.cursor()
+    con.close()
+    stop_profiling()
+
+def test_not_profiling(cur):
+    assert get_profiler() is None
+    fetch_rows(cur, 'SELECT * FROM movie_detail')
+    assert get_profiler() is None
+
+def test_profile_queries(cur):
+    profiler = start_profiling()
+    fetch_rows(cur, 'SELECT * FROM movie_detail WHERE status = ?', ('waiting',))
+    fetch_scalar(cur, 'SELECT COUNT(*) FROM movie  -- comment')
+    assert stop_profiling() is profiler
+    fetch_rows(cur, 'SELECT 1')  # not recorded after stop
+
+    search, count = profiler.records
+    assert search['rows'] == 0
+    assert search['parameters'] == ['waiting']
+    assert search['plan'] == ['SEARCH movie_detail USING INDEX idx_movie_detail_status (status=?)']
+    assert search['warnings'] == []
+    assert count['query'] == 'SELECT COUNT(*) FROM movie'
+    assert count['rows'] == 1
+
+def test_profile_warnings(cur):
+    profiler = start_profiling()
+    fetch_rows(cur, 'SELECT * FROM movie_detail WHERE note = ? ORDER BY name', ('x',))
+    warnings = profiler.records[0]['warnings']
+    assert warnings == ['SCAN movie_detail', 'USE TEMP B-TREE FOR ORDER BY']
+    assert '! SCAN movie_detail' in profiler.format()
+
+def test_profile_run_sql_steps(cur):
+    profiler = start_profiling()
+    run_sql(cur, 'SELECT * FROM movie_detail', sort=('rating', 'desc'))
+    assert [r.get('name') for r in profiler.records] == [None, 'run_sql: transform']
+    assert 'ORDER BY' in profiler.records[0]['query']  # sorted in SQL
+
+    # Statements that can't be wrapped as a subquery are sorted in Python
+    profiler = start_profiling()
+    run_sql(cur, 'PRAGMA table_info(movie)', sort=('name', 'asc'))
+    assert [r.get('name') for r in profiler.records] == [
+        None, 'run_sql: transform', 'run_sql: sort'
+    ]
+
+def test_is_slow_step():
+    assert is_slow_step('SCAN movie')
+    assert is_slow_step('  USE TEMP B-TREE FOR GROUP BY')
+    assert not is_slow_step('SEARCH movie USING INTEGER PRIMARY KEY (rowid=?)')
+    assert not is_slow_step('SCAN f VIRTUAL TABLE INDEX 0:M2')
+    assert not is_slow_step('SCAN CONSTANT ROW')
+
+def test_profile_iter_rows(cur):
+    from utils.db import iter_rows
+    start_profiling()
+    rows, column_names = iter_rows(cur, 'SELECT 1 AS a UNION ALL SELECT 2', batch_size=1)
+    assert column_names == ['a']
+    assert get_profiler().records == []  # recorded once consumed
+    assert list(rows) == [(1,), (2,)]
+    assert get_profiler().records[0]['rows'] == 2
@@ -0,0 +1,52 @@
+import click
+from utils.cli import AliasedGroup
+from utils.server import handle_request, run_command
+from client import main, request
+
+@click.group(cls=AliasedGroup)
+def group():
+    pass
+
+@group.command()
+@click.argument('movie_id', type=int)
+def get(movie_id):
+    print(f'movie {movie_id}')
+
+@group.command()
+def add():
+    click.prompt('Name')
+
+@group.command()
+@click.option('--recompute', is_flag=True)
+def stats(recompute):
+    raise RuntimeError('database is locked')
+
+def test_run_command():
+    assert run_command(group, ['get', '1']) == ('movie 1\n', 0)
+
+def test_run_command_errors():
+    output, exit_code = run_command(group, ['get', 'x'])
+    assert exit_code == 2
+    assert "'x' is not a valid integer" in output
+
+    assert run_command(group, ['stats']) == ('Exception: database is locked\n', 1)
+
+def test_handle_request():
+    assert handle_request(group, {'argv': ['get', '1']}) == {'output': 'movie 1\n', 'exit_code': 0}
+    # prefix match resolves to the full command name
+    assert handle_request(group, {'argv': ['ge', '1']})['exit_code'] == 0
+
+def test_handle_request_forward():
+    # write and interactive commands run in the client
+    assert handle_request(group, {'argv': ['add']}) == {'forward': False}
+    assert handle_request(group, {'argv': ['unknown']}) == {'forward': False}
+    assert handle_request(group, {'argv': []}) == {'forward': False}
+    assert handle_request(group, {'argv': ['stats', '--recompute']}) == {'forward': False}
+
+def test_request_without_server(tmp_path):
+    assert request(str(tmp_path / 'movies.sock'), ['get', '1']) is None
+
+def test_client_fallback_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)  # no server socket, no database
+    assert main(['get', '1']) == 1
+    assert capsys.readouterr().out.startswith('Exception: ')
@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import pytest
+from utils.db import ensure_schema
+from utils.sql import ScriptRegistry, get_named_parameters, resolve_sort, run_sql
+
+def test_named_parameters():
+    query = """
+        -- :commented
+        SELECT * FROM movie_detail
+        WHERE SUBSTR(watched_date, 1, 7) = COALESCE(:month, strftime('%Y-%m', CURRENT_DATE))
+            AND name != ':quoted' AND (:month IS NULL OR status = :status)
+    """
+    assert get_named_parameters(query) == ['month', 'status']
+
+def test_registry(tmp_path):
+    (tmp_path / 'month.sql').write_text('SELECT :month AS month')
+    (tmp_path / 'schema.sql').write_text('')
+    registry = ScriptRegistry(tmp_path)
+
+    assert registry.list() == ['month']
+    assert registry.resolve('mon') == ('month', 'Prefix')
+    script = registry.get('month')
+    assert registry.get('month') is script  # cached
+    assert script.bind({}) == {'month': None}
+    assert script.bind({'month': '2025-03'}) == {'month': '2025-03'}
+    with pytest.raises(ValueError, match='accepted: month'):
+        script.bind({'year': '2025'})
+
+    # Edited script is re-read
+    path = tmp_path / 'month.sql'
+    path.write_text('SELECT :month AS month, :year AS year')
+    os.utime(path, ns=(0, script.mtime_ns + 1))
+    assert registry.get('month').parameters == ['month', 'year']
+
+def test_period_script_parameters():
+    from utils.movie import add_movies
+    from utils.sql import get_script_registry
+
+    con = sqlite3.connect(':memory:')
+    ensure_schema(con)
+    cur = con.cursor()
+    add_movies([
+        ('A', 2001, 'completed', 'movie', 'US', [], 8, '2025-03-02', None),
+        ('B', 2002, 'completed', 'movie', 'US', [], 7, '2025-02', None),
+        ('C', 2003, 'completed', 'movie', 'US', [], 6, '2024', None),
+        ('D', 2004, 'completed', 'movie', 'US', [], 5, '2025', None),
+    ], cur)
+
+    registry = get_script_registry('sql')
+    def run(name, **values):
+        script = registry.get(name)
+        rows, _ = run_sql(cur, script.query, parameters=script.bind(values))
+        return [row[1] for row in rows]
+
+    assert run('thismonth', month='2025-03') == ['A']
+    assert run('lastmonth', month='2025-03') == ['B']
+    assert run('thisyear', year='2025') == ['D', 'B', 'A']  # year only sorts first
+    assert run('lastyear', year='2025') == ['C']
+    assert run('lastmonth', month='2025-01') == []  # '2024-12' < '2025' < '2025-01'
+
+    plan = cur.execute('EXPLAIN QUERY PLAN ' + registry.get('thismonth').query, {'month': None})
+    assert 'USING INDEX idx_movie_detail_watched_date' in plan.fetchone()[-1]
+    con.close()
+
+def test_resolve_sort(capsys):
+    columns = ['id', 'name', 'rating']
+    assert resolve_sort(('ratng', 'd'), columns) == ('rating', True)
+    assert resolve_sort(('zzz', 'a'), columns) is None
+    assert resolve_sort(('name', 'up'), columns) == ('name', False)
+    output = capsys.readouterr()
+    assert output.out == ''  # messages don't mix with the data
+    assert "Column 'zzz' not found" in output.err and "Invalid sort order 'up'" in output.err
@@ -0,0 +1,148 @@
+"""Online backup and restore through the SQLite backup API, rotating snapshots"""
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+
+# Snapshot file names carry the change seq they include: movies-20250301-120000-42.db
+SNAPSHOT_GLOB = 'movies-*-*-*.db'
+
+def copy_database(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    pages: int | None = None,
+    pause: float | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> None:
+    """
+    Copy the `source` database into `target`, `pages` pages at a time (default: BACKUP_PAGES).
+
+    The source is only locked during each step, sleeping `pause` seconds in between
+    (default: BACKUP_PAUSE) lets other connections read and write meanwhile.
+    `progress(remaining, total)` is called after every step, with page counts.
+    """
+    import time
+    from utils.constants import BACKUP_PAGES, BACKUP_PAUSE
+
+    # A source with uncommitted writes would report busy on every step, forever
+    if source.in_transaction:
+        raise sqlite3.OperationalError('source is in transaction, commit before copying')
+
+    pages = BACKUP_PAGES if pages is None else pages
+    pause = BACKUP_PAUSE if pause is None else pause
+
+    def step(status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(remaining, total)
+        if remaining and pause:
+            time.sleep(pause)
+
+    source.backup(target, pages=pages, progress=step)
+
+def backup_database(con: sqlite3.Connection, path: str | Path, **kwargs) -> None:
+    """Back up the database of `con` to a file, see `copy_database` for `kwargs`."""
+    target = sqlite3.connect(path)
+    try:
+        copy_database(con, target, **kwargs)
+    finally:
+        target.close()
+
+def restore_database(con: sqlite3.Connection, path: str | Path, **kwargs) -> int:
+    """
+    Replace the database of `con` by a backup file, in place: other connections see the
+    restored data on their next read. Return the new change seq.
+
+    The backup is migrated if its schema is older, and the change log restarts after
+    both databases (see `restart_change_log`), so caches and exports notice the restore.
+    """
+    from utils.changes import get_last_change, restart_change_log
+    from utils.db import ensure_schema
+
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(path)
+
+    before = get_last_change(con.cursor())
+    source = sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        copy_database(source, con, **kwargs)
+    finally:
+        source.close()
+
+    ensure_schema(con)
+    seq = restart_change_log(con.cursor(), before)
+    con.commit()
+    return seq
+
+def get_snapshots(folder: str | Path | None = None) -> list[Path]:
+    """Return the snapshot files of a folder (default: SNAPSHOT_FOLDER), oldest first."""
+    from utils.constants import SNAPSHOT_FOLDER
+    folder = Path(SNAPSHOT_FOLDER if folder is None else folder)
+    # By timestamp, then by seq for snapshots taken in the same second
+    return sorted(
+        folder.glob(SNAPSHOT_GLOB),
+        key=lambda path: (path.stem.rsplit('-', 1)[0], get_snapshot_seq(path) or 0)
+    )
+
+def get_snapshot_seq(path: Path) -> int | None:
+    """Return the change seq included in a snapshot, from its file name."""
+    seq = path.stem.rsplit('-', 1)[-1]
+    return int(seq) if seq.isdigit() else None
+
+def get_modified_time(con: sqlite3.Connection) -> int | None:
+    """Return the last write time (ns) of the database and WAL files of `con`, None in memory."""
+    import os
+    file = con.execute("SELECT file FROM pragma_database_list WHERE name = 'main'").fetchone()[0]
+    if not file:
+        return None
+    paths = [path for path in (file, f'{file}-wal') if os.path.exists(path)]
+    return max(os.stat(path).st_mtime_ns for path in paths) if paths else None
+
+def is_snapshot_current(con: sqlite3.Connection, snapshot: Path, seq: int) -> bool:
+    """
+    Return True if a snapshot has all the data of the database: same change seq, and the
+    database files not written since (writes that don't move the seq: imports without
+    triggers, genres without movies).
+    """
+    if get_snapshot_seq(snapshot) != seq:
+        return False
+    modified = get_modified_time(con)
+    return modified is None or modified < snapshot.stat().st_mtime_ns
+
+def take_snapshot(
+    con: sqlite3.Connection,
+    folder: str | Path | None = None,
+    keep: int | None = None,
+    **kwargs,
+) -> Path | None:
+    """
+    Back up the database to a new timestamped snapshot, keeping the last `keep` snapshots
+    (default: SNAPSHOT_KEEP). Return its path, or None if nothing changed since the
+    last snapshot (see `is_snapshot_current`). See `copy_database` for `kwargs`.
+    """
+    from datetime import datetime
+    from utils.changes import get_last_change
+    from utils.constants import SNAPSHOT_FOLDER, SNAPSHOT_KEEP
+
+    folder = Path(SNAPSHOT_FOLDER if folder is None else folder)
+    keep = SNAPSHOT_KEEP if keep is None else keep
+
+    # Read the seq before the data: a change made in between is in the next snapshot too
+    seq = get_last_change(con.cursor())
+    snapshots = get_snapshots(folder)
+    if snapshots and is_snapshot_current(con, snapshots[-1], seq):
+        return None
+
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f'movies-{datetime.now():%Y%m%d-%H%M%S}-{seq}.db'
+
+    # Write then rename, so an interrupted backup is never taken for a snapshot
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        backup_database(con, tmp_path, **kwargs)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    for old in get_snapshots(folder)[:-keep]:  # keep=0 keeps all
+        old.unlink()
+    return path
@@ -0,0 +1,73 @@
+"""Change log utilities, see `movie_change` and `sync_state` in schema.sql"""
+import sqlite3
+
+def get_last_change(cur: sqlite3.Cursor) -> int:
+    """Return the seq of the last change, 0 if nothing changed yet."""
+    row = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'movie_change'").fetchone()
+    return row[0] if row else 0
+
+def get_sync_seq(cur: sqlite3.Cursor, name: str) -> int | None:
+    """Return the last change seq synced to a target, None if never synced."""
+    row = cur.execute("SELECT seq FROM sync_state WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def set_sync_seq(
+    cur: sqlite3.Cursor, name: str, seq: int, retention: int | None = None
+) -> None:
+    """
+    Record the last change seq synced to a target, prune changes synced to every target
+    except the last `retention` changes (default: CHANGE_LOG_RETENTION), so readers
+    behind by fewer changes (web app sessions) can still refresh by delta.
+    """
+    if retention is None:
+        from utils.constants import CHANGE_LOG_RETENTION
+        retention = CHANGE_LOG_RETENTION
+
+    cur.execute("""
+        INSERT INTO sync_state (name, seq) VALUES (?, ?)
+        ON CONFLICT (name) DO UPDATE SET seq = excluded.seq
+    """, (name, seq))
+    cur.execute(
+        "DELETE FROM movie_change WHERE seq <= MIN((SELECT MIN(seq) FROM sync_state), ?)",
+        (get_last_change(cur) - retention,)
+    )
+
+def reset_sync_seq(cur: sqlite3.Cursor, name: str) -> None:
+    """Forget the sync state of a target, so it is considered out of date."""
+    cur.execute("DELETE FROM sync_state WHERE name = ?", (name,))
+
+def is_out_of_date(cur: sqlite3.Cursor, name: str) -> bool:
+    """Return True if a target was never synced or has changes not synced yet."""
+    seq = get_sync_seq(cur, name)
+    return seq is None or seq < get_last_change(cur)
+
+def get_changed_movies(cur: sqlite3.Cursor, since: int, until: int) -> set[int] | None:
+    """
+    Return ids of movies changed after seq `since` up to `until`,
+    None if some of these changes were already pruned.
+    """
+    if until <= since:
+        return set()
+
+    oldest = cur.execute('SELECT MIN(seq) FROM movie_change').fetchone()[0]
+    if oldest is None or oldest > since + 1:
+        return None
+
+    cur.execute(
+        'SELECT DISTINCT movie_id FROM movie_change WHERE seq > ? AND seq <= ?', (since, until)
+    )
+    return {movie_id for (movie_id,) in cur.fetchall()}
+
+def restart_change_log(cur: sqlite3.Cursor, after: int) -> int:
+    """
+    Clear the change log and move the change seq past `after`, return the new seq.
+
+    For a database replaced by other content (restore): readers behind see a change
+    they can't find in the log, so they reload everything instead of applying a delta.
+    """
+    seq = max(get_last_change(cur), after) + 1
+    cur.execute("DELETE FROM movie_change")
+    cur.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'movie_change'", (seq,))
+    if cur.rowcount == 0:
+        cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('movie_change', ?)", (seq,))
+    return seq
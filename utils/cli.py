@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 import click
 
 class IntRangeOrNone(click.ParamType):
@@ -67,6 +69,19 @@ class AbbrevChoice(click.Choice):
         except ValueError as e:
             self.fail(str(e), param, ctx)
 
+class KeyValue(click.ParamType):
+    """'key=value' parameter, converted to a (key, value) tuple."""
+    name = 'key=value'
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, tuple):
+            return value
+
+        key, separator, value = value.partition('=')
+        if not separator or not key.strip():
+            self.fail(f'{key!r} is not in the key=value form', param, ctx)
+        return key.strip(), value
+
 class AliasedGroup(click.Group):
     # Source: https://click.palletsprojects.com/en/stable/extending-click/#command-aliases
     def get_command(self, ctx, cmd_name):
@@ -117,6 +132,15 @@ def valid_date(date: str) -> str:
         f"{date!r} does not match the formats 'YYYY', 'YYYY-MM', 'YYYY-MM-DD'"
     )
 
+def rich_print(*objects) -> None:
+    """Pretty print with Rich in a terminal, plain print otherwise (Rich is slow to import)."""
+    import sys
+    if sys.stdout.isatty():
+        from rich import print as rprint
+        rprint(*objects)
+    else:
+        print(*objects)
+
 def print_rows(
     rows: list[tuple],
     headers: list[str],
@@ -158,6 +182,122 @@ def print_rows(
     if print_total:
         console.print(f'Total: {len(rows)}')
 
+OUTPUT_FORMATS = ['auto', 'rich', 'plain', 'tsv', 'csv', 'jsonl']
+
+def output_rows(
+    rows: Iterable,
+    headers: list[str],
+    output_format: str = 'auto',
+    hide_columns: list[str] | None = None,
+    print_total: bool = False,
+) -> int:
+    """
+    Print rows in one of `OUTPUT_FORMATS`, return the number of rows.
+
+    'rich' builds a table of all rows in memory, other formats write rows as they come from
+    the (possibly lazy) `rows`. 'auto' uses Rich for up to `RICH_MAX_ROWS` rows, plain text
+    beyond. The total is printed for 'rich' and 'plain' only, so data formats stay parsable.
+    """
+    from itertools import chain, islice
+    from utils.constants import RICH_MAX_ROWS
+
+    if output_format == 'auto':
+        head = list(islice(rows, RICH_MAX_ROWS + 1))
+        if len(head) <= RICH_MAX_ROWS:
+            rows, output_format = head, 'rich'
+        else:
+            rows, output_format = chain(head, rows), 'plain'
+
+    if output_format == 'rich':
+        rows = list(rows)
+        print_rows(rows, headers, hide_columns=hide_columns, print_total=print_total)
+        return len(rows)
+
+    count = write_rows(rows, headers, output_format, hide_columns=hide_columns)
+    if output_format == 'plain':
+        print(f'Total: {count}' if count else 'No data.')
+    return count
+
+def write_rows(
+    rows: Iterable,
+    headers: list[str],
+    output_format: str,
+    file=None,
+    hide_columns: list[str] | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Write rows as 'plain' (aligned columns), 'tsv', 'csv' or 'jsonl' (one object per row)
+    to `file` (stdout by default), batch by batch. Return the number of rows.
+    Plain column widths are computed from the first batch, longer values shift the line.
+    """
+    import sys
+    from itertools import islice
+
+    file = file or sys.stdout
+    hide_columns = hide_columns or []
+    keep_indexes = [i for i, h in enumerate(headers) if h not in hide_columns]
+    headers = [headers[i] for i in keep_indexes]
+
+    def to_str(value) -> str:
+        return '' if value is None else str(value)
+
+    if output_format == 'plain':
+        widths = None
+
+        def write_batch(batch):
+            nonlocal widths
+            lines = [[to_str(value) for value in row] for row in batch]
+            if widths is None:  # header, aligned on the first batch
+                widths = [
+                    max([len(header)] + [len(line[i]) for line in lines])
+                    for i, header in enumerate(headers)
+                ]
+                lines.insert(0, headers)
+            file.writelines(
+                '  '.join(v.ljust(w) for v, w in zip(line, widths)).rstrip() + '\n'
+                for line in lines
+            )
+    elif output_format == 'tsv':
+        def clean(value) -> str:  # one line per row, tabs only between values
+            return to_str(value).replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+
+        file.write('\t'.join(headers) + '\n')
+        def write_batch(batch):
+            file.writelines('\t'.join(map(clean, row)) + '\n' for row in batch)
+    elif output_format == 'csv':
+        import csv
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(headers)
+        def write_batch(batch):
+            writer.writerows(batch)  # None is written as an empty field
+    elif output_format == 'jsonl':
+        import json
+        def write_batch(batch):
+            file.writelines(
+                json.dumps(dict(zip(headers, row)), ensure_ascii=False) + '\n' for row in batch
+            )
+    else:
+        raise ValueError(f'Unknown output format {output_format!r}')
+
+    rows = iter(rows)
+    count = 0
+    while batch := list(islice(rows, batch_size)):
+        write_batch([[row[i] for i in keep_indexes] for row in batch])
+        count += len(batch)
+    return count
+
+def get_progress_printer(label: str):
+    """Return a `progress(remaining, total)` callback printing a percentage on one stderr line."""
+    import sys
+
+    def progress(remaining: int, total: int) -> None:
+        done = total - remaining
+        end = '\n' if remaining == 0 else ''
+        print(f'\r{label}: {100 * done // total}% ({done}/{total} pages)', end=end, file=sys.stderr)
+
+    return progress
+
 def print_sql_files(sql_files: list[str]) -> None:
     """Print a list of available SQL files."""
     from rich.columns import Columns
@@ -15,4 +15,49 @@ COUNTRIES = ['China', 'Japan', 'Korea', 'US']
 #     cur = con.cursor()
 #     # STATUSES = get_statuses(cur) 
 #     # TYPES = get_types(cur) 
-#     COUNTRIES = get_countries(cur) 
\ No newline at end of file
+#     COUNTRIES = get_countries(cur) 
+
+# CLI: export data/data.csv after every write
+CSV_AUTO_EXPORT = True
+# Web app: seconds before exporting data/data.csv after a write
+CSV_WRITE_BEHIND_DELAY = 5
+
+# Synced changes kept in the change log, for refreshes by delta
+CHANGE_LOG_RETENTION = 10_000
+
+# CLI: plain text instead of a Rich table beyond this many rows (`--format auto`)
+RICH_MAX_ROWS = 1000
+
+# Prepared statements cached per connection
+DB_CACHED_STATEMENTS = 256
+
+# Backup and restore: pages copied per step, seconds between steps
+BACKUP_PAGES = 1024
+BACKUP_PAUSE = 0.005
+# Rotating snapshots (`backup --snapshot`)
+SNAPSHOT_FOLDER = 'data/snapshots'
+SNAPSHOT_KEEP = 10
+
+# Read-only connections (read commands, web app readers)
+DB_READ_PRAGMAS = {
+    'query_only': 'ON',
+    'mmap_size': 256 * 1024 * 1024,  # bytes, 0 to disable
+    'cache_size': -32000,  # KiB when negative (32 MB)
+    'busy_timeout': 5000,  # ms
+}
+
+# Rows per batch (Parquet row group) of `export --format parquet|arrow`
+EXPORT_BATCH_SIZE = 65_536
+
+# Unix socket of the CLI server (`py cli.py serve`)
+SERVER_SOCKET = 'data/movies.sock'
+
+# Web app connections (utils/pool.py)
+DB_JOURNAL_MODE = 'WAL'
+DB_PRAGMAS = {
+    'busy_timeout': 5000,  # ms
+    'synchronous': 'NORMAL',  # safe with WAL
+    'cache_size': -16000,  # KiB when negative (16 MB)
+    'temp_store': 'MEMORY',
+}
+DB_MAX_READERS = 8
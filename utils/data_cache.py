@@ -0,0 +1,109 @@
+"""In-memory movies DataFrame kept up to date with the change log (web app)"""
+import sqlite3
+import threading
+
+import pandas as pd
+
+class MovieCache:
+    """
+    Movies DataFrame (indexed by id) refreshed by delta: only movies changed since
+    the last refresh (see `movie_change`) are re-read, falling back to a full reload
+    when those changes were pruned or the database was replaced.
+
+    The DataFrame is never modified in place, a refresh builds a new one,
+    so frames returned earlier stay valid snapshots.
+
+    Example:
+        >>> cache = MovieCache()
+        >>> df, version = cache.get(con)  # full load the first time, then only changes
+    """
+
+    def __init__(self, max_delta: int = 10_000, compact: bool = False):
+        self.max_delta = max_delta  # above this many changed movies, reload everything
+        self.compact = compact  # memory-efficient dtypes, see `compact_movies`
+        self.df = None
+        self.seq = None  # last change included in df
+        self.version = 0  # incremented every time df changes
+        self._lock = threading.Lock()
+
+    def get(self, con: sqlite3.Connection) -> tuple[pd.DataFrame, int]:
+        """Return the movies and their version, refreshed with the changes since the last call."""
+        with self._lock:
+            self._refresh(con)
+            return self.df, self.version
+
+    def reload(self, con: sqlite3.Connection) -> tuple[pd.DataFrame, int]:
+        """Return the movies and their version, fully reloaded."""
+        with self._lock:
+            self._load(con)
+            return self.df, self.version
+
+    def _load(self, con: sqlite3.Connection) -> None:
+        from utils.changes import get_last_change
+        from utils.movie import load_movies
+
+        # Read the seq before the data: a change made in between is applied again next time
+        self.seq = get_last_change(con.cursor())
+        self.df = load_movies(con, with_index=True, compact=self.compact)
+        self.version += 1
+
+    def _refresh(self, con: sqlite3.Connection) -> None:
+        from utils.changes import get_last_change, get_changed_movies
+
+        if self.df is None:
+            self._load(con)
+            return
+
+        cur = con.cursor()
+        last = get_last_change(cur)
+        if last == self.seq:
+            return
+
+        changed = get_changed_movies(cur, self.seq, last) if last > self.seq else None
+        # Pruned changes, database replaced (seq went back) or bulk changes
+        if changed is None or len(changed) > self.max_delta:
+            self._load(con)
+            return
+
+        self.df = apply_changes(self.df, con, changed)
+        self.seq = last
+        self.version += 1
+
+def apply_changes(df: pd.DataFrame, con: sqlite3.Connection, movie_ids: set[int]) -> pd.DataFrame:
+    """Return a new DataFrame with the rows of `movie_ids` replaced by their current data."""
+    ids = sorted(movie_ids)
+    rows = pd.read_sql_query(
+        f"SELECT * FROM movie_detail WHERE id IN ({', '.join('?' * len(ids))})",
+        con, params=ids, index_col='id'
+    )
+
+    df = df[~df.index.isin(ids)]  # updated and deleted movies
+    if rows.empty:
+        return df
+
+    # Few rows can infer other dtypes (e.g. object for all None), match the full frame
+    nullable_dtypes = {}  # nullable numbers of compact frames, cast after the merge
+    for column, dtype in df.dtypes.items():
+        if rows[column].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            new_values = set(rows[column].dropna()) - set(dtype.categories)
+            if new_values:
+                df[column] = df[column].cat.add_categories(sorted(new_values))
+            rows[column] = rows[column].astype(df[column].dtype)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            rows[column] = pd.to_numeric(rows[column])  # int -> float if missing values
+            if pd.api.types.is_extension_array_dtype(dtype):
+                nullable_dtypes[column] = dtype
+        else:
+            rows[column] = rows[column].astype(dtype)
+
+    # Same order as a full load (by id), new movies are usually already last
+    df = pd.concat([df, rows])
+    if nullable_dtypes:
+        from utils.movie import get_rating_dtype
+        # Derive the rating dtype again like compact_movies: a half rating needs Float32
+        if 'rating' in nullable_dtypes:
+            nullable_dtypes['rating'] = get_rating_dtype(df['rating'])
+        df = df.astype(nullable_dtypes)
+    return df if df.index.is_monotonic_increasing else df.sort_index(kind='stable')
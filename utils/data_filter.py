@@ -0,0 +1,133 @@
+"""In-memory filtering of the movies DataFrame (web app Data page)"""
+import numpy as np
+import pandas as pd
+
+NO_VALUE = -1  # code of missing values in the integer columns
+
+class MovieFilterIndex:
+    """
+    Precomputed columns of a movies DataFrame, so any filter combination is
+    answered with vectorized boolean operations. Build it once per data version.
+
+    - genres: multi-hot boolean matrix (movies x genres)
+    - status, type, country: categorical codes
+    - year, watched year: integers (NO_VALUE when missing)
+    - name: lowercased, for case-insensitive substring search
+
+    Example:
+        >>> index = MovieFilterIndex(df)
+        >>> index.filter(status='completed', genres=['romance', 'comedy'])
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.names = df['name'].str.lower()
+        self.year = to_int_codes(df['year'])
+        self.watched_year = to_int_codes(get_year(df['watched_date']))
+
+        self.categories = {}
+        self.codes = {}
+        for column in ['status', 'type', 'country']:
+            categorical = pd.Categorical(df[column])
+            self.categories[column] = categorical.categories
+            self.codes[column] = categorical.codes
+
+        self.genres, self.genre_matrix = to_multi_hot(df['genres'])
+
+    def get_mask(
+        self,
+        name: str | None = None,
+        year: int | None = None,
+        watched_year: int | None = None,
+        status: str | None = None,
+        genres: list[str] | None = None,
+        movie_type: str | None = None,
+        country: str | None = None,
+    ) -> np.ndarray:
+        """Return the boolean mask of movies matching all given filters."""
+        mask = np.ones(len(self.df), dtype=bool)
+
+        if name:
+            mask &= self.names.str.contains(name.lower(), regex=False, na=False).to_numpy()
+
+        if year:
+            mask &= self.year == int(year)
+
+        if watched_year:
+            mask &= self.watched_year == int(watched_year)
+
+        for column, value in [('status', status), ('type', movie_type), ('country', country)]:
+            if value:
+                mask &= self.codes[column] == self.get_code(column, value)
+
+        if genres:
+            genre_ids = [self.genres.get(genre) for genre in genres]
+            if None in genre_ids:
+                mask[:] = False  # genre not in the data
+            else:
+                mask &= self.genre_matrix[:, genre_ids].all(axis=1)
+
+        return mask
+
+    def filter(self, **filters) -> pd.DataFrame:
+        """Return the movies matching all given filters, see `get_mask`."""
+        return self.df[self.get_mask(**filters)]
+
+    def get_code(self, column: str, value: str) -> int:
+        """Return the categorical code of a value, NO_VALUE (matches nothing) if absent."""
+        categories = self.categories[column]
+        return categories.get_loc(value) if value in categories else NO_VALUE
+
+def to_int_codes(series: pd.Series) -> np.ndarray:
+    """Convert a numeric column to integers, NO_VALUE for missing values."""
+    return series.fillna(NO_VALUE).to_numpy(dtype=np.int64)
+
+def get_year(dates: pd.Series) -> pd.Series:
+    """Return the year of (partial) date strings, as floats (NaN when missing)."""
+    if isinstance(dates.dtype, pd.CategoricalDtype):  # parse each distinct date once
+        years = pd.to_numeric(pd.Series(dates.cat.categories, dtype=object).str[:4])
+        return pd.Series(np.append(years.to_numpy(dtype=float), np.nan)[dates.cat.codes])
+    return pd.to_numeric(dates.str[:4])
+
+def to_multi_hot(genres: pd.Series) -> tuple[dict[str, int], np.ndarray]:
+    """
+    Convert comma-separated genres to ({genre: column}, multi-hot matrix),
+    with one row per movie and one boolean column per genre.
+    """
+    if isinstance(genres.dtype, pd.CategoricalDtype):
+        # Split each distinct genres string once, rows take the row of their category
+        genre_ids, matrix = to_multi_hot(pd.Series(genres.cat.categories, dtype=object))
+        matrix = np.vstack([matrix, np.zeros((1, matrix.shape[1]), dtype=bool)])
+        return genre_ids, matrix[genres.cat.codes.to_numpy()]  # code -1 (missing) -> last row
+
+    split = genres.fillna('').str.split(',')
+    lengths = split.str.len().to_numpy()
+    flat = pd.Series(np.concatenate(split.to_numpy()) if len(split) else [], dtype=object)
+    flat = flat.str.strip()
+
+    codes, uniques = pd.factorize(flat)
+    rows = np.repeat(np.arange(len(genres)), lengths)
+    keep = flat.to_numpy() != ''  # empty genres (missing or ',,')
+
+    matrix = np.zeros((len(genres), len(uniques)), dtype=bool)
+    matrix[rows[keep], codes[keep]] = True
+    return {genre: i for i, genre in enumerate(uniques) if genre}, matrix
+
+def filter_movies(
+    df: pd.DataFrame,
+    name: str | None = None,
+    year: int | None = None,
+    watched_year: int | None = None,
+    status: str | None = None,
+    genres: list[str] | None = None,
+    movie_type: str | None = None,
+    country: str | None = None,
+) -> pd.DataFrame:
+    """
+    Return the movies matching all given filters, `genres` must all be present.
+    Builds a `MovieFilterIndex`, keep one instead when filtering the same data repeatedly.
+    """
+    return MovieFilterIndex(df).filter(
+        name=name, year=year, watched_year=watched_year, status=status,
+        genres=genres, movie_type=movie_type, country=country,
+    )
@@ -1,19 +1,127 @@
 import sqlite3
+from collections.abc import Iterator
+from time import perf_counter
 
-def get_connection(file_path: str = 'data/movies.db') -> sqlite3.Connection:
-    """Create and return a SQLite connection with foreign key support enabled."""
-    con = sqlite3.connect(file_path)
+SCHEMA_FILE = 'sql/schema.sql'
+MIGRATIONS_FOLDER = 'sql/migrations'
+SCHEMA_VERSION = 5  # latest migration number in MIGRATIONS_FOLDER
+FETCH_BATCH_SIZE = 1000  # rows per fetch when streaming results
+
+def get_connection(file_path: str = 'data/movies.db', **kwargs) -> sqlite3.Connection:
+    """
+    Create and return a SQLite connection with foreign key support enabled.
+    Extra keyword arguments are passed to `sqlite3.connect`, the prepared statement
+    cache size defaults to `DB_CACHED_STATEMENTS` (queries run again skip parsing).
+    """
+    from utils.constants import DB_CACHED_STATEMENTS
+    kwargs.setdefault('cached_statements', DB_CACHED_STATEMENTS)
+    con = sqlite3.connect(file_path, **kwargs)
     con.execute('PRAGMA foreign_keys = ON')  # enable foreign keys constraint and ON DELETE CASCADE
+    ensure_schema(con)
+    return con
+
+def get_read_connection(
+    file_path: str = 'data/movies.db', pragmas: dict | None = None, **kwargs
+) -> sqlite3.Connection:
+    """
+    Create and return a read-only connection (`mode=ro` URI) for commands that only read,
+    it never takes write locks. `pragmas` default to `DB_READ_PRAGMAS` (memory-mapped reads,
+    larger page cache, `query_only`, `busy_timeout` to wait for a commit in progress),
+    extra keyword arguments are passed to `sqlite3.connect`.
+
+    The schema isn't migrated by this connection: a missing or outdated database is
+    brought up to date with a read-write connection first (a single pragma read otherwise).
+    """
+    from pathlib import Path
+    from utils.constants import DB_CACHED_STATEMENTS, DB_READ_PRAGMAS
+    from utils.pool import configure_connection
+
+    path = Path(file_path)
+    if not path.exists():
+        get_connection(file_path).close()
+
+    kwargs.setdefault('cached_statements', DB_CACHED_STATEMENTS)
+    con = sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro', uri=True, **kwargs)
+    if fetch_scalar(con, 'PRAGMA user_version') < SCHEMA_VERSION:
+        get_connection(file_path).close()
+
+    configure_connection(con, DB_READ_PRAGMAS if pragmas is None else pragmas)
     return con
 
+def list_migrations() -> list:
+    """Return (version, path) of all migration files, sorted by version."""
+    from pathlib import Path
+    return sorted(
+        (int(path.stem.split('_')[0]), path)
+        for path in Path(MIGRATIONS_FOLDER).glob('*.sql')
+    )
+
+def ensure_schema(con: sqlite3.Connection) -> None:
+    """
+    Bring the database schema up to date.
+
+    The schema version is stored in `PRAGMA user_version`, so an up-to-date
+    database costs a single pragma read. Outdated databases run the pending
+    migrations in `sql/migrations/` then the (idempotent) `sql/schema.sql`.
+    """
+    version = fetch_scalar(con, 'PRAGMA user_version')
+    if version >= SCHEMA_VERSION:
+        return
+
+    is_new = fetch_scalar(
+        con, "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'movie'"
+    ) == 0
+
+    # A new database gets everything from schema.sql, migrations are for old ones
+    if not is_new:
+        for migration_version, path in list_migrations():
+            if migration_version > version:
+                con.executescript(path.read_text())
+
+    apply_schema(con)
+    con.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    con.commit()
+
+def apply_schema(con: sqlite3.Connection) -> None:
+    """
+    Run `sql/schema.sql`. It is idempotent, and backfills derived tables
+    (like `movie_detail`) when they are empty.
+    """
+    with open(SCHEMA_FILE, 'r') as f:
+        con.executescript(f.read())
+
+def drop_derived_objects(con: sqlite3.Connection) -> None:
+    """
+    Drop all triggers and secondary indexes, for fast bulk loading.
+    They are recreated by `apply_schema`.
+    """
+    cur = con.execute(
+        "SELECT type, name FROM sqlite_master "
+        "WHERE type IN ('trigger', 'index') AND sql IS NOT NULL"  # skip automatic indexes
+    )
+    for object_type, name in cur.fetchall():
+        con.execute(f'DROP {object_type} IF EXISTS {name}')
+
 def fetch_scalar(cur: sqlite3.Cursor, query: str) -> int | float:
     """Run a SQL query and return its single scalar value."""
-    return cur.execute(query).fetchone()[0]
+    from utils.profile import get_profiler
+    profiler = get_profiler()
+    if profiler is None:
+        return cur.execute(query).fetchone()[0]
+
+    tic = perf_counter()
+    value = cur.execute(query).fetchone()[0]
+    profiler.record_query(cur, query, None, perf_counter() - tic, 1)
+    return value
 
 def fetch_rows(
     cur: sqlite3.Cursor, query: str, parameters: tuple = None
 ) -> tuple[list[tuple], list[str]]:
     """Run a (parameterized) SQL query and return its rows and column names."""
+    from utils.profile import get_profiler
+    profiler = get_profiler()
+    tic = perf_counter()
+
     if parameters:
         cur.execute(query, parameters)
     else:
@@ -21,8 +129,45 @@ def fetch_rows(
 
     rows = cur.fetchall()
     column_names = [d[0] for d in cur.description]
+
+    if profiler is not None:
+        profiler.record_query(cur, query, parameters, perf_counter() - tic, len(rows))
     return rows, column_names
 
+def iter_rows(
+    cur: sqlite3.Cursor, query: str, parameters: tuple = None,
+    batch_size: int = FETCH_BATCH_SIZE
+) -> tuple[Iterator[tuple], list[str]]:
+    """
+    Run a (parameterized) SQL query and return an iterator over its rows and the column names.
+    Rows are fetched in batches as the iterator is consumed, so large results are never
+    held in memory. The cursor must not be reused until the iterator is exhausted.
+    """
+    from utils.profile import get_profiler
+    profiler = get_profiler()
+    tic = perf_counter()
+
+    cur.execute(query, parameters or ())
+    column_names = [d[0] for d in cur.description]
+    elapsed = perf_counter() - tic
+
+    def generate_rows():
+        nonlocal elapsed
+        count = 0
+        while True:
+            tic = perf_counter()
+            batch = cur.fetchmany(batch_size)
+            elapsed += perf_counter() - tic  # time in SQLite only, not in the consumer
+            if not batch:
+                break
+            count += len(batch)
+            yield from batch
+
+        if profiler is not None:
+            profiler.record_query(cur, query, parameters, elapsed, count)
+
+    return generate_rows(), column_names
+
 def fetch_rows_count(cur: sqlite3.Cursor, table: str = 'movie') -> int:
     """Return the number of rows in the specified table."""
-    return fetch_scalar(cur, f'SELECT COUNT(*) FROM {table}')
\ No newline at end of file
+    return fetch_scalar(cur, f'SELECT COUNT(*) FROM {table}')
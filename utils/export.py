@@ -0,0 +1,268 @@
+"""Export the database to data/data.csv (the Power BI dashboard data source)"""
+import sqlite3
+import threading
+from pathlib import Path
+
+CSV_FILE = Path('data/data.csv')
+CSV_SYNC_NAME = 'csv'
+
+def get_float_columns(cur: sqlite3.Cursor, table: str, column_names: list[str]) -> set[str]:
+    """
+    Return the columns holding integers that pandas reads as float64 (mixed with NULL or
+    REAL values, e.g. `year` with a missing year), it writes them as floats: '2010.0'.
+    """
+    checks = ', '.join(
+        f"""MAX(typeof("{column}") = 'integer')
+            AND MAX(typeof("{column}") IN ('null', 'real'))
+            AND NOT MAX(typeof("{column}") IN ('text', 'blob'))"""
+        for column in column_names
+    )
+    flags = cur.execute(f'SELECT {checks} FROM {table}').fetchone()
+    return {column for column, is_float in zip(column_names, flags) if is_float}
+
+def write_csv(
+    con: sqlite3.Connection, path: str | Path, batch_size: int | None = None
+) -> int:
+    """
+    Write all movies to a CSV file (gzip compressed for a '.gz' path), return the number
+    of rows written.
+
+    Rows are streamed from the database in batches, so memory stays flat for any library
+    size. The output is the same as pandas `to_csv` of `load_movies` (without the id).
+    """
+    import csv
+    import os
+    from operator import itemgetter
+    from utils.db import iter_rows, FETCH_BATCH_SIZE
+
+    path = Path(path)
+    cur = con.cursor()
+    column_names = [d[0] for d in cur.execute('SELECT * FROM movie_detail LIMIT 0').description]
+    float_columns = get_float_columns(cur, 'movie_detail', column_names)
+
+    rows, column_names = iter_rows(
+        cur, 'SELECT * FROM movie_detail', batch_size=batch_size or FETCH_BATCH_SIZE
+    )
+    keep = [i for i, column in enumerate(column_names) if column != 'id']  # pandas index
+    get_values = itemgetter(*keep)
+    float_indexes = [
+        keep.index(i) for i, column in enumerate(column_names) if column in float_columns
+    ]
+
+    def to_values(row: tuple) -> tuple:
+        values = get_values(row)
+        if not float_indexes:
+            return values
+        values = list(values)
+        for i in float_indexes:
+            if isinstance(values[i], int):
+                values[i] = float(values[i])
+        return values
+
+    # Write then rename, so readers never see a half-written file
+    tmp_path = path.with_name(path.name + '.tmp')
+    if path.suffix == '.gz':
+        import gzip
+        f = gzip.open(tmp_path, 'wt', encoding='utf-8', newline='')
+    else:
+        f = open(tmp_path, 'w', encoding='utf-8', newline='')
+
+    total = 0
+    try:
+        with f:
+            # pandas' dialect: minimal quoting, os.linesep, None as ''
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow([column_names[i] for i in keep])
+            for row in rows:
+                writer.writerow(to_values(row))
+                total += 1
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return total
+
+def export_csv(
+    con: sqlite3.Connection, path: str | Path = CSV_FILE, force: bool = False
+) -> int | None:
+    """
+    Export movies to CSV if the database changed since the last export.
+
+    Return the number of rows written, or None if the CSV file was already up to date.
+    """
+    from utils.changes import get_last_change, is_out_of_date, set_sync_seq
+
+    cur = con.cursor()
+    if not force and Path(path).exists() and not is_out_of_date(cur, CSV_SYNC_NAME):
+        return None
+
+    # Read the seq before the data: a change made in between is exported next time
+    seq = get_last_change(cur)
+    total = write_csv(con, path)
+    set_sync_seq(cur, CSV_SYNC_NAME, seq)
+    con.commit()
+    return total
+
+# Columnar exports (pyarrow): file suffix by format, also their sync target name
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+COLUMNAR_FOLDER = Path('data')
+
+def get_columnar_paths(file_format: str, folder: str | Path = COLUMNAR_FOLDER) -> tuple[Path, Path]:
+    """Return the paths of the movies and movie genres files of a columnar format."""
+    suffix = COLUMNAR_FORMATS[file_format]
+    return Path(folder) / f'movies{suffix}', Path(folder) / f'movie_genres{suffix}'
+
+def write_record_batches(
+    cur: sqlite3.Cursor, query: str, schema, path: Path, file_format: str, batch_size: int
+) -> int:
+    """
+    Write the rows of a query (columns in `schema` order) to a Parquet or Arrow IPC file,
+    `batch_size` rows at a time (a Parquet row group each), return the number of rows.
+    """
+    from itertools import batched
+    import pyarrow as pa
+    from utils.db import iter_rows
+
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        open_writer = pq.ParquetWriter
+    else:
+        open_writer = pa.ipc.new_file
+
+    rows, _ = iter_rows(cur, query, batch_size=batch_size)
+    total = 0
+
+    # Write then rename, so readers never see a half-written file
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open_writer(tmp_path, schema) as writer:
+            for batch in batched(rows, batch_size):
+                columns = zip(*batch)
+                writer.write_batch(pa.record_batch(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                total += len(batch)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return total
+
+def write_columnar(
+    con: sqlite3.Connection,
+    file_format: str = 'parquet',
+    folder: str | Path = COLUMNAR_FOLDER,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Write movies to typed columnar files (Parquet or Arrow IPC, requires pyarrow),
+    return the number of movies:
+
+    - movies: the columns of `movie_detail`, genres still comma-separated
+    - movie_genres: one (movie_id, genre) row per genre of a movie, for filtering by genre
+
+    Rows are streamed in batches of `batch_size` (default: EXPORT_BATCH_SIZE),
+    so memory stays flat for any library size.
+    """
+    import pyarrow as pa
+    from utils.constants import EXPORT_BATCH_SIZE
+
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    movies_path, genres_path = get_columnar_paths(file_format, folder)
+    cur = con.cursor()
+
+    movie_schema = pa.schema([
+        ('id', pa.int64()),
+        ('name', pa.string()),
+        ('year', pa.int16()),
+        ('status', pa.string()),
+        ('type', pa.string()),
+        ('country', pa.string()),
+        ('genres', pa.string()),
+        ('rating', pa.float64()),
+        ('watched_date', pa.string()),  # partial dates: '2023', '2023-05' or '2023-05-01'
+        ('note', pa.string()),
+    ])
+    total = write_record_batches(
+        cur, f"SELECT {', '.join(movie_schema.names)} FROM movie_detail",
+        movie_schema, movies_path, file_format, batch_size
+    )
+
+    genre_schema = pa.schema([('movie_id', pa.int64()), ('genre', pa.string())])
+    write_record_batches(cur, """
+        SELECT mg.movie_id, g.name
+        FROM movie_genre mg
+        JOIN genre g ON g.id = mg.genre_id
+        ORDER BY mg.movie_id, g.id
+    """, genre_schema, genres_path, file_format, batch_size)
+    return total
+
+def export_columnar(
+    con: sqlite3.Connection,
+    file_format: str = 'parquet',
+    folder: str | Path = COLUMNAR_FOLDER,
+    force: bool = False,
+) -> int | None:
+    """
+    Export movies to columnar files (see `write_columnar`) if the database changed since
+    their last export. Return the number of movies written, or None if already up to date.
+    """
+    from utils.changes import get_last_change, is_out_of_date, set_sync_seq
+
+    cur = con.cursor()
+    paths = get_columnar_paths(file_format, folder)
+    if not force and all(path.exists() for path in paths) and not is_out_of_date(cur, file_format):
+        return None
+
+    # Read the seq before the data: a change made in between is exported next time
+    seq = get_last_change(cur)
+    total = write_columnar(con, file_format, folder)
+    set_sync_seq(cur, file_format, seq)
+    con.commit()
+    return total
+
+class CsvWriteBehind:
+    """
+    Coalescing write-behind CSV export, for long-running processes (web app).
+
+    `schedule()` exports after `delay` seconds in a background thread,
+    writes scheduled while an export is pending are covered by that export.
+    """
+
+    def __init__(self, db_file: str | Path, path: str | Path = CSV_FILE, delay: float = 5.0):
+        self.db_file = db_file
+        self.path = path
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()  # one export at a time
+        self._timer = None
+
+    def schedule(self) -> None:
+        """Schedule an export, unless one is already pending."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Run the pending export now, if any."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            self._export()
+
+    def _run(self) -> None:
+        with self._lock:
+            self._timer = None
+        self._export()
+
+    def _export(self) -> None:
+        from utils.db import get_connection
+        with self._export_lock:
+            con = get_connection(self.db_file)
+            try:
+                export_csv(con, self.path)
+            finally:
+                con.close()
@@ -15,9 +15,13 @@ def get_file_size(file: str | Path) -> int:
 
     return file.stat().st_size
 
-def get_last_modified(file: Path) -> str:
+def get_last_modified(file: str | Path) -> str:
     """Return the last modified timestamp of a file."""
     from datetime import datetime
+
+    if isinstance(file, str):
+        file = Path(file)
+
     return f'{datetime.fromtimestamp(file.stat().st_mtime):%Y-%m-%d %X}'
 
 # if __name__ == '__main__':
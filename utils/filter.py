@@ -0,0 +1,167 @@
+import sqlite3
+import sys
+
+def parse_genres_filter(genres: str) -> tuple[list[list[str]], list[str]]:
+    """
+    Parse a genres filter expression into included groups and excluded genres.
+
+    Comma separates genres that must all match (AND), '|' separates
+    alternatives (OR), and a leading '-' excludes a genre (NOT).
+
+    Example:
+        >>> parse_genres_filter('romance|comedy, drama, -horror')
+        # ([['romance', 'comedy'], ['drama']], ['horror'])
+    """
+    from utils.format import format_genres
+
+    included = []
+    excluded = []
+    for term in format_genres(genres):
+        if term.startswith('-'):
+            excluded.extend(g.lstrip('-') for g in format_genres(term[1:].replace('|', ',')))
+        else:
+            included.append(format_genres(term.replace('|', ',')))
+    return included, excluded
+
+def resolve_genre(value: str, genre_map: dict[str, int]) -> int | None:
+    """
+    Resolve user input to a genre id: exact match, then prefix match.
+
+    Prefix matching is on full genre names, example: "com" -> "comedy"
+    (but not "dark comedy").
+    """
+    if value in genre_map:
+        return genre_map[value]
+
+    for genre, genre_id in genre_map.items():
+        if genre.startswith(value):
+            return genre_id
+
+    return None
+
+def get_genres_clause(genres: str, cur: sqlite3.Cursor) -> tuple[str, list]:
+    """
+    Build a WHERE clause (on movie id) for a genres filter expression,
+    see `parse_genres_filter` for the syntax.
+
+    Genres are resolved to ids and matched against the `movie_genre` posting lists,
+    AND groups are intersected and excluded genres are subtracted.
+    A group whose genres cannot be resolved matches nothing.
+    """
+    from utils.movie import get_genre_map
+
+    genre_map = get_genre_map(cur)
+
+    def resolve(values: list[str]) -> list[int]:
+        ids = []
+        for value in values:
+            genre_id = resolve_genre(value, genre_map)
+            if genre_id is None:
+                print(f'Genre {value!r} not found.', file=sys.stderr)  # keep stdout for data
+            else:
+                ids.append(genre_id)
+        return ids
+
+    included, excluded = parse_genres_filter(genres)
+    included_ids = [resolve(group) for group in included]
+    excluded_ids = resolve(excluded)
+    if not all(included_ids):
+        return '0', []  # always false
+
+    def posting_list(genre_ids: list[int]) -> str:
+        placeholders = ', '.join('?' for _ in genre_ids)
+        return f'SELECT movie_id FROM movie_genre WHERE genre_id IN ({placeholders})'
+
+    clause = []
+    parameters = []
+    if included_ids:
+        clause.append(
+            'id IN (' + ' INTERSECT '.join(posting_list(ids) for ids in included_ids) + ')'
+        )
+        parameters.extend(genre_id for ids in included_ids for genre_id in ids)
+    if excluded_ids:
+        clause.append(f'id NOT IN ({posting_list(excluded_ids)})')
+        parameters.extend(excluded_ids)
+
+    return ' AND '.join(clause), parameters
+
+def get_prefix_range(prefix: str) -> tuple[str, str]:
+    """
+    Return (low, high) such that `low <= value < high` matches the strings starting
+    with `prefix`, a range predicate can use an index where SUBSTR() can't.
+
+    Example:
+        >>> get_prefix_range('2023-05')
+        # ('2023-05', '2023-06')
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def get_filter_query(
+    cur: sqlite3.Cursor,
+    name: str | None = None,
+    year: int | None = None,
+    status: str | None = None,
+    movie_type: str | None = None,
+    country: str | None = None,
+    genres: str | None = None,
+    rating: int | None = None,
+    watched_year: str | None = None,
+    note_contains: str | None = None,
+    words: bool = False,
+) -> tuple[str, list]:
+    """
+    Build a parameterized SQL query for filtering movies.
+
+    `name` and `note_contains` are matched as substrings (case-insensitive),
+    or as words with `words` (see `utils.fts.to_word_query`).
+    """
+    from utils.fts import get_match_clause
+
+    clause = []
+    parameters = []
+
+    def add_clause(new_clause: tuple[str, list]) -> None:
+        clause.append(new_clause[0])
+        parameters.extend(new_clause[1])
+
+    if name:
+        add_clause(get_match_clause(name, 'name', words))
+    if year:
+        clause.append('year = ?')
+        parameters.append(year)
+    if status:
+        clause.append('status = ?')
+        parameters.append(status)
+    if movie_type:
+        clause.append('type = ?')
+        parameters.append(movie_type)
+    if country:
+        clause.append('country = ?')
+        parameters.append(country)
+    if genres:
+        genres_clause = get_genres_clause(genres, cur)
+        if genres_clause[0]:
+            add_clause(genres_clause)
+    if rating:
+        clause.append('rating = ?')
+        parameters.append(rating)
+    if watched_year:
+        watched_year = str(watched_year)
+        if len(watched_year) >= 4:
+            # Full year as a range on the watched_date index ('2023' <= date < '2024')
+            clause.append('watched_date >= ? AND watched_date < ?')
+            parameters.extend(get_prefix_range(watched_year))
+        else:
+            # Abbreviated year ('23') matches the end of the year, can't use the index
+            year_length = len(watched_year)
+            clause.append(f'substr(watched_date, {4 - year_length + 1}, {year_length}) = ?')
+            parameters.append(watched_year)
+    if note_contains:
+        add_clause(get_match_clause(note_contains, 'note', words))
+
+    select_clause = 'SELECT * FROM movie_detail'
+    if not clause:
+        return select_clause, parameters
+
+    where_clause = ' WHERE ' + ' AND '.join(clause)
+    return select_clause + where_clause, parameters
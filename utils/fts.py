@@ -0,0 +1,72 @@
+"""Full-text search (FTS5) query utilities, see `movie_fts` and `movie_fts_word` in schema.sql"""
+import re
+
+MIN_TRIGRAM_LENGTH = 3  # trigram index can't match shorter substrings
+
+def quote_phrase(text: str) -> str:
+    """Quote text as a FTS5 phrase, so special characters are matched literally."""
+    return '"' + text.replace('"', '""') + '"'
+
+def to_word_query(text: str) -> str:
+    """
+    Convert user input to a FTS5 query for the word index.
+
+    Words are matched as whole words, a trailing '*' makes a prefix query
+    and double quotes make a phrase query. All terms must match.
+
+    Example:
+        >>> to_word_query('harry pot* "half blood"')
+        # '"harry" "pot"* "half blood"'
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"\*?|(\S+)', text):
+        if word:
+            is_prefix = word.endswith('*')
+            word = word.rstrip('*')
+            if word:
+                terms.append(quote_phrase(word) + ('*' if is_prefix else ''))
+        elif phrase.strip():
+            terms.append(quote_phrase(phrase))
+    return ' '.join(terms)
+
+def get_match(text: str, column: str, words: bool = False) -> tuple[str, str] | None:
+    """
+    Return (fts_table, match_expression) to search `text` in `column`,
+    or None when the text is too short for the trigram index.
+    """
+    if words:
+        query = to_word_query(text)
+        return ('movie_fts_word', f'{column} : ({query})') if query else None
+
+    if len(text) < MIN_TRIGRAM_LENGTH:
+        return None
+    return 'movie_fts', f'{column} : {quote_phrase(text)}'
+
+def get_match_clause(text: str, column: str, words: bool = False) -> tuple[str, list]:
+    """
+    Build a WHERE clause (on movie id) matching `text` in `column`.
+
+    Substring matching uses the trigram index, falling back to LIKE
+    for text shorter than 3 characters. With `words`, matches words instead.
+    """
+    match = get_match(text, column, words)
+    if match is None:
+        return f'{column} LIKE ?', [f'%{text}%']
+
+    fts_table, expression = match
+    return f'id IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)', [expression]
+
+def get_search_query(keyword: str, column: str, words: bool = False) -> tuple[str, list]:
+    """Build a query searching `keyword` in `column`, ranked by relevance (bm25)."""
+    match = get_match(keyword, column, words)
+    if match is None:
+        return f"SELECT * FROM movie_detail WHERE {column} LIKE '%' || ? || '%'", [keyword]
+
+    fts_table, expression = match
+    query = (
+        f'SELECT d.* FROM {fts_table} f '
+        'JOIN movie_detail d ON d.id = f.rowid '
+        f'WHERE f.{fts_table} MATCH ? '
+        'ORDER BY f.rank'
+    )
+    return query, [expression]
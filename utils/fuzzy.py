@@ -1,6 +1,104 @@
+import sqlite3
+from collections.abc import Iterable
+from functools import lru_cache
+
+def get_trigrams(value: str) -> set[str]:
+    """
+    Return the character trigrams of a lowercased value, padded like pg_trgm so short
+    values and word starts have trigrams too: 'Up' -> {'  u', ' up', 'up '}.
+    """
+    padded = f'  {value.lower()} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class FuzzyIndex:
+    """
+    Trigram index over a set of choices, for ranked typo-tolerant lookups.
+
+    Choices are scored with the `difflib` ratio (the score of `get_close_matches`). Beyond
+    `max_scored` choices, only the `max_scored` sharing the most trigrams with the value
+    are scored, so lookups stay fast as the number of choices grows (a typo sharing no
+    trigram, e.g. in a very short value, is then not matched). Build it once per set.
+
+    Example:
+        >>> index = FuzzyIndex(['filter', 'search', 'stats'])
+        >>> index.get_matches('serch')
+        # ['search']
+    """
+
+    def __init__(self, choices: Iterable[str], max_scored: int = 50):
+        self.choices = list(dict.fromkeys(choices))  # unique, in order
+        self.max_scored = max_scored  # most trigram-similar choices scored per lookup
+        self._postings = {}  # trigram -> indexes of the choices having it
+        for i, choice in enumerate(self.choices):
+            for trigram in get_trigrams(choice):
+                self._postings.setdefault(trigram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def get_matches(self, value: str, n: int = 1, cutoff: float = 0.6) -> list[str]:
+        """Return up to `n` choices close to `value` (score >= `cutoff`), best first."""
+        from collections import Counter
+        from difflib import SequenceMatcher
+
+        if len(self.choices) <= self.max_scored:
+            candidates = range(len(self.choices))  # few choices: score all, like difflib
+        else:
+            shared = Counter()
+            for trigram in get_trigrams(value):
+                shared.update(self._postings.get(trigram, ()))
+            candidates = [i for i, _ in shared.most_common(self.max_scored)]
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(value)
+        scored = []
+        for i in candidates:
+            choice = self.choices[i]
+            matcher.set_seq1(choice)
+            if (
+                matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff
+                and (score := matcher.ratio()) >= cutoff
+            ):
+                scored.append((score, choice))
+
+        # Like get_close_matches: best score first, ties by choice (descending)
+        scored.sort(reverse=True)
+        return [choice for _, choice in scored[:n]]
+
+@lru_cache(maxsize=32)
+def get_fuzzy_index(choices: tuple[str, ...]) -> FuzzyIndex:
+    """Return the (cached) index of a set of choices."""
+    return FuzzyIndex(choices)
+
 def get_fuzzy_match(value: str, choices: list[str], n: int = 1) -> str | None:
     """Return the closest fuzzy match to `value` among `choices`."""
-    from difflib import get_close_matches
-
-    matches = get_close_matches(value, choices, n=n)
+    matches = get_fuzzy_index(tuple(choices)).get_matches(value, n=n)
     return matches[0] if matches else None
+
+_name_index = (None, None)  # (database and change seq, index of movie names)
+
+def get_database_key(cur: sqlite3.Cursor) -> tuple | sqlite3.Connection:
+    """
+    Return what identifies the database of `cur`: its file and modification time (a
+    re-imported file restarts the change seq), or the connection for an in-memory one.
+    """
+    import os
+    file = cur.execute("SELECT file FROM pragma_database_list WHERE name = 'main'").fetchone()[0]
+    if not file:
+        return cur.connection
+    try:
+        return file, os.stat(file).st_mtime_ns
+    except OSError:  # deleted while open
+        return file, None
+
+def get_name_index(cur: sqlite3.Cursor) -> FuzzyIndex:
+    """Return the index of all movie names, cached until the database or its movies change."""
+    from utils.changes import get_last_change
+    global _name_index
+
+    key = (get_database_key(cur), get_last_change(cur))
+    if _name_index[0] != key:
+        names = [name for (name,) in cur.execute('SELECT name FROM movie ORDER BY id')]
+        _name_index = (key, FuzzyIndex(names))
+    return _name_index[1]
@@ -19,6 +19,154 @@ def add_movie_genre(movie_id: int, genres: list[str], cur: sqlite3.Cursor) -> No
             (movie_id, genre_id)
         )
 
+def get_genre_map(cur: sqlite3.Cursor) -> dict[str, int]:
+    """Return a mapping of genre name to genre id."""
+    cur.execute("SELECT name, id FROM genre")
+    return dict(cur.fetchall())
+
+def get_or_add_genre_id(name: str, cur: sqlite3.Cursor, genre_map: dict[str, int]) -> int:
+    """Return the id of a genre, adding it if new. `genre_map` is the name -> id cache."""
+    genre_id = genre_map.get(name)
+    if genre_id is None:
+        cur.execute("INSERT INTO genre (name) VALUES (?)", (name,))
+        genre_id = genre_map[name] = cur.lastrowid
+    return genre_id
+
+def add_movies(
+    movies: list[tuple], cur: sqlite3.Cursor, genre_map: dict[str, int] | None = None
+) -> int:
+    """
+    Add many movies to the database with batched inserts, return the number of added movies.
+
+    Each movie is a tuple of
+    (name, year, status, type, country, genres, rating, watched_date, note),
+    with `genres` as a list of genre names and None for missing values.
+
+    `genre_map` (genre name -> id) is used as a cache and updated with new genres,
+    pass the same dict across batches to avoid re-reading the genre table.
+    """
+    if genre_map is None:
+        genre_map = get_genre_map(cur)
+
+    next_id = cur.execute("SELECT IFNULL(MAX(id), 0) + 1 FROM movie").fetchone()[0]
+    movie_rows = []
+    movie_genre_rows = []
+    for movie_id, movie in enumerate(movies, start=next_id):
+        name, year, status, movie_type, country, genres, rating, watched_date, note = movie
+        movie_rows.append(
+            (movie_id, name, year, status, movie_type, country, rating, watched_date, note)
+        )
+        for genre_name in genres:
+            movie_genre_rows.append((movie_id, get_or_add_genre_id(genre_name, cur, genre_map)))
+
+    cur.executemany("""
+        INSERT INTO movie (id, name, year, status, type, country, rating, watched_date, note)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, movie_rows)
+    cur.executemany(
+        "INSERT OR IGNORE INTO movie_genre (movie_id, genre_id) VALUES (?, ?)", movie_genre_rows
+    )
+    return len(movie_rows)
+
+# Columns of the movie table that can be updated (genres are in movie_genre)
+MOVIE_COLUMNS = ['name', 'year', 'status', 'type', 'country', 'rating', 'watched_date', 'note']
+MAX_PARAMETERS = 999  # SQLite variables per statement (lowest default limit)
+
+def to_genres(genres: str | list[str] | None) -> list[str]:
+    """Normalize genres from a comma-separated string or a list, None for no genres."""
+    from utils.format import format_genres
+    if genres is None:
+        return []
+    if isinstance(genres, str):
+        return format_genres(genres)
+    return [genre for g in genres if (genre := g.strip())]
+
+def to_db_value(field: str, value):
+    """Convert a value (possibly from pandas, e.g. NaN or numpy types) for a movie column."""
+    if value is None or (isinstance(value, float) and value != value):  # NaN
+        return None
+    if field == 'year':
+        return int(value)
+    if field == 'rating':
+        return float(value)
+    return value
+
+def to_movie_row(movie: dict) -> tuple:
+    """Convert a movie dict (as for `add_movie`) to a row tuple for `add_movies`."""
+    return (
+        *(to_db_value(field, movie[field]) for field in MOVIE_COLUMNS[:5]),
+        to_genres(movie['genres']),
+        *(to_db_value(field, movie[field]) for field in MOVIE_COLUMNS[5:]),
+    )
+
+def update_movies(
+    updates: dict[int, dict], cur: sqlite3.Cursor, genre_map: dict[str, int] | None = None
+) -> int:
+    """
+    Update many movies, return the number of updated movies.
+
+    `updates` maps movie id -> changed fields (like `update_movie`). Movies changing the
+    same set of fields are updated with one batched statement, genres are relinked in bulk.
+    """
+    # Group by set of changed fields, so each group is a single executemany
+    groups = {}
+    new_genres = {}
+    for movie_id, changes in updates.items():
+        changes = dict(changes)
+        if 'genres' in changes:
+            new_genres[movie_id] = to_genres(changes.pop('genres'))
+
+        unknown = changes.keys() - set(MOVIE_COLUMNS)
+        if unknown:
+            raise ValueError(f'Unknown movie fields: {sorted(unknown)}')
+
+        if changes:
+            fields = tuple(sorted(changes))
+            values = [to_db_value(field, changes[field]) for field in fields]
+            groups.setdefault(fields, []).append((*values, movie_id))
+
+    for fields, rows in groups.items():
+        placeholders = ', '.join(f'{field} = ?' for field in fields)
+        cur.executemany(f"UPDATE movie SET {placeholders} WHERE id = ?", rows)
+
+    if new_genres:
+        relink_genres(new_genres, cur, genre_map)
+
+    return len(updates)
+
+def relink_genres(
+    movie_genres: dict[int, list[str]], cur: sqlite3.Cursor,
+    genre_map: dict[str, int] | None = None
+) -> None:
+    """Replace the genres of many movies (movie id -> genre names)."""
+    if genre_map is None:
+        genre_map = get_genre_map(cur)
+
+    movie_ids = list(movie_genres)
+    for i in range(0, len(movie_ids), MAX_PARAMETERS):
+        chunk = movie_ids[i:i + MAX_PARAMETERS]
+        cur.execute(
+            f"DELETE FROM movie_genre WHERE movie_id IN ({', '.join('?' * len(chunk))})", chunk
+        )
+
+    cur.executemany(
+        "INSERT OR IGNORE INTO movie_genre (movie_id, genre_id) VALUES (?, ?)",
+        [
+            (movie_id, get_or_add_genre_id(genre_name, cur, genre_map))
+            for movie_id, genres in movie_genres.items()
+            for genre_name in genres
+        ]
+    )
+
+def delete_movies(movie_ids: list[int], cur: sqlite3.Cursor) -> int:
+    """Delete many movies by id, return the number of deleted movies."""
+    deleted = 0
+    for i in range(0, len(movie_ids), MAX_PARAMETERS):
+        chunk = movie_ids[i:i + MAX_PARAMETERS]
+        cur.execute(f"DELETE FROM movie WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        deleted += cur.rowcount
+    return deleted
+
 def add_movie(movie: dict, cur: sqlite3.Cursor) -> None:
     """Add a movie to the database."""
 
@@ -63,7 +211,7 @@ def update_movie(movie_id: int, updated_data: dict, cur: sqlite3.Cursor) -> None
         cur.execute("DELETE FROM movie_genre WHERE movie_id = ?", (movie_id,)) # remove old relations
         add_movie_genre(movie_id, genres, cur)
 
-def load_movies(con: sqlite3.Connection, with_index: bool = False):
+def load_movies(con: sqlite3.Connection, with_index: bool = False, compact: bool = False):
     """
     Load movies data from the database, return as a pandas DataFrame.
     Parameters:
@@ -71,13 +219,48 @@ def load_movies(con: sqlite3.Connection, with_index: bool = False):
         with_index (bool, optional): 
             If True, set the 'id' column as the DataFrame index. 
             Defaults to False.
+        compact (bool, optional):
+            If True, use memory-efficient dtypes, see `compact_movies`.
+            Defaults to False.
     """
     import pandas as pd
 
     if with_index:
-        return pd.read_sql_query( "SELECT * FROM movie_detail", con, index_col='id')
+        df = pd.read_sql_query( "SELECT * FROM movie_detail", con, index_col='id')
+    else:
+        df = pd.read_sql_query("SELECT * FROM movie_detail", con)
+
+    return compact_movies(df) if compact else df
+
+# Repeated values: stored once as categories, rows keep small integer codes
+CATEGORICAL_COLUMNS = ['status', 'type', 'country', 'genres', 'watched_date']
+
+def compact_movies(df):
+    """
+    Return the movies DataFrame with memory-efficient dtypes (several times smaller):
+
+    - status, type, country, genres and watched_date as categoricals,
+      watched_date keeps its partial date strings ('2023', '2023-05', '2023-05-01')
+    - year as nullable Int16, rating as nullable Int8 (Float32 for half ratings)
+    - name and note as Arrow strings if pyarrow is installed
+    """
+    import pandas as pd
+
+    df = df.astype({column: 'category' for column in CATEGORICAL_COLUMNS})
+    df['year'] = df['year'].astype('Int16')
+    df['rating'] = df['rating'].astype(get_rating_dtype(df['rating']))
+
+    try:
+        import pyarrow  # noqa: F401
+        df = df.astype({'name': 'string[pyarrow]', 'note': 'string[pyarrow]'})
+    except ImportError:
+        pass
+
+    return df
 
-    return pd.read_sql_query("SELECT * FROM movie_detail", con)
+def get_rating_dtype(rating) -> str:
+    """Return the compact dtype of a ratings Series: Int8, or Float32 if there are half ratings."""
+    return 'Int8' if (rating.dropna() % 1 == 0).all() else 'Float32'
 
 def get_movie(movie_id: int, cur: sqlite3.Cursor) -> tuple | None:
     """Get movie information by id. Return a tuple or None if not found."""
@@ -0,0 +1,115 @@
+"""Shared SQLite connections for multi-threaded use (web app sessions)"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+def configure_connection(con: sqlite3.Connection, pragmas: dict) -> None:
+    """Apply connection-level pragmas, e.g. `{'busy_timeout': 5000}`."""
+    for name, value in pragmas.items():
+        con.execute(f'PRAGMA {name} = {value}')
+
+class ConnectionPool:
+    """
+    Up to `max_readers` read-only connections (default: DB_MAX_READERS, see
+    `get_read_connection`), checked out by `read()` and returned to the pool after use,
+    and a single write connection guarded by a lock. Threads come and go (Streamlit
+    reruns), the connections stay, a read waits while all readers are in use.
+
+    The database is switched to `journal_mode` (WAL by default, persistent in the file)
+    so readers don't block the writer nor each other, and `busy_timeout` (see `DB_PRAGMAS`)
+    waits for locks instead of failing.
+
+    Example:
+        >>> pool = ConnectionPool('data/movies.db')
+        >>> with pool.read() as con:
+        ...     df = load_movies(con)
+        >>> with pool.write() as con:  # commits, or rolls back on error
+        ...     add_movie(movie, con.cursor())
+    """
+
+    def __init__(
+        self,
+        db_file: str,
+        pragmas: dict | None = None,
+        journal_mode: str | None = None,
+        max_readers: int | None = None,
+    ):
+        from utils.constants import DB_PRAGMAS, DB_READ_PRAGMAS, DB_JOURNAL_MODE, DB_MAX_READERS
+        from utils.db import get_connection
+
+        self.db_file = db_file
+        self.pragmas = DB_PRAGMAS if pragmas is None else pragmas
+        # Readers: the read defaults win over the writer defaults, explicit pragmas over both
+        self.read_pragmas = DB_PRAGMAS | DB_READ_PRAGMAS | (pragmas or {})
+        self.max_readers = DB_MAX_READERS if max_readers is None else max_readers
+        self._readers = queue.LifoQueue()  # idle readers, the most recently used first
+        self._reader_count = 0
+        self._write_lock = threading.Lock()
+        self._connections_lock = threading.Lock()
+        self._connections = []
+
+        # The writer is created first so the schema is migrated before any read
+        self._writer = get_connection(db_file, check_same_thread=False)
+        self._writer.execute(f'PRAGMA journal_mode = {journal_mode or DB_JOURNAL_MODE}')
+        configure_connection(self._writer, self.pragmas)
+        self._connections.append(self._writer)
+
+    def _get_reader(self) -> sqlite3.Connection:
+        """Check out an idle reader, open one below `max_readers`, else wait for one."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._connections_lock:
+            can_open = self._reader_count < self.max_readers
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            return self._readers.get()
+
+        from utils.db import get_read_connection
+        try:
+            con = get_read_connection(  # closed by close()
+                self.db_file, pragmas=self.read_pragmas, check_same_thread=False
+            )
+        except BaseException:
+            with self._connections_lock:
+                self._reader_count -= 1
+            raise
+        with self._connections_lock:
+            self._connections.append(con)
+        return con
+
+    @contextmanager
+    def read(self):
+        """
+        Yield a read connection, returned to the pool on exit. Nested reads of a thread
+        take another one, more than `max_readers` at once wait.
+        """
+        con = self._get_reader()
+        try:
+            yield con
+        finally:
+            if con.in_transaction:
+                con.rollback()  # don't keep an old snapshot of the database open
+            self._readers.put(con)
+
+    @contextmanager
+    def write(self):
+        """Yield the write connection, commit on success and roll back on error."""
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def close(self) -> None:
+        """Close all connections."""
+        with self._write_lock, self._connections_lock:
+            for con in self._connections:
+                con.close()
+            self._connections.clear()
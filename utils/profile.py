@@ -0,0 +1,120 @@
+"""
+Query profiling: per-statement timing, rows and query plan (CLI `--profile` flag).
+
+`fetch_rows`, `fetch_scalar` and `run_sql` report to the active profiler,
+profiling is off (a single None check) unless `start_profiling()` was called.
+"""
+import re
+import sqlite3
+from time import perf_counter
+
+_profiler = None
+
+class Profiler:
+    """Collect profiled statements and steps, in execution order."""
+
+    def __init__(self):
+        self.records = []
+
+    def record_query(
+        self, cur: sqlite3.Cursor, query: str, parameters, elapsed: float, rows: int
+    ) -> None:
+        con = getattr(cur, 'connection', cur)  # a connection can be passed as cursor
+        plan = explain_query_plan(con, query, parameters)
+        self.records.append({
+            'kind': 'query',
+            'query': one_line(query),
+            'parameters': list(parameters) if parameters else [],
+            'ms': round(elapsed * 1000, 3),
+            'rows': rows,
+            'plan': plan,
+            'warnings': [detail for detail in plan if is_slow_step(detail)],
+        })
+
+    def record_step(self, name: str, elapsed: float, rows: int) -> None:
+        """Record a Python processing step, like sorting rows."""
+        self.records.append({
+            'kind': 'step', 'name': name, 'ms': round(elapsed * 1000, 3), 'rows': rows
+        })
+
+    def total_ms(self) -> float:
+        return round(sum(record['ms'] for record in self.records), 3)
+
+    def to_dict(self) -> dict:
+        return {'total_ms': self.total_ms(), 'records': self.records}
+
+    def format(self) -> str:
+        """Return a plain text report, slow plan steps are marked with '!'."""
+        lines = [f'Profile: {len(self.records)} records, {self.total_ms():.2f} ms']
+        for i, record in enumerate(self.records, 1):
+            label = record['query'] if record['kind'] == 'query' else f"[{record['name']}]"
+            lines.append(f"{i:>3}. {record['ms']:>9.2f} ms {record['rows']:>8} rows  {label}")
+            for detail in record.get('plan', []):
+                mark = '!' if is_slow_step(detail) else ' '
+                lines.append(f'{"":>6}{mark} {detail}')
+        return '\n'.join(lines)
+
+def one_line(query: str) -> str:
+    """Return the query on one line, without comments (for display)."""
+    return ' '.join(re.sub(r'--[^\n]*', '', query).split())
+
+def explain_query_plan(con: sqlite3.Connection, query: str, parameters=None) -> list[str]:
+    """Return the steps of the query plan, indented by depth."""
+    try:
+        rows = con.execute(f'EXPLAIN QUERY PLAN {query}', parameters or ()).fetchall()
+    except sqlite3.Error:
+        return []  # e.g. pragmas can't be explained
+
+    # Rows are (id, parent, notused, detail)
+    depths = {0: -1}
+    plan = []
+    for step_id, parent, _, detail in rows:
+        depths[step_id] = depths.get(parent, -1) + 1
+        plan.append('  ' * depths[step_id] + detail)
+    return plan
+
+def is_slow_step(detail: str) -> bool:
+    """Return True for full table scans and temporary B-trees (sort, distinct, group by)."""
+    detail = detail.strip()
+    if 'USE TEMP B-TREE' in detail:
+        return True
+    # Virtual tables (FTS) and constant rows are not table scans
+    return detail.startswith('SCAN ') and 'VIRTUAL TABLE' not in detail \
+        and detail != 'SCAN CONSTANT ROW'
+
+def start_profiling() -> Profiler:
+    """Start recording, return the profiler."""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+def stop_profiling() -> Profiler | None:
+    """Stop recording, return the profiler (None if not profiling)."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+def get_profiler() -> Profiler | None:
+    """Return the active profiler, None if not profiling."""
+    return _profiler
+
+class profile_step:
+    """
+    Time a block as a profiling step, does nothing when not profiling.
+
+    Example:
+        >>> with profile_step('sort', len(rows)):
+        ...     rows.sort()
+    """
+
+    def __init__(self, name: str, rows: int = 0):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.tic = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _profiler is not None:
+            _profiler.record_step(self.name, perf_counter() - self.tic, self.rows)
@@ -0,0 +1,129 @@
+"""
+Warm server mode for the CLI: one process keeps the connection (with its prepared
+statements) and imported modules, and runs read commands sent over a Unix socket.
+
+Protocol: one JSON line per connection each way.
+    request:  {"argv": [...], "tty": bool, "width": int | null}
+    response: {"output": str, "exit_code": int} or {"forward": false} when
+              the command must run in the client (writes, like `stats --recompute`,
+              interactive prompts)
+"""
+import io
+import json
+import os
+import socket
+import socketserver
+from contextlib import redirect_stdout, redirect_stderr, contextmanager
+
+import click
+
+# Read-only, non-interactive commands
+SERVER_COMMANDS = {'filter', 'get', 'search', 'sql', 'stats', 'recent', 'latest'}
+# Options that make them write, run in the client
+WRITE_OPTIONS = {'stats': {'--recompute'}}
+
+class CapturedOutput(io.StringIO):
+    """Captured stdout that reports the client's terminal, so Rich renders for it."""
+
+    def __init__(self, tty: bool = False):
+        super().__init__()
+        self.tty = tty
+
+    def isatty(self) -> bool:
+        return self.tty
+
+@contextmanager
+def set_environ(**values: str):
+    """Temporarily set environment variables."""
+    old_values = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in old_values.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def resolve_command_name(group: click.Group, argv: list[str]) -> str | None:
+    """Return the full name of the command in argv (aliases resolved), or None."""
+    if not argv or argv[0].startswith('-'):
+        return None
+
+    with redirect_stdout(io.StringIO()):  # discard alias match messages
+        try:
+            command = group.get_command(click.Context(group), argv[0])
+        except click.UsageError:
+            return None
+    return command.name if command else None
+
+def run_command(
+    group: click.Group, argv: list[str], tty: bool = False, width: int | None = None
+) -> tuple[str, int]:
+    """Run a CLI command in this process, return its output and exit code."""
+    output = CapturedOutput(tty)
+    environ = {'COLUMNS': str(width)} if width else {}
+
+    with redirect_stdout(output), redirect_stderr(output), set_environ(**environ):
+        try:
+            group.main(args=argv, prog_name='cli.py', standalone_mode=False)
+            exit_code = 0
+        except click.ClickException as e:
+            e.show(file=output)
+            exit_code = e.exit_code
+        except click.exceptions.Exit as e:
+            exit_code = e.exit_code
+        except click.Abort:
+            print('Aborted!')
+            exit_code = 1
+        except Exception as e:
+            print(f'Exception: {e}')
+            exit_code = 1
+
+    return output.getvalue(), exit_code
+
+def handle_request(group: click.Group, request: dict) -> dict:
+    """Handle a decoded request, return the response."""
+    argv = request.get('argv', [])
+    name = resolve_command_name(group, argv)
+    if name not in SERVER_COMMANDS or WRITE_OPTIONS.get(name, set()) & set(argv[1:]):
+        return {'forward': False}
+
+    output, exit_code = run_command(
+        group, argv, tty=request.get('tty', False), width=request.get('width')
+    )
+    return {'output': output, 'exit_code': exit_code}
+
+def is_running(socket_path: str) -> bool:
+    """Return True if a server is listening on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+            return True
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+
+def serve(group: click.Group, socket_path: str) -> None:
+    """Serve CLI commands on a Unix socket until interrupted."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            response = handle_request(group, request)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+    if is_running(socket_path):
+        raise RuntimeError(f'A server is already running on {socket_path}')
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # stale socket from a server that didn't exit cleanly
+
+    # Requests are handled one at a time, in the thread that owns the connection
+    with socketserver.UnixStreamServer(socket_path, Handler) as server:
+        print(f'Serving on {socket_path}, press Ctrl+C to stop.')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print('Stopped.')
+        finally:
+            os.unlink(socket_path)
@@ -1,3 +1,6 @@
+import re
+import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from utils.fuzzy import get_fuzzy_match
 
@@ -37,7 +40,99 @@ def resolve_sql_path(
 
     return None, None
 
+# Named parameters (`:name`), string literals and comments are matched to be skipped
+SQL_TOKEN = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/|(?<![:\w]):([A-Za-z_]\w*)", re.DOTALL)
+
+def get_named_parameters(query: str) -> list[str]:
+    """Return the named parameters (`:name`) of a query, in order of first use."""
+    names = [match.group(1) for match in SQL_TOKEN.finditer(query) if match.group(1)]
+    return list(dict.fromkeys(names))
+
+class Script:
+    """
+    A SQL script file and its named parameters (`:name`).
+
+    Parameters not given are bound to NULL, so a script can default them with
+    `COALESCE(:month, ...)`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.stem
+        self.mtime_ns = path.stat().st_mtime_ns
+        self.query = path.read_text()
+        self.parameters = get_named_parameters(self.query)
+
+    def bind(self, values: dict[str, str]) -> dict[str, str | None]:
+        """Return the parameters to run the script with, raise ValueError for unknown names."""
+        unknown = values.keys() - set(self.parameters)
+        if unknown:
+            accepted = ', '.join(self.parameters) or 'none'
+            raise ValueError(
+                f"Unknown parameter(s) {', '.join(sorted(unknown))} for {self.name!r}, "
+                f"accepted: {accepted}"
+            )
+        return {name: values.get(name) for name in self.parameters}
+
+class ScriptRegistry:
+    """
+    SQL scripts of a folder, cached for repeated runs (e.g. the warm server):
+    the listing is re-read when the folder changes, a script when its file changes
+    (mtime), and filename resolution is kept until the listing changes.
+
+    Example:
+        >>> registry = get_script_registry('sql')
+        >>> name, match_type = registry.resolve('thism')
+        >>> script = registry.get(name)
+        >>> run_sql(cur, script.query, parameters=script.bind({'month': '2025-03'}))
+    """
+
+    def __init__(self, folder: str | Path):
+        self.folder = Path(folder)
+        self._names = []
+        self._folder_mtime_ns = None
+        self._resolved = {}  # filename input -> (name, match type)
+        self._scripts = {}  # name -> Script
+
+    def list(self) -> list[str]:
+        """Return the script names (see `list_sql_files`)."""
+        mtime_ns = self.folder.stat().st_mtime_ns  # changes when files are added or removed
+        if mtime_ns != self._folder_mtime_ns:
+            self._names = list_sql_files(self.folder)
+            self._folder_mtime_ns = mtime_ns
+            self._resolved.clear()
+        return self._names
+
+    def resolve(self, filename: str) -> tuple[str | None, str | None]:
+        """Return (script name, match type) of a filename input, see `resolve_sql_path`."""
+        names = self.list()
+        if filename not in self._resolved:
+            path, match_type = resolve_sql_path(filename, self.folder, names)
+            self._resolved[filename] = (path.stem if path else None, match_type)
+        return self._resolved[filename]
+
+    def get(self, name: str) -> Script:
+        """Return a script by name, re-read if its file changed."""
+        path = self.folder / f'{name}.sql'
+        script = self._scripts.get(name)
+        if script is None or script.mtime_ns != path.stat().st_mtime_ns:
+            script = self._scripts[name] = Script(path)
+        return script
+
+_registries = {}
+
+def get_script_registry(folder: str | Path = 'sql') -> ScriptRegistry:
+    """Return the (process-wide) script registry of a folder."""
+    folder = Path(folder)
+    if folder not in _registries:
+        _registries[folder] = ScriptRegistry(folder)
+    return _registries[folder]
+
 from datetime import datetime
+
+# Shapes that strptime can parse as '%Y', '%Y-%m' or '%Y-%m-%d' (it is slow to fail)
+DATE_SHAPE = re.compile(r'\d{4}(?:-\d{1,2}(?:-[ \d]?\d)?)?')
+
 def parse_sort_column(value):
     """
     Normalize a value into a sortable key.
@@ -70,12 +165,13 @@ def parse_sort_column(value):
                 pass
 
         # Dates string
-        for format in ('%Y', '%Y-%m', '%Y-%m-%d'):
-            try:
-                datetime.strptime(value, format)
-                return (2, value)
-            except ValueError:
-                continue
+        if DATE_SHAPE.fullmatch(value):
+            for format in ('%Y', '%Y-%m', '%Y-%m-%d'):
+                try:
+                    datetime.strptime(value, format)
+                    return (2, value)
+                except ValueError:
+                    continue
         
     # Fallback: regular string
     return (3, value.lower())
@@ -100,46 +196,197 @@ def run_sql(
         note: If True, include the 'note' column in the output. If False, hide it.
         sort: Optional tuple (column_name, order) specifying a sorting instruction.
               Order can be one of: 'asc', 'a', '+', 'desc', 'd', '-'.
+              Done in SQL (see `push_down_sort`), in Python if the query can't be wrapped.
     """
     from utils.db import fetch_rows
+    from utils.profile import profile_step
+
+    python_sort = None
+    if sort:
+        query, python_sort = push_down_sort(cur, query, parameters, sort, note=note)
 
     if parameters:
         rows, column_names = fetch_rows(cur, query, parameters)
     else:
         rows, column_names = fetch_rows(cur, query)
 
-    rows = [list(row) for row in rows]  # convert tuple to list
+    with profile_step('run_sql: transform', len(rows)):
+        rows, column_names = transform_rows(rows, column_names, note=note)
+        rows = list(rows)
+
+    # Sorting
+    if python_sort:
+        resolved = resolve_sort(python_sort, column_names)
+        if resolved:
+            sort_column, descending = resolved
+            with profile_step('run_sql: sort', len(rows)):
+                sort_rows(rows, column_names.index(sort_column), descending)
+
+    return rows, column_names
 
-    # Convert rating to int if present
-    if 'rating' in column_names:
-        col_idx = column_names.index('rating')
+def resolve_sort(sort: tuple[str, str], column_names: list[str]) -> tuple[str, bool] | None:
+    """
+    Resolve a (column, order) sort instruction to (column name, descending),
+    None if the column is not found. The column is matched exactly, then fuzzily.
+    """
+    sort_column, sort_order = sort
+    if sort_column in column_names:
+        matched_column = sort_column
+    else:
+        matched_column = get_fuzzy_match(sort_column, column_names)
+    if not matched_column:
+        print(f'Column {sort_column!r} not found. Skipping sort.', file=sys.stderr)
+        return None
+
+    descending_aliases = {'desc', 'd', '-'}
+    descending = sort_order in descending_aliases
+
+    valid_orders = descending_aliases | {'asc', 'a', '+'}
+    if sort_order not in valid_orders:
+        print(f'Invalid sort order {sort_order!r}. Using ascending.', file=sys.stderr)
+
+    return matched_column, descending
+
+def sort_rows(rows: list[list], col_idx: int, descending: bool = False) -> None:
+    """Sort rows in place by a column with `parse_sort_column`, parsed once per distinct value."""
+    keys = {value: parse_sort_column(value) for value in {row[col_idx] for row in rows}}
+    rows.sort(key=lambda row: keys[row[col_idx]], reverse=descending)
+
+ORDER_BY = re.compile(r'\bORDER\s+BY\b', re.IGNORECASE)
+
+def strip_query(query: str) -> str:
+    """Return the query without surrounding whitespace and final semicolon, for wrapping."""
+    return re.sub(r';\s*(--[^\n]*\s*)*$', '', query.strip())
+
+def get_query_columns(cur, query: str, parameters: tuple | None = None) -> list[str] | None:
+    """Return the column names of a query wrapped as a subquery, None if it can't be wrapped."""
+    import sqlite3
+    try:
+        # LIMIT 0 stops before reading any row
+        cur.execute(f'SELECT * FROM (\n{strip_query(query)}\n) LIMIT 0', parameters or ())
+    except sqlite3.Error:
+        return None  # e.g. several statements or not a SELECT
+    return [d[0] for d in cur.description]
+
+def get_order_by(column: str, descending: bool = False) -> str:
+    """
+    Return ORDER BY terms sorting a column like `parse_sort_column`: numbers, percentages
+    ('85%'), dates ('YYYY', 'YYYY-MM', 'YYYY-MM-DD'), then other strings case-insensitively,
+    None last (first when descending, like a reversed Python sort).
+
+    Only zero-padded dates are recognized and case folding is ASCII only (SQLite `lower`),
+    the formats stored and computed by this app.
+    """
+    c = '"' + column.replace('"', '""') + '"'
+    is_number = f"typeof({c}) IN ('integer', 'real')"
+    percent = f"rtrim({c}, '%')"
+    is_percent = (
+        f"{c} GLOB '*[0-9]%' AND trim({percent}) NOT GLOB '*[^0-9.eE+-]*'"
+    )
+    # GLOB first, date() is slower: it validates the month and day (a modifier
+    # normalizes days past the end of the month, so '2023-02-30' doesn't round-trip)
+    is_date = (
+        f"({c} GLOB '[0-9][0-9][0-9][0-9]' AND {c} <> '0000' "
+        f"OR {c} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]' "
+        f"AND date({c} || '-01', '+0 days') = {c} || '-01' "
+        f"OR {c} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]' "
+        f"AND date({c}, '+0 days') = {c})"
+    )
+
+    sort_class = f"""CASE
+        WHEN {c} IS NULL THEN 4
+        WHEN {is_number} THEN 0
+        WHEN {is_percent} THEN 1
+        WHEN {is_date} THEN 2
+        ELSE 3
+    END"""
+    sort_value = f"""CASE
+        WHEN {is_number} THEN {c}
+        WHEN {is_percent} THEN CAST({percent} AS REAL)
+        WHEN {is_date} THEN {c}
+        ELSE lower({c})
+    END"""
+
+    order = ' DESC' if descending else ''
+    return f'{sort_class}{order}, {sort_value}{order}'
+
+def push_down_sort(
+    cur, query: str, parameters: tuple | None, sort: tuple[str, str], note: bool = False
+) -> tuple[str, tuple[str, str] | None]:
+    """
+    Add a `run_sql` sort to the query as an ORDER BY over the query wrapped as a subquery.
+    Return the query and the sort left to do in Python: `sort` if the query can't be
+    wrapped, None when it is done in SQL or skipped (column not found).
+    """
+    column_names = get_query_columns(cur, query, parameters)
+    if column_names is None or len(set(column_names)) < len(column_names):
+        return query, sort  # duplicate names can't be selected back from the subquery
+
+    # Hidden note can't be sorted by (like in Python, after `transform_rows`)
+    shown_names = [name for name in column_names if note or name != 'note']
+    resolved = resolve_sort(sort, shown_names)
+    if resolved is None:
+        return query, None
+
+    sort_column, descending = resolved
+    order_by = get_order_by(sort_column, descending)
+    query = strip_query(query)
+    if not ORDER_BY.search(query):
+        # The query's row order is unspecified anyway, no tiebreaker needed
+        return f'SELECT * FROM (\n{query}\n)\nORDER BY {order_by}', None
+
+    # The outer ORDER BY makes SQLite drop the query's own, so for ties to keep the
+    # query's order (like a stable Python sort), rows are numbered in that order first
+    columns = ', '.join('"' + name.replace('"', '""') + '"' for name in column_names)
+    sorted_query = (
+        f'SELECT {columns} FROM (\n'
+        f'SELECT *, ROW_NUMBER() OVER () AS query_row FROM (\n{query}\n)\n'
+        f')\nORDER BY {order_by}, query_row'
+    )
+    return sorted_query, None
+
+def transform_rows(
+    rows: Iterable[tuple], column_names: list[str], note: bool = False
+) -> tuple[Iterator[list], list[str]]:
+    """
+    Lazily transform query rows for display: convert 'rating' to int,
+    hide the 'note' column unless `note` is True.
+    Return the transformed rows iterator and the displayed column names.
+    """
+    rating_idx = column_names.index('rating') if 'rating' in column_names else None
+    note_idx = column_names.index('note') if not note and 'note' in column_names else None
+
+    def generate_rows():
         for row in rows:
-            if row[col_idx] is not None:
-                row[col_idx] = int(row[col_idx])
+            row = list(row)
+            if rating_idx is not None and row[rating_idx] is not None:
+                row[rating_idx] = int(row[rating_idx])
+            if note_idx is not None:
+                del row[note_idx]
+            yield row
 
-    # Hide note column
-    if not note and 'note' in column_names:
-        rows = [row[:-1] for row in rows]  # assume 'note' always the last column
-        column_names.remove('note')
+    displayed_names = [name for i, name in enumerate(column_names) if i != note_idx]
+    return generate_rows(), displayed_names
+
+def iter_sql(
+    cur,
+    query: str,
+    parameters: tuple | None = None,
+    note: bool = False,
+    sort: tuple[str, str] | None = None
+) -> tuple[Iterator[list], list[str]]:
+    """
+    Streaming version of `run_sql`: rows are fetched in batches and transformed
+    as they are consumed, return the rows iterator and column names.
+    Sorting in SQL keeps streaming, a Python sort (see `run_sql`) loads all rows first.
+    """
+    from utils.db import iter_rows
 
-    # Sorting
     if sort:
-        sort_column, sort_order = sort
-        matched_column = get_fuzzy_match(sort_column, column_names)
-        if not matched_column:
-            print(f'Column {sort_column!r} not found. Skipping sort.')
-        else:
-            descending_aliases = {'desc', 'd', '-'}
-            descending = sort_order in descending_aliases
-
-            valid_orders = descending_aliases | {'asc', 'a', '+'}
-            if sort_order not in valid_orders:
-                print(f'Invalid sort order {sort_order!r}. Using ascending.')
-
-            col_idx = column_names.index(matched_column)
-            rows.sort(
-                key=lambda row: parse_sort_column(row[col_idx]), 
-                reverse=descending
-            )
+        query, python_sort = push_down_sort(cur, query, parameters, sort, note=note)
+        if python_sort:
+            rows, column_names = run_sql(cur, query, parameters, note=note, sort=python_sort)
+            return iter(rows), column_names
 
-    return rows, column_names
\ No newline at end of file
+    rows, column_names = iter_rows(cur, query, parameters)
+    return transform_rows(rows, column_names, note=note)
@@ -0,0 +1,85 @@
+"""Statistics summary tables, see `movie_stats` and `genre_stats` in schema.sql"""
+import sqlite3
+
+STATS_TABLES = {
+    'movie_stats': ['status', 'type', 'country', 'watched_year', 'rating'],
+    'genre_stats': ['genre_id', 'status', 'rating'],
+}
+
+def get_summary(cur: sqlite3.Cursor) -> tuple[int, float | None]:
+    """Return the total number of movies and their average rating (rounded to 2 decimals)."""
+    return cur.execute("""
+        SELECT
+            IFNULL(SUM(count), 0),
+            ROUND(SUM(rating * count) / SUM(CASE WHEN rating IS NOT NULL THEN count END), 2)
+        FROM movie_stats
+    """).fetchone()
+
+# Scripts shown by `stats`, and the ones added by `stats --verbose`
+STATS_SCRIPTS = ['status', 'type', 'country']
+VERBOSE_STATS_SCRIPTS = ['watchedyear', 'rating', 'genres']
+
+def collect_stats(
+    con: sqlite3.Connection, scripts: list[str], folder: str = 'sql'
+) -> tuple[tuple[int, float | None, int], list[tuple[str, list[tuple] | None, list[str] | None]]]:
+    """
+    Return ((total, average rating, genre count), [(script, rows, column names)]) read in
+    one transaction, so all of them describe the same snapshot even during writes.
+    Scripts are run in the given order, rows and column names are None for a missing script.
+    """
+    from utils.db import fetch_rows
+    from utils.sql import get_script_registry
+
+    registry = get_script_registry(folder)
+    cur = con.cursor()
+    began = not con.in_transaction
+    if began:
+        cur.execute('BEGIN')
+    try:
+        total, avg_rating = get_summary(cur)
+        genres_count = cur.execute('SELECT COUNT(*) FROM genre').fetchone()[0]
+        results = []
+        for name in scripts:
+            try:
+                script = registry.get(name)
+            except FileNotFoundError:
+                results.append((name, None, None))
+                continue
+            results.append((name, *fetch_rows(cur, script.query)))
+    finally:
+        if began:
+            con.commit()
+    return (total, avg_rating, genres_count), results
+
+def read_stats(cur: sqlite3.Cursor, table: str) -> dict[tuple, int]:
+    """Return the rows of a summary table as {grouped values: count}."""
+    columns = STATS_TABLES[table]
+    cur.execute(f"SELECT {', '.join(columns)}, count FROM {table}")
+    return {tuple(row[:-1]): row[-1] for row in cur.fetchall()}
+
+def recompute_stats(con: sqlite3.Connection) -> dict[str, int]:
+    """
+    Rebuild the summary tables from the movie tables, in one transaction.
+    Return {table: number of rows that differed}, all 0 when the triggers kept them current.
+    """
+    from utils.db import SCHEMA_FILE
+
+    cur = con.cursor()
+    old_stats = {table: read_stats(cur, table) for table in STATS_TABLES}
+
+    # schema.sql backfills the emptied tables, in the same transaction so readers
+    # never see them empty (executescript commits first, so BEGIN is in the script)
+    with open(SCHEMA_FILE, 'r') as f:
+        schema = f.read()
+    deletes = ''.join(f'DELETE FROM {table};\n' for table in STATS_TABLES)
+    try:
+        con.executescript(f'BEGIN;\n{deletes}{schema}\nCOMMIT;')
+    except sqlite3.Error:
+        con.rollback()
+        raise
+
+    differences = {}
+    for table, old in old_stats.items():
+        new = read_stats(cur, table)
+        differences[table] = sum(old.get(key) != new.get(key) for key in old.keys() | new.keys())
+    return differences
@@ -1,35 +1,85 @@
 import streamlit as st
 import pandas as pd
 
-@st.cache_data
+@st.cache_resource
+def get_pool():
+    """Shared connections for all sessions: a few read connections and one writer."""
+    from utils.pool import ConnectionPool
+    return ConnectionPool('data/movies.db')
+
+@st.cache_resource
+def get_movie_cache():
+    """Movies shared by all sessions, refreshed by delta from the change log."""
+    from utils.data_cache import MovieCache
+    return MovieCache(compact=True)  # categoricals and small ints, several times smaller
+
+def load_data_with_version() -> tuple[pd.DataFrame, int]:
+    """Return the movies (refreshed with the latest changes) and their version."""
+    with get_pool().read() as con:
+        return get_movie_cache().get(con)
+
 def load_data_with_cache() -> pd.DataFrame:
-    from utils.movie import load_movies
-    from utils.db import get_connection
-    with get_connection() as con:
-        return load_movies(con, with_index=True)
+    """Return the movies (compact dtypes), refreshed with the latest changes. Don't modify it."""
+    return load_data_with_version()[0]
 
-@st.cache_data
-def get_options(df: pd.DataFrame) -> dict:
+@st.cache_resource
+def get_edit_cache():
+    """Movies with plain dtypes for the data editor, shared by sessions, refreshed by delta."""
+    from utils.data_cache import MovieCache
+    return MovieCache()
+
+def load_data_for_editing() -> pd.DataFrame:
+    """Return the movies with plain dtypes, as expected by the data editor. Don't modify it."""
+    with get_pool().read() as con:
+        return get_edit_cache().get(con)[0]
+
+def reload_data() -> None:
+    """Fully reload the movies, instead of applying changes."""
+    with get_pool().read() as con:
+        get_movie_cache().reload(con)
+
+@st.cache_resource(max_entries=2)
+def get_filter_index(_df: pd.DataFrame, version: int):
+    """Filtering index of a data version."""
+    from utils.data_filter import MovieFilterIndex
+    return MovieFilterIndex(_df)
+
+@st.cache_resource(max_entries=2)
+def get_memory_usage(_df: pd.DataFrame, version: int) -> int:
+    """Memory usage (bytes) of a data version, including strings."""
+    return int(_df.memory_usage(deep=True).sum())
+
+@st.cache_resource
+def get_csv_writer():
+    """Shared write-behind exporter for data/data.csv, call `schedule()` after a write."""
+    from utils.export import CsvWriteBehind
+    from utils.constants import CSV_WRITE_BEHIND_DELAY
+    return CsvWriteBehind('data/movies.db', delay=CSV_WRITE_BEHIND_DELAY)
+
+@st.cache_resource(max_entries=2)
+def get_options(_df: pd.DataFrame, version: int) -> dict:
+    """Filter options of a data version (cached by version, hashing the data is slow)."""
     from utils.date import get_year
+    df = _df
     return {
-            'year': sorted(df['year'].dropna().astype(int).unique().tolist(), reverse=True),
-            'status': sorted(df['status'].unique().tolist()),
-            'type': sorted(df['type'].unique().tolist()),
-            'country': sorted(df['country'].dropna().unique().tolist()),
-            'genres': sorted(
-                df['genres']
-                .dropna()
-                .apply(lambda x: [g.strip() for g in x.split(',')])
-                .explode()  # flatten lists into rows
-                .unique().tolist()
-            ),
-            'watched_year': sorted((
-                df['watched_date']
-                .dropna()
-                .apply(get_year)
-                .unique().tolist()
-            ), reverse=True),
-        }
+        'year': sorted(df['year'].dropna().astype(int).unique().tolist(), reverse=True),
+        'status': sorted(df['status'].unique().tolist()),
+        'type': sorted(df['type'].unique().tolist()),
+        'country': sorted(df['country'].dropna().unique().tolist()),
+        'genres': sorted(
+            df['genres']
+            .dropna()
+            .apply(lambda x: [g.strip() for g in x.split(',')])
+            .explode()  # flatten lists into rows
+            .unique().tolist()
+        ),
+        'watched_year': sorted((
+            df['watched_date']
+            .dropna()
+            .apply(get_year)
+            .unique().tolist()
+        ), reverse=True),
+    }
 
 @st.cache_data
 def load_column_config() -> dict:
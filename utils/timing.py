@@ -1,12 +1,13 @@
+import sys
 from time import perf_counter
 from functools import wraps
 
 def timing(func):
-    """Measure and print execution time of a function."""
+    """Measure and print execution time of a function (to stderr, stdout is for data)."""
     @wraps(func)    
     def wrapper(*args, **kwargs):
         tic = perf_counter()
         result = func(*args, **kwargs)
-        print(f'Function {func.__name__} took {(perf_counter()-tic):.5f}s')
+        print(f'Function {func.__name__} took {(perf_counter()-tic):.5f}s', file=sys.stderr)
         return result
     return wrapper
\ No newline at end of file